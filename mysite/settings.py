@@ -1,271 +1,400 @@
-"""
-Django settings for mysite project.
-
-Generated by 'django-admin startproject' using Django 5.2.8.
-
-For more information on this file, see
-https://docs.djangoproject.com/en/5.2/topics/settings/
-
-For the full list of settings and their values, see
-https://docs.djangoproject.com/en/5.2/ref/settings/
-"""
-
-# Standard library imports
-from pathlib import Path
-
-# Third-party imports
-from decouple import config, Csv
-
-# Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-
-# Quick-start development settings - unsuitable for production
-# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
-
-# SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = config(
-    "SECRET_KEY",
-    default="django-insecure-t#1$mpnql9$he35yx=c@&x4=#kww(*vd36_b@-@n@wbh5_9b=b",
-)
-
-# SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = config("DEBUG", default=True, cast=bool)
-
-
-ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="localhost,127.0.0.1", cast=Csv())
-
-# Maintenance Mode
-MAINTENANCE_MODE = config("MAINTENANCE_MODE", default=False, cast=bool)
-
-# Security Settings
-SECURE_BROWSER_XSS_FILTER = True
-X_FRAME_OPTIONS = "SAMEORIGIN"
-SECURE_CONTENT_TYPE_NOSNIFF = True
-SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
-
-# HTTPS Settings (attivare in produzione)
-if not DEBUG:
-    SECURE_SSL_REDIRECT = config("SECURE_SSL_REDIRECT", default=True, cast=bool)
-    SESSION_COOKIE_SECURE = True
-    CSRF_COOKIE_SECURE = True
-    SECURE_HSTS_SECONDS = 31536000
-    SECURE_HSTS_INCLUDE_SUBDOMAINS = True
-    SECURE_HSTS_PRELOAD = True
-
-# CSRF Trusted Origins (richiesto per Django 4+ con HTTPS)
-CSRF_TRUSTED_ORIGINS = config(
-    "CSRF_TRUSTED_ORIGINS",
-    default="https://parcovergacapuana.it,https://www.parcovergacapuana.it",
-    cast=Csv(),
-)
-
-
-# Application definition
-
-INSTALLED_APPS = [
-    "django.contrib.admin",
-    "django.contrib.auth",
-    "django.contrib.contenttypes",
-    "django.contrib.sessions",
-    "django.contrib.messages",
-    "django.contrib.staticfiles",
-    "django.contrib.sitemaps",  # Sitemap per SEO
-    "parler",
-    "parco_verismo.apps.ParcoVerismoConfig",  # App principale
-]
-
-MIDDLEWARE = [
-    "parco_verismo.middleware.MaintenanceMiddleware",  # Maintenance mode (first check)
-    "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",  # Serve static files in production
-    "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.locale.LocaleMiddleware",
-    "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.auth.middleware.AuthenticationMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
-    "django.middleware.clickjacking.XFrameOptionsMiddleware",
-    "parco_verismo.middleware.SimpleRateLimitMiddleware",  # Rate limiting
-    "parco_verismo.middleware.SecurityHeadersMiddleware",  # Security headers
-]
-
-ROOT_URLCONF = "mysite.urls"
-
-TEMPLATES = [
-    {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
-        "DIRS": [],
-        "APP_DIRS": True,
-        "OPTIONS": {
-            "context_processors": [
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-                "parco_verismo.context_processors.google_analytics",
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = "mysite.wsgi.application"
-
-
-# Database
-# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
-# Supporta SQLite (default) e PostgreSQL (via variabili d'ambiente)
-
-DB_ENGINE = config("DB_ENGINE", default="django.db.backends.sqlite3")
-
-if "postgresql" in DB_ENGINE:
-    # PostgreSQL per produzione
-    DATABASES = {
-        "default": {
-            "ENGINE": DB_ENGINE,
-            "NAME": config("DB_NAME", default="parco_verismo"),
-            "USER": config("DB_USER", default="parco_user"),
-            "PASSWORD": config("DB_PASSWORD", default=""),
-            "HOST": config("DB_HOST", default="localhost"),
-            "PORT": config("DB_PORT", default="5432"),
-        }
-    }
-else:
-    # SQLite per sviluppo e piccole installazioni
-    # In produzione (Docker): usa /app/data/db.sqlite3 (volume persistente)
-    # In sviluppo (locale): usa db.sqlite3 nella root del progetto
-    import os
-    if os.path.exists("/app/data"):
-        # Siamo in Docker
-        DATABASES = {
-            "default": {
-                "ENGINE": "django.db.backends.sqlite3",
-                "NAME": Path("/app/data/db.sqlite3"),
-            }
-        }
-    else:
-        # Siamo in sviluppo locale
-        DATABASES = {
-            "default": {
-                "ENGINE": "django.db.backends.sqlite3",
-                "NAME": BASE_DIR / "db.sqlite3",
-            }
-        }
-
-
-# Cache Configuration (required for rate limiting middleware)
-CACHES = {
-    "default": {
-        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
-        "LOCATION": "parco-verismo-cache",
-        "OPTIONS": {
-            "MAX_ENTRIES": 1000,
-        },
-        "TIMEOUT": 300,  # 5 minuti default
-    }
-}
-
-
-# Password validation
-# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
-
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
-    },
-    {
-        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
-    },
-]
-
-
-# Internationalization
-# https://docs.djangoproject.com/en/5.2/topics/i18n/
-
-LANGUAGE_CODE = "it"
-
-LANGUAGES = [
-    ("it", "Italiano"),
-    ("en", "English"),
-]
-
-TIME_ZONE = "Europe/Rome"
-
-USE_I18N = True
-
-USE_TZ = True
-
-LOCALE_PATHS = [
-    BASE_DIR / "locale",
-]
-
-PARLER_LANGUAGES = {
-    None: (
-        {"code": "it"},
-        {"code": "en"},
-    ),
-    "default": {
-        "fallback": "it",
-        "hide_untranslated": False,
-    },
-}
-
-PARLER_DEFAULT_LANGUAGE_CODE = "it"
-
-
-# Static files (CSS, JavaScript, Images)
-# https://docs.djangoproject.com/en/5.2/howto/static-files/
-
-
-STATIC_URL = config("STATIC_URL", default="/static/")
-STATIC_ROOT = config("STATIC_ROOT", default=BASE_DIR / "staticfiles")
-
-STATICFILES_DIRS = [
-    BASE_DIR / "parco_verismo" / "static",
-]
-
-# Whitenoise configuration for development (ensures consistent behavior including Range requests)
-WHITENOISE_USE_FINDERS = True
-WHITENOISE_AUTOREFRESH = True
-
-# Media files (User uploads) - Organizzati per tipo
-MEDIA_URL = config("MEDIA_URL", default="/media/")
-MEDIA_ROOT = config("MEDIA_ROOT", default=BASE_DIR / "media")
-
-# Configurazione upload files
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
-DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
-
-# Default primary key field type
-# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
-
-DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
-
-# =============================================================================
-# GOOGLE ANALYTICS
-# =============================================================================
-# Inserisci il tuo Measurement ID (es. G-XXXXXXXXXX)
-# In produzione, imposta la variabile d'ambiente GA_MEASUREMENT_ID
-GA_MEASUREMENT_ID = config("GA_MEASUREMENT_ID", default="")
-
-# =============================================================================
-# EMAIL CONFIGURATION
-# =============================================================================
-EMAIL_BACKEND = config("EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend")
-EMAIL_HOST = config("EMAIL_HOST", default="")
-EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
-EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
-EMAIL_USE_SSL = config("EMAIL_USE_SSL", default=False, cast=bool)
-EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
-EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
-DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="info@parcovergacapuana.it")
-SERVER_EMAIL = config("SERVER_EMAIL", default=DEFAULT_FROM_EMAIL)
-
-# In development (DEBUG=True) fallback to console if no host is set
-if DEBUG and not EMAIL_HOST:
-    EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
+"""
+Django settings for mysite project.
+
+Generated by 'django-admin startproject' using Django 5.2.8.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+# Standard library imports
+import tempfile
+from pathlib import Path
+
+# Third-party imports
+from decouple import config, Csv
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+SECRET_KEY = config(
+    "SECRET_KEY",
+    default="django-insecure-t#1$mpnql9$he35yx=c@&x4=#kww(*vd36_b@-@n@wbh5_9b=b",
+)
+
+# SECURITY WARNING: don't run with debug turned on in production!
+DEBUG = config("DEBUG", default=True, cast=bool)
+
+
+ALLOWED_HOSTS = config("ALLOWED_HOSTS", default="localhost,127.0.0.1", cast=Csv())
+
+# Maintenance Mode
+MAINTENANCE_MODE = config("MAINTENANCE_MODE", default=False, cast=bool)
+
+# Security Settings
+SECURE_BROWSER_XSS_FILTER = True
+X_FRAME_OPTIONS = "SAMEORIGIN"
+SECURE_CONTENT_TYPE_NOSNIFF = True
+SECURE_PROXY_SSL_HEADER = ("HTTP_X_FORWARDED_PROTO", "https")
+
+# HTTPS Settings (attivare in produzione)
+if not DEBUG:
+    SECURE_SSL_REDIRECT = config("SECURE_SSL_REDIRECT", default=True, cast=bool)
+    SESSION_COOKIE_SECURE = True
+    CSRF_COOKIE_SECURE = True
+    SECURE_HSTS_SECONDS = 31536000
+    SECURE_HSTS_INCLUDE_SUBDOMAINS = True
+    SECURE_HSTS_PRELOAD = True
+
+# CSRF Trusted Origins (richiesto per Django 4+ con HTTPS)
+CSRF_TRUSTED_ORIGINS = config(
+    "CSRF_TRUSTED_ORIGINS",
+    default="https://parcovergacapuana.it,https://www.parcovergacapuana.it",
+    cast=Csv(),
+)
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    "django.contrib.admin",
+    "django.contrib.auth",
+    "django.contrib.contenttypes",
+    "django.contrib.sessions",
+    "django.contrib.messages",
+    "django.contrib.staticfiles",
+    "django.contrib.sitemaps",  # Sitemap per SEO
+    "parler",
+    "parco_verismo.apps.ParcoVerismoConfig",  # App principale
+]
+
+MIDDLEWARE = [
+    "parco_verismo.middleware.MaintenanceMiddleware",  # Maintenance mode (first check)
+    "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",  # Serve static files in production
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.locale.LocaleMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "parco_verismo.middleware.SimpleRateLimitMiddleware",  # Rate limiting
+    "parco_verismo.middleware.AnonymousPageCacheMiddleware",  # Cache pagine anonime
+    "parco_verismo.middleware.SecurityHeadersMiddleware",  # Security headers
+]
+
+ROOT_URLCONF = "mysite.urls"
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [],
+        "APP_DIRS": True,
+        "OPTIONS": {
+            "context_processors": [
+                "django.template.context_processors.request",
+                "django.contrib.auth.context_processors.auth",
+                "django.contrib.messages.context_processors.messages",
+                "parco_verismo.context_processors.google_analytics",
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = "mysite.wsgi.application"
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Supporta SQLite (default) e PostgreSQL (via variabili d'ambiente)
+
+DB_ENGINE = config("DB_ENGINE", default="django.db.backends.sqlite3")
+
+if "postgresql" in DB_ENGINE:
+    # PostgreSQL per produzione
+    DATABASES = {
+        "default": {
+            "ENGINE": DB_ENGINE,
+            "NAME": config("DB_NAME", default="parco_verismo"),
+            "USER": config("DB_USER", default="parco_user"),
+            "PASSWORD": config("DB_PASSWORD", default=""),
+            "HOST": config("DB_HOST", default="localhost"),
+            "PORT": config("DB_PORT", default="5432"),
+        }
+    }
+else:
+    # SQLite per sviluppo e piccole installazioni
+    # In produzione (Docker): usa /app/data/db.sqlite3 (volume persistente)
+    # In sviluppo (locale): usa db.sqlite3 nella root del progetto
+    import os
+    if os.path.exists("/app/data"):
+        # Siamo in Docker
+        DATABASES = {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": Path("/app/data/db.sqlite3"),
+            }
+        }
+    else:
+        # Siamo in sviluppo locale
+        DATABASES = {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": BASE_DIR / "db.sqlite3",
+            }
+        }
+
+
+# Cache Configuration (required for rate limiting middleware)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "parco-verismo-cache",
+        "OPTIONS": {
+            "MAX_ENTRIES": 1000,
+        },
+        "TIMEOUT": 300,  # 5 minuti default
+    },
+    # Cache delle pagine pubbliche: su file, condivisa da tutti i worker gunicorn
+    "pages": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": config(
+            "PAGE_CACHE_LOCATION",
+            default=str(Path(tempfile.gettempdir()) / "parco_verismo_pages"),
+        ),
+        "OPTIONS": {
+            "MAX_ENTRIES": 2000,
+        },
+        "TIMEOUT": 300,
+    },
+}
+
+# Cache pagine per visitatori anonimi (vedi parco_verismo/utils/page_cache.py)
+PAGE_CACHE_ENABLED = config("PAGE_CACHE_ENABLED", default=not DEBUG, cast=bool)
+PAGE_CACHE_ALIAS = "pages"
+PAGE_CACHE_TIMEOUT = config("PAGE_CACHE_TIMEOUT", default=300, cast=int)
+
+# Dashboard delle richieste di contatto (vedi services/stats_service.py)
+# Una richiesta nuova o in lavorazione è in ritardo dopo RICHIESTE_GIORNI_RITARDO giorni.
+# Statistiche e liste restano in cache per pochi secondi, nella cache su file
+# condivisa dai worker: il salvataggio di una richiesta le invalida per tutti.
+RICHIESTE_GIORNI_RITARDO = config("RICHIESTE_GIORNI_RITARDO", default=7, cast=int)
+RICHIESTE_DASHBOARD_CACHE_ALIAS = "pages"
+RICHIESTE_DASHBOARD_CACHE_TIMEOUT = config("RICHIESTE_DASHBOARD_CACHE_TIMEOUT", default=60, cast=int)
+
+# Esportazione CSV delle richieste (vedi services/export_service.py)
+# Oltre RICHIESTE_EXPORT_MAX_RIGHE il file viene scritto dal worker in
+# RICHIESTE_EXPORT_DIR (condivisa con il web) e l'operatore riceve il link per email
+RICHIESTE_EXPORT_MAX_RIGHE = config("RICHIESTE_EXPORT_MAX_RIGHE", default=5000, cast=int)
+RICHIESTE_EXPORT_DIR = config(
+    "RICHIESTE_EXPORT_DIR",
+    default=str(Path(tempfile.gettempdir()) / "parco_verismo_esportazioni"),
+)
+RICHIESTE_EXPORT_CONSERVA_GIORNI = 7
+
+# Liste paginate con cursore (vedi parco_verismo/utils/paginazione.py)
+LISTE_DIMENSIONE_PAGINA = config("LISTE_DIMENSIONE_PAGINA", default=12, cast=int)
+
+# Payload precalcolati delle mappe itinerari (vedi services/itinerari_service.py)
+ITINERARI_MAPPA_DIR = config(
+    "ITINERARI_MAPPA_DIR",
+    default=str(Path(tempfile.gettempdir()) / "parco_verismo_itinerari"),
+)
+
+# Compressione dei percorsi (vedi parco_verismo/utils/polyline.py)
+# Tolleranza Douglas-Peucker in metri
+ITINERARI_POLYLINE_TOLLERANZA = config("ITINERARI_POLYLINE_TOLLERANZA", default=2.0, cast=float)
+
+# Calcolo dei percorsi tra le tappe (vedi services/routing_service.py)
+# Backend: "osrm", "linea-retta" (nessuna rete) o percorso Python di una classe
+ITINERARI_ROUTING_BACKEND = config("ITINERARI_ROUTING_BACKEND", default="osrm")
+ITINERARI_OSRM_URL = config("ITINERARI_OSRM_URL", default="https://router.project-osrm.org")
+ITINERARI_PERCORSI_CACHE_DIR = config(
+    "ITINERARI_PERCORSI_CACHE_DIR",
+    default=str(Path(tempfile.gettempdir()) / "parco_verismo_percorsi"),
+)
+
+# Immagini responsive (vedi parco_verismo/utils/renditions.py)
+IMAGE_RENDITION_WIDTHS = (320, 640, 960, 1280)
+IMAGE_RENDITION_FORMATS = ("webp",)  # aggiungere "avif" se Pillow lo supporta
+IMAGE_RENDITION_QUALITY = 80
+IMAGE_RENDITION_VERSION = 1  # incrementare per rigenerare tutte le rendition
+
+# Coda dei lavori in background (vedi parco_verismo/services/job_queue.py)
+# Con JOB_QUEUE_EAGER i lavori vengono eseguiti subito, senza worker (default in sviluppo)
+JOB_QUEUE_EAGER = config("JOB_QUEUE_EAGER", default=DEBUG, cast=bool)
+JOB_QUEUE_MAX_TENTATIVI = config("JOB_QUEUE_MAX_TENTATIVI", default=5, cast=int)
+JOB_QUEUE_BACKOFF = config("JOB_QUEUE_BACKOFF", default=30, cast=int)  # secondi, raddoppia a ogni tentativo
+JOB_QUEUE_TIMEOUT = 600  # secondi senza rinnovo dopo i quali un lavoro torna in coda (o @task(timeout=))
+JOB_QUEUE_CONSERVA_GIORNI = 7  # giorni di conservazione dei lavori completati
+
+# Rate limiting (vedi parco_verismo/utils/ratelimit.py)
+# "sqlite": contatori in un file SQLite condiviso da tutti i worker del nodo
+# "cache": contatori nella cache RATELIMIT_CACHE_ALIAS (usare con Redis/Memcached)
+RATELIMIT_BACKEND = config("RATELIMIT_BACKEND", default="sqlite")
+RATELIMIT_CACHE_ALIAS = config("RATELIMIT_CACHE_ALIAS", default="default")
+RATELIMIT_SQLITE_PATH = config(
+    "RATELIMIT_SQLITE_PATH",
+    default=str(Path(tempfile.gettempdir()) / "parco_verismo_ratelimit.sqlite3"),
+)
+RATELIMIT_ALGORITHM = config("RATELIMIT_ALGORITHM", default="sliding_window")
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.MinimumLengthValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.CommonPasswordValidator",
+    },
+    {
+        "NAME": "django.contrib.auth.password_validation.NumericPasswordValidator",
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = "it"
+
+LANGUAGES = [
+    ("it", "Italiano"),
+    ("en", "English"),
+]
+
+TIME_ZONE = "Europe/Rome"
+
+USE_I18N = True
+
+USE_TZ = True
+
+LOCALE_PATHS = [
+    BASE_DIR / "locale",
+]
+
+PARLER_LANGUAGES = {
+    None: (
+        {"code": "it"},
+        {"code": "en"},
+    ),
+    "default": {
+        "fallback": "it",
+        "hide_untranslated": False,
+    },
+}
+
+PARLER_DEFAULT_LANGUAGE_CODE = "it"
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+
+STATIC_URL = config("STATIC_URL", default="/static/")
+STATIC_ROOT = config("STATIC_ROOT", default=BASE_DIR / "staticfiles")
+
+STATICFILES_DIRS = [
+    BASE_DIR / "parco_verismo" / "static",
+]
+
+# Versioni WebP/AVIF delle immagini in static/assets/img, generate da
+# `python manage.py ottimizza_statici --genera` e servite come /static/ottimizzate/
+# (vedi parco_verismo/utils/immagini_statiche.py). Cartella non versionata.
+STATIC_IMMAGINI_DIR = config("STATIC_IMMAGINI_DIR", default=str(BASE_DIR / "static_immagini"))
+STATIC_IMMAGINI_WIDTHS = (320, 640, 960, 1280, 1920)
+STATIC_IMMAGINI_FORMATS = ("avif", "webp")  # in ordine di preferenza nei <picture>
+STATIC_IMMAGINI_QUALITY = 75
+if Path(STATIC_IMMAGINI_DIR).is_dir():
+    STATICFILES_DIRS.append(("ottimizzate", STATIC_IMMAGINI_DIR))
+
+# Statici con hash nel nome (staticfiles.json) e versioni .gz/.br generate da
+# collectstatic: possono essere serviti con cache "immutable". In sviluppo
+# (DEBUG) restano i file originali, senza bisogno di collectstatic.
+# Verifica dei template: python manage.py verifica_statici
+STATICFILES_MANIFEST = config("STATICFILES_MANIFEST", default=not DEBUG, cast=bool)
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": (
+            "parco_verismo.storage.StaticiManifestStorage"
+            if STATICFILES_MANIFEST
+            else "django.contrib.staticfiles.storage.StaticFilesStorage"
+        ),
+    },
+}
+
+# CSS/JS raggruppati in bundle (npm run bundle) con il CSS critico inline;
+# in sviluppo i file sorgente sono inclusi uno per uno
+ASSET_BUNDLES = config("ASSET_BUNDLES", default=not DEBUG, cast=bool)
+
+# Whitenoise configuration for development (ensures consistent behavior including Range requests)
+WHITENOISE_USE_FINDERS = DEBUG
+WHITENOISE_AUTOREFRESH = DEBUG
+
+# Sitemap precalcolata (vedi parco_verismo/services/sitemap_service.py)
+# SITE_URL serve per gli URL assoluti, anche fuori da una richiesta (worker, comandi)
+SITE_URL = config("SITE_URL", default="https://parcovergacapuana.it")
+SITEMAP_DIR = config("SITEMAP_DIR", default=str(Path(STATIC_ROOT) / "sitemap"))
+
+# Media files (User uploads) - Organizzati per tipo
+MEDIA_URL = config("MEDIA_URL", default="/media/")
+MEDIA_ROOT = config("MEDIA_ROOT", default=BASE_DIR / "media")
+
+# Configurazione upload files
+FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+DATA_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
+
+# Ottimizzazione delle immagini caricate (vedi parco_verismo/utils/image_optimizer.py)
+IMAGE_MAX_WIDTH = 1920
+# Pixel massimi da decodificare: i JPEG vengono decodificati già ridotti
+# (una foto da 50 megapixel resta sotto il limite), PNG/TIFF enormi no
+IMAGE_MAX_PIXELS = config("IMAGE_MAX_PIXELS", default=25_000_000, cast=int)
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# =============================================================================
+# GOOGLE ANALYTICS
+# =============================================================================
+# Inserisci il tuo Measurement ID (es. G-XXXXXXXXXX)
+# In produzione, imposta la variabile d'ambiente GA_MEASUREMENT_ID
+GA_MEASUREMENT_ID = config("GA_MEASUREMENT_ID", default="")
+
+# =============================================================================
+# EMAIL CONFIGURATION
+# =============================================================================
+EMAIL_BACKEND = config("EMAIL_BACKEND", default="django.core.mail.backends.smtp.EmailBackend")
+EMAIL_HOST = config("EMAIL_HOST", default="")
+EMAIL_PORT = config("EMAIL_PORT", default=587, cast=int)
+EMAIL_USE_TLS = config("EMAIL_USE_TLS", default=True, cast=bool)
+EMAIL_USE_SSL = config("EMAIL_USE_SSL", default=False, cast=bool)
+EMAIL_HOST_USER = config("EMAIL_HOST_USER", default="")
+EMAIL_HOST_PASSWORD = config("EMAIL_HOST_PASSWORD", default="")
+DEFAULT_FROM_EMAIL = config("DEFAULT_FROM_EMAIL", default="info@parcovergacapuana.it")
+SERVER_EMAIL = config("SERVER_EMAIL", default=DEFAULT_FROM_EMAIL)
+# Contatto per le segnalazioni di sicurezza (/.well-known/security.txt)
+SECURITY_CONTACT = config("SECURITY_CONTACT", default=DEFAULT_FROM_EMAIL)
+
+# In development (DEBUG=True) fallback to console if no host is set
+if DEBUG and not EMAIL_HOST:
+    EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
@@ -10,6 +10,7 @@ from .documenti import DocumentoAdmin, FotoArchivioAdmin
 from .itinerari import ItinerarioAdmin
 from .richieste import RichiestaAdmin
 from .ristoranti import RistoranteAdmin
+from .jobs import JobAdmin
 
 # Gli admin sono già registrati con @admin.register nei rispettivi file
 # Questo file serve solo per importarli tutti insieme
@@ -24,4 +25,5 @@ __all__ = [
     "ItinerarioAdmin",
     "RichiestaAdmin",
     "RistoranteAdmin",
+    "JobAdmin",
 ]
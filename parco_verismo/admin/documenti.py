@@ -13,6 +13,7 @@ from ..models import Documento, FotoArchivio
 from django import forms
 from parler.forms import TranslatableModelForm
 from .custom_fields import MultipleFileField, MultipleFileInput
+from ..utils.image_optimizer import valida_immagine_caricata
 from django.urls import path
 from django.shortcuts import render, redirect
 from django.contrib import messages
@@ -56,6 +57,7 @@ class FotoArchivioForm(TranslatableModelForm):
     upload_multiple = MultipleFileField(
         widget=MultipleFileInput(attrs={'multiple': True}),
         required=False,
+        validators=[valida_immagine_caricata],
         label="Caricamento Multiplo",
         help_text="Seleziona più foto per caricarle tutte in una volta (ignora il campo 'Immagine' singolo)."
     )
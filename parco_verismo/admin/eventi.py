@@ -13,6 +13,7 @@ from ..models import Evento, Notizia, EventoImage, NotiziaImage, EventoDocumento
 from django import forms
 from parler.forms import TranslatableModelForm
 from .custom_fields import MultipleFileField, MultipleFileInput
+from ..utils.image_optimizer import valida_immagine_caricata
 
 
 class EventoImageInline(admin.TabularInline):
@@ -41,6 +42,7 @@ class EventoForm(TranslatableModelForm):
     nuove_foto_galleria = MultipleFileField(
         widget=MultipleFileInput(attrs={'multiple': True}),
         required=False,
+        validators=[valida_immagine_caricata],
         help_text="Seleziona più foto da aggiungere alla galleria."
     )
 
@@ -53,6 +55,7 @@ class NotiziaForm(TranslatableModelForm):
     nuove_foto_galleria = MultipleFileField(
         widget=MultipleFileInput(attrs={'multiple': True}),
         required=False,
+        validators=[valida_immagine_caricata],
         help_text="Seleziona più foto da aggiungere alla galleria."
     )
     class Meta:
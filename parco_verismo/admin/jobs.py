@@ -0,0 +1,44 @@
+"""
+Admin per i lavori in background.
+"""
+
+# Django imports
+from django.contrib import admin
+from django.utils import timezone
+
+# Local imports
+from ..models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    """Consultazione della coda dei lavori; i lavori non si creano dall'admin."""
+
+    list_display = (
+        "nome",
+        "stato",
+        "tentativi",
+        "max_tentativi",
+        "esegui_dopo",
+        "worker",
+        "creato_il",
+        "completato_il",
+    )
+    list_filter = ("stato", "nome")
+    search_fields = ("nome", "errore")
+    date_hierarchy = "creato_il"
+    readonly_fields = [f.name for f in Job._meta.fields]
+    actions = ["rimetti_in_coda"]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.action(description="Rimetti in coda i lavori selezionati")
+    def rimetti_in_coda(self, request, queryset):
+        aggiornati = queryset.exclude(stato="in_esecuzione").update(
+            stato="in_coda", tentativi=0, esegui_dopo=timezone.now(), errore=""
+        )
+        self.message_user(request, f"{aggiornati} lavori rimessi in coda.")
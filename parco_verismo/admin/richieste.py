@@ -6,7 +6,9 @@ Admin per Richieste.
 from django.contrib import admin
 
 # Local imports
+from ..admin_richieste import esporta_csv_richieste
 from ..models import Richiesta
+from ..services import cambia_stato, invalida_dashboard_richieste
 
 
 @admin.register(Richiesta)
@@ -120,30 +122,20 @@ class RichiestaAdmin(admin.ModelAdmin):
 
     @admin.action(description="Marca come confermata")
     def marca_come_confermata(self, request, queryset):
-        updated = queryset.update(
-            stato="confermata", responsabile=request.user.username
-        )
+        updated = cambia_stato(queryset, "confermata", responsabile=request.user.username)
         self.message_user(
             request, f"{updated} richieste confermate.", level="success"
         )
 
     @admin.action(description="Marca come completata")
     def marca_come_completata(self, request, queryset):
-        from django.utils import timezone
-
-        count = 0
-        for obj in queryset:
-            obj.stato = "completata"
-            if not obj.data_completamento:
-                obj.data_completamento = timezone.now()
-            obj.responsabile = request.user.username
-            obj.save()
-            count += 1
+        count = cambia_stato(queryset, "completata", responsabile=request.user.username)
         self.message_user(request, f"{count} richieste completate.", level="success")
 
     @admin.action(description="Imposta priorità ALTA")
     def imposta_priorita_alta(self, request, queryset):
         updated = queryset.update(priorita="alta")
+        invalida_dashboard_richieste()
         self.message_user(
             request,
             f"{updated} richieste impostate a priorità alta.",
@@ -151,48 +143,4 @@ class RichiestaAdmin(admin.ModelAdmin):
         )
 
     def esporta_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        from django.utils import timezone
-
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
-        response["Content-Disposition"] = (
-            f'attachment; filename="richieste_{timezone.now().strftime("%Y%m%d_%H%M")}.csv"'
-        )
-        response.write("\ufeff")  # BOM per Excel
-
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "Nome",
-                "Cognome",
-                "Ente",
-                "Oggetto",
-                "Email",
-                "Messaggio",
-                "Stato",
-                "Priorità",
-                "Data richiesta",
-                "Data completamento",
-                "Responsabile",
-            ]
-        )
-
-        for obj in queryset:
-            writer.writerow(
-                [
-                    obj.nome,
-                    obj.cognome,
-                    obj.ente or "",
-                    obj.oggetto or "",
-                    obj.email,
-                    obj.messaggio,
-                    obj.get_stato_display(),
-                    obj.get_priorita_display(),
-                    obj.data_richiesta.strftime("%d/%m/%Y %H:%M"),
-                    obj.data_completamento.strftime("%d/%m/%Y %H:%M") if obj.data_completamento else "",
-                    obj.responsabile or "",
-                ]
-            )
-
-        return response
+        return esporta_csv_richieste(self, request, queryset)
@@ -2,16 +2,29 @@
 Admin personalizzato per la gestione delle Richieste.
 """
 
-# Standard library imports
-from datetime import timedelta
-
 # Django imports
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin import helpers
+from django.contrib.admin.sites import all_sites
+from django.contrib.auth import get_user_model
+from django.http import FileResponse, Http404, HttpRequest, QueryDict
 from django.shortcuts import render
-from django.urls import path
+from django.urls import path, reverse
 
 # Local imports
 from .models import Richiesta
+from .models.richieste import espressione_giorni_attesa
+from .services import (
+    accoda,
+    cambia_stato,
+    file_esportazione,
+    get_dashboard_richieste,
+    invalida_dashboard_richieste,
+    nome_esportazione,
+    risposta_csv,
+    search_index,
+)
 
 
 class RichiesteAdminSite(admin.AdminSite):
@@ -35,6 +48,11 @@ class RichiesteAdminSite(admin.AdminSite):
                 self.admin_view(self.dashboard_view),
                 name="richieste_dashboard",
             ),
+            path(
+                "esportazioni/<str:nome>/",
+                self.admin_view(self.esportazione_view),
+                name="richieste_esportazione",
+            ),
         ]
         return custom_urls + urls
 
@@ -42,62 +60,104 @@ class RichiesteAdminSite(admin.AdminSite):
         """Vista dashboard semplificata per le richieste di contatto"""
         from django.utils import timezone
 
-        oggi = timezone.now().date()
-        settimana_fa = oggi - timedelta(days=7)
-
-        # Statistiche essenziali
-        stats = {
-            "totali": Richiesta.objects.count(),
-            "nuove": Richiesta.objects.filter(stato="nuova").count(),
-            "in_lavorazione": Richiesta.objects.filter(
-                stato="in_lavorazione"
-            ).count(),
-            "confermate": Richiesta.objects.filter(stato="confermata").count(),
-            "completate": Richiesta.objects.filter(stato="completata").count(),
-            "cancellate": Richiesta.objects.filter(stato="cancellata").count(),
-            "priorita_alta": Richiesta.objects.filter(
-                stato__in=["nuova", "in_lavorazione"], priorita="alta"
-            ).count(),
-            "settimana": Richiesta.objects.filter(
-                data_richiesta__date__gte=settimana_fa
-            ).count(),
-        }
-
-        # Richieste urgenti (priorità alta + non completate)
-        richieste_urgenti = Richiesta.objects.filter(
-            stato__in=["nuova", "in_lavorazione"], priorita="alta"
-        ).order_by("-data_richiesta")[:10]
-
-        # In ritardo: usa la property `in_ritardo` del modello (calcolo lato modello)
-        in_ritardo = [
-            p
-            for p in Richiesta.objects.filter(
-                stato__in=["nuova", "in_lavorazione", "confermata"]
-            ).order_by("data_richiesta")
-            if p.in_ritardo
-        ][:10]
-
-        # Ultime richieste attive
-        richieste_recenti = Richiesta.objects.filter(
-            stato__in=["nuova", "in_lavorazione", "confermata"]
-        ).order_by("-data_richiesta")[:15]
-
-        # Richieste cancellate
-        richieste_cancellate = Richiesta.objects.filter(stato="cancellata").order_by(
-            "-ultima_modifica"
-        )[:15]
-
+        # Statistiche (una query) e liste, in cache per pochi secondi
         context = {
-            "stats": stats,
-            "richieste_urgenti": richieste_urgenti,
-            "in_ritardo": in_ritardo,
-            "richieste_recenti": richieste_recenti,
-            "richieste_cancellate": richieste_cancellate,
-            "oggi": oggi,
+            **get_dashboard_richieste(),
+            "oggi": timezone.now().date(),
+            "giorni_ritardo": settings.RICHIESTE_GIORNI_RITARDO,
         }
 
         return render(request, "admin/richieste_dashboard.html", context)
 
+    def esportazione_view(self, request, nome):
+        """Scarica un'esportazione CSV preparata dal worker"""
+        if not request.user.has_perm("parco_verismo.view_richiesta"):
+            raise Http404
+        percorso = file_esportazione(nome)
+        if percorso is None:
+            raise Http404("Esportazione non trovata o non ancora pronta")
+        return FileResponse(open(percorso, "rb"), as_attachment=True, filename=nome)
+
+
+def esporta_csv_richieste(modeladmin, request, queryset):
+    """
+    Esporta le richieste selezionate in CSV.
+
+    Fino a RICHIESTE_EXPORT_MAX_RIGHE richieste il CSV è inviato in streaming;
+    oltre viene preparato dal worker e l'operatore riceve il link per email.
+    """
+    totale = queryset.count()
+    if totale <= settings.RICHIESTE_EXPORT_MAX_RIGHE:
+        return risposta_csv(queryset)
+
+    nome = nome_esportazione()
+    url = request.build_absolute_uri(reverse("richieste_admin:richieste_esportazione", args=[nome]))
+    email = request.user.email
+    accoda(
+        "richieste.esporta_csv",
+        selezione=_selezione(modeladmin, request),
+        righe=totale,
+        nome=nome,
+        email=email,
+        url=url,
+    )
+    avviso = f"riceverai un'email a {email} quando" if email else "controlla tra qualche minuto:"
+    modeladmin.message_user(
+        request,
+        f"Esportazione di {totale} richieste in preparazione: {avviso} sarà scaricabile da {url}",
+    )
+
+
+def _selezione(modeladmin, request):
+    """
+    Descrizione della selezione dell'azione, da salvare negli argomenti del
+    lavoro: sito admin, parametri della changelist (filtri, ricerca,
+    ordinamento) e le righe spuntate se non è stato scelto "seleziona tutte"
+    (al più una pagina). La sua dimensione non dipende dal numero di richieste.
+    """
+    selezione = {
+        "sito": modeladmin.admin_site.name,
+        "parametri": {chiave: request.GET.getlist(chiave) for chiave in request.GET},
+        "utente_id": request.user.pk,
+    }
+    if request.POST.get("select_across") != "1":
+        selezione["selezionate"] = request.POST.getlist(helpers.ACTION_CHECKBOX_NAME)
+    return selezione
+
+
+def queryset_selezione(sito, parametri, utente_id, selezionate=None):
+    """
+    Ricostruisce nel worker il queryset descritto da _selezione, con la stessa
+    ChangeList usata dall'admin per le azioni (stessi filtri e ordinamento).
+    """
+    modeladmin = next(s for s in all_sites if s.name == sito)._registry[Richiesta]
+    richiesta = HttpRequest()
+    richiesta.method = "GET"
+    richiesta.GET = QueryDict(mutable=True)
+    for chiave, valori in parametri.items():
+        richiesta.GET.setlist(chiave, valori)
+    richiesta.user = get_user_model().objects.get(pk=utente_id)
+
+    queryset = modeladmin.get_changelist_instance(richiesta).get_queryset(richiesta)
+    if selezionate is not None:
+        queryset = queryset.filter(pk__in=selezionate)
+    return queryset
+
+
+class RitardoFilter(admin.SimpleListFilter):
+    """Filtro sull'annotazione in_ritardo (RichiestaQuerySet.con_ritardo)."""
+
+    title = "ritardo"
+    parameter_name = "in_ritardo"
+
+    def lookups(self, request, model_admin):
+        return (("1", "In ritardo"), ("0", "Nei tempi"))
+
+    def queryset(self, request, queryset):
+        if self.value() in ("0", "1"):
+            return queryset.filter(in_ritardo=self.value() == "1")
+        return queryset
+
 
 # Istanza del custom admin site
 richieste_admin_site = RichiesteAdminSite(name="richieste_admin")
@@ -115,6 +175,7 @@ class RichiestaCustomAdmin(admin.ModelAdmin):
         "email_link",
         "priorita",
         "badge_ritardo",
+        "giorni_attesa_display",
         "guida_assegnata",
         "data_richiesta",
         "data_completamento",
@@ -122,6 +183,7 @@ class RichiestaCustomAdmin(admin.ModelAdmin):
     list_filter = (
         "stato",
         "priorita",
+        RitardoFilter,
         "data_richiesta",
     )
     search_fields = (
@@ -175,6 +237,26 @@ class RichiestaCustomAdmin(admin.ModelAdmin):
     )
     list_per_page = 25
 
+    def get_queryset(self, request):
+        # in_ritardo calcolato dal database: ordinabile e filtrabile. giorni_attesa
+        # solo nell'ORDER BY quando si ordina per quella colonna (su SQLite costa
+        # secondi se calcolato per ogni riga della lista)
+        return super().get_queryset(request).con_ritardo()
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Cerca nell'indice full-text (services/search_index.py) invece di
+        icontains su tutti i search_fields: le parole sono cercate per prefisso
+        ("ross" trova "Rossi"), senza accenti e al singolare/plurale.
+        """
+        risultati = None
+        if search_term.strip():
+            risultati = search_index.filtra(queryset, search_term)
+        if risultati is None:
+            # Nessuna parola cercabile (es. solo articoli): ricerca standard
+            return super().get_search_results(request, queryset, search_term)
+        return risultati, False
+
     def has_add_permission(self, request):
         """Disabilita la creazione - devono arrivare solo dal form pubblico"""
         return False
@@ -212,7 +294,7 @@ class RichiestaCustomAdmin(admin.ModelAdmin):
         )
         return format_html(html, color, obj.get_stato_display())
 
-    @admin.display(description="Avviso")
+    @admin.display(description="Avviso", ordering="in_ritardo")
     def badge_ritardo(self, obj):
         from django.utils.html import format_html
 
@@ -224,117 +306,45 @@ class RichiestaCustomAdmin(admin.ModelAdmin):
             return format_html(html)
         return ""
 
-    @admin.display(description="Tempo di gestione")
+    @admin.display(description="Tempo di gestione", ordering=espressione_giorni_attesa())
     def giorni_attesa_display(self, obj):
         giorni = obj.giorni_attesa
         return f"{giorni} giorni"
 
     @admin.action(description="In lavorazione")
     def cambia_stato_in_lavorazione(self, request, queryset):
-        updated = queryset.update(
-            stato="in_lavorazione", responsabile=request.user.username
-        )
+        updated = cambia_stato(queryset, "in_lavorazione", responsabile=request.user.username)
         self.message_user(request, f"{updated} richieste in lavorazione.")
 
     @admin.action(description="Conferma")
     def cambia_stato_confermata(self, request, queryset):
-        count = 0
-        for obj in queryset:
-            obj.stato = "confermata"
-            obj.responsabile = request.user.username
-            obj.save()
-            count += 1
+        count = cambia_stato(queryset, "confermata", responsabile=request.user.username)
         self.message_user(request, f"{count} richieste confermate.", level="success")
 
     @admin.action(description="Completa")
     def cambia_stato_completata(self, request, queryset):
-        from django.utils import timezone
-
-        count = 0
-        for obj in queryset:
-            obj.stato = "completata"
-            if not obj.data_completamento:
-                obj.data_completamento = timezone.now()
-            obj.responsabile = request.user.username
-            obj.save()
-            count += 1
+        count = cambia_stato(queryset, "completata", responsabile=request.user.username)
         self.message_user(request, f"{count} richieste completate.", level="success")
 
     @admin.action(description="Priorità ALTA")
     def imposta_priorita_alta(self, request, queryset):
         updated = queryset.update(priorita="alta")
+        invalida_dashboard_richieste()
         self.message_user(
             request, f"{updated} richieste a priorità ALTA.", level="warning"
         )
 
     @admin.action(description="Esporta CSV")
     def esporta_csv(self, request, queryset):
-        import csv
-        from django.http import HttpResponse
-        from django.utils import timezone
-
-        response = HttpResponse(content_type="text/csv; charset=utf-8")
-        filename = f"richieste_{timezone.now().strftime('%Y%m%d_%H%M')}.csv"
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-
-        response.write("\ufeff")  # BOM per Excel
-
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "Nome",
-                "Cognome",
-                "Ente",
-                "Oggetto",
-                "Email",
-                "Messaggio",
-                "Stato",
-                "Priorità",
-                "Data richiesta",
-                "Data completamento",
-                "Responsabile",
-                "Guida",
-                "Note",
-            ]
-        )
-
-        for obj in queryset:
-            writer.writerow(
-                [
-                    obj.nome,
-                    obj.cognome,
-                    obj.ente or "",
-                    obj.oggetto or "",
-                    obj.email,
-                    obj.messaggio,
-                    obj.get_stato_display(),
-                    obj.get_priorita_display(),
-                    obj.data_richiesta.strftime("%d/%m/%Y %H:%M"),
-                    obj.data_completamento.strftime("%d/%m/%Y %H:%M") if obj.data_completamento else "",
-                    obj.responsabile or "",
-                    obj.guida_assegnata or "",
-                    obj.note_admin,
-                ]
-            )
-
-        return response
+        return esporta_csv_richieste(self, request, queryset)
 
     def changelist_view(self, request, extra_context=None):
         """Aggiungi statistiche alla vista lista"""
         extra_context = extra_context or {}
-        extra_context["nuove"] = Richiesta.objects.filter(stato="nuova").count()
-        extra_context["urgenti"] = Richiesta.objects.filter(
-            stato__in=["nuova", "in_lavorazione"], priorita="alta"
-        ).count()
-        extra_context["in_ritardo"] = len(
-            [
-                p
-                for p in Richiesta.objects.filter(
-                    stato__in=["nuova", "in_lavorazione", "confermata"]
-                )
-                if p.in_ritardo
-            ]
-        )
+        stats = get_dashboard_richieste()["stats"]
+        extra_context["nuove"] = stats["nuove"]
+        extra_context["urgenti"] = stats["priorita_alta"]
+        extra_context["in_ritardo"] = stats["in_ritardo"]
         return super().changelist_view(request, extra_context=extra_context)
 
     def save_model(self, request, obj, form, change):
@@ -1,7 +1,15 @@
-from django.apps import AppConfig
-
-
-class ParcoVerismoConfig(AppConfig):
-    default_auto_field = "django.db.models.BigAutoField"
-    name = "parco_verismo"
-    verbose_name = "Parco Letterario Giovanni Verga e Luigi Capuana"
+from django.apps import AppConfig
+
+
+class ParcoVerismoConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "parco_verismo"
+    verbose_name = "Parco Letterario Giovanni Verga e Luigi Capuana"
+
+    def ready(self):
+        from .signals import connect_signals
+
+        connect_signals()
+
+        # Registra i lavori eseguibili dal worker (decoratore @task)
+        from . import tasks  # noqa: F401
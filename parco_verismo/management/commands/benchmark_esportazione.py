@@ -0,0 +1,127 @@
+"""
+Micro-benchmark dell'esportazione CSV delle richieste.
+
+Crea richieste di prova in una transazione annullata alla fine (il database
+non cambia) e confronta, per ogni numero di righe, il picco di memoria Python
+(tracemalloc) e il tempo di:
+- precedente: HttpResponse in memoria, queryset iterato con la sua cache
+- streaming: risposta_csv (StreamingHttpResponse su iterator)
+- file: scrivi_esportazione, usata dal worker per le selezioni grandi
+
+tracemalloc rallenta molto l'esecuzione: i tempi valgono solo per il confronto.
+
+Uso:
+    python manage.py benchmark_esportazione
+    python manage.py benchmark_esportazione --righe 5000 50000 200000
+"""
+
+# Standard library imports
+import csv
+import tempfile
+import time
+import tracemalloc
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import override_settings
+
+# Local imports
+from parco_verismo.models import Richiesta
+from parco_verismo.services import export_service
+
+MESSAGGIO = "Vorremmo prenotare una visita guidata ai luoghi verghiani per una classe di 25 studenti. " * 3
+
+
+def _precedente(queryset):
+    """L'azione esporta_csv prima dello streaming."""
+    response = HttpResponse(content_type="text/csv; charset=utf-8")
+    response.write("\ufeff")  # BOM per Excel
+    writer = csv.writer(response)
+    writer.writerow(export_service.INTESTAZIONE)
+    for obj in queryset:
+        writer.writerow(
+            [
+                obj.nome,
+                obj.cognome,
+                obj.ente or "",
+                obj.oggetto or "",
+                obj.email,
+                obj.messaggio,
+                obj.get_stato_display(),
+                obj.get_priorita_display(),
+                obj.data_richiesta.strftime("%d/%m/%Y %H:%M"),
+                obj.data_completamento.strftime("%d/%m/%Y %H:%M") if obj.data_completamento else "",
+                obj.responsabile or "",
+                obj.guida_assegnata or "",
+                obj.note_admin,
+            ]
+        )
+    return len(response.content)
+
+
+def _streaming(queryset):
+    # Come il server WSGI: i blocchi vengono inviati e scartati
+    return sum(len(blocco) for blocco in export_service.risposta_csv(queryset).streaming_content)
+
+
+def _file(queryset):
+    with tempfile.TemporaryDirectory() as cartella, override_settings(RICHIESTE_EXPORT_DIR=cartella):
+        nome = export_service.nome_esportazione()
+        export_service.scrivi_esportazione(queryset, nome)
+        return export_service.file_esportazione(nome).stat().st_size
+
+
+def _misura(metodo, queryset):
+    """(secondi, picco di memoria Python in MB, byte del CSV)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        byte = metodo(queryset)
+        secondi = time.perf_counter() - t0
+        picco = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return secondi, picco / 1024 / 1024, byte
+
+
+class Command(BaseCommand):
+    help = "Misura memoria e tempo dell'esportazione CSV delle richieste"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--righe", type=int, nargs="+", default=[5000, 20000, 50000], help="Numero di richieste"
+        )
+
+    def handle(self, *args, **options):
+        metodi = {"precedente": _precedente, "streaming": _streaming, "file": _file}
+        self.stdout.write(f"{'righe':>8} {'metodo':>12} {'tempo':>9} {'picco':>9} {'CSV':>9}")
+        with transaction.atomic():
+            ultimo = Richiesta.objects.order_by("-pk").values_list("pk", flat=True).first() or 0
+            queryset = Richiesta.objects.filter(pk__gt=ultimo).order_by("-data_richiesta")
+            creati = 0
+            for righe in sorted(options["righe"]):
+                while creati < righe:
+                    blocco = min(5000, righe - creati)
+                    Richiesta.objects.bulk_create(
+                        Richiesta(
+                            nome="Mario",
+                            cognome=f"Rossi {creati + i}",
+                            email="mario.rossi@example.com",
+                            oggetto="Visita guidata",
+                            messaggio=MESSAGGIO,
+                            ente="Istituto comprensivo",
+                        )
+                        for i in range(blocco)
+                    )
+                    creati += blocco
+                for nome, metodo in metodi.items():
+                    # all(): ogni misura parte senza la cache dei risultati della precedente
+                    secondi, picco, byte = _misura(metodo, queryset.all())
+                    self.stdout.write(
+                        f"{righe:>8} {nome:>12} {secondi * 1000:>7.0f}ms {picco:>7.1f}MB "
+                        f"{byte / 1024 / 1024:>7.1f}MB"
+                    )
+            # Le richieste di prova non restano nel database
+            transaction.set_rollback(True)
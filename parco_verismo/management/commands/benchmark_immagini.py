@@ -0,0 +1,119 @@
+"""
+Micro-benchmark dell'ottimizzazione delle immagini caricate.
+
+Per ogni dimensione genera una foto JPEG sintetica e la converte in WebP
+con optimize_image e con il metodo precedente (decodifica completa,
+conversione e ridimensionamento a piena risoluzione, buffer in memoria).
+Ogni conversione gira in un processo nuovo, per misurarne il picco di
+memoria (RSS) senza l'effetto delle precedenti.
+
+Uso:
+    python manage.py benchmark_immagini
+    python manage.py benchmark_immagini --megapixel 12 24 50 --ripetizioni 3
+"""
+
+# Standard library imports
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+from io import BytesIO
+
+# Third-party imports
+from PIL import Image
+
+# Django imports
+from django.core.files import File
+from django.core.management.base import BaseCommand
+
+
+def foto_sintetica(percorso, megapixel):
+    """JPEG 4:3 con sfumature e dettaglio, simile a una foto per dimensione del file."""
+    larghezza = int((megapixel * 1e6 * 4 / 3) ** 0.5)
+    altezza = int(larghezza * 3 / 4)
+    rosso = Image.linear_gradient("L").resize((larghezza, altezza))
+    verde = Image.radial_gradient("L").resize((larghezza, altezza))
+    blu = Image.effect_noise((larghezza, altezza), 40)
+    Image.merge("RGB", (rosso, verde, blu)).save(percorso, quality=90)
+    return larghezza, altezza
+
+
+def _precedente(percorso):
+    """Il metodo di optimize_image prima della decodifica ridotta."""
+    img = Image.open(percorso).convert("RGB")
+    if img.width > 1920:
+        img = img.resize((1920, int(img.height * 1920 / img.width)), Image.Resampling.LANCZOS)
+    output = BytesIO()
+    img.save(output, format="WEBP", quality=85, method=4)
+    return output.getbuffer().nbytes
+
+
+def _ottimizzata(percorso):
+    from parco_verismo.utils.image_optimizer import optimize_image
+
+    with open(percorso, "rb") as f:
+        with optimize_image(File(f, name=os.path.basename(percorso))) as risultato:
+            return risultato.size
+
+
+def _memoria(campo):
+    """VmRSS/VmHWM del processo in KB (Linux)."""
+    with open("/proc/self/status") as f:
+        for riga in f:
+            if riga.startswith(campo + ":"):
+                return int(riga.split()[1])
+
+
+def _misura(metodo, percorso):
+    """Eseguita in un processo nuovo: (secondi, picco RSS aggiuntivo in MB, byte WebP)."""
+    import django
+
+    django.setup()
+    try:
+        # Azzera il picco (VmHWM) lasciato dagli import
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        iniziale = _memoria("VmRSS")
+    except OSError:
+        iniziale = None
+    if iniziale is None:
+        # Senza /proc: ru_maxrss (KB su Linux), meno preciso
+        iniziale = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    t0 = time.perf_counter()
+    byte = {"precedente": _precedente, "ottimizzata": _ottimizzata}[metodo](percorso)
+    secondi = time.perf_counter() - t0
+    try:
+        picco = _memoria("VmHWM")
+    except OSError:
+        picco = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return secondi, (picco - iniziale) / 1024, byte
+
+
+class Command(BaseCommand):
+    help = "Misura tempo per megapixel e picco di memoria di optimize_image"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--megapixel", type=float, nargs="+", default=[12, 24, 50], help="Dimensioni delle foto"
+        )
+        parser.add_argument("--ripetizioni", type=int, default=1, help="Misure per caso (si tiene la migliore)")
+
+    def handle(self, *args, **options):
+        # spawn: ogni misura parte da un processo pulito (il picco RSS non si azzera)
+        contesto = multiprocessing.get_context("spawn")
+        self.stdout.write(f"{'foto':>16} {'metodo':>12} {'tempo':>9} {'ms/MP':>7} {'picco RSS':>10} {'WebP':>9}")
+        with tempfile.TemporaryDirectory() as cartella:
+            for megapixel in options["megapixel"]:
+                percorso = os.path.join(cartella, f"foto-{megapixel:g}mp.jpg")
+                larghezza, altezza = foto_sintetica(percorso, megapixel)
+                for metodo in ("precedente", "ottimizzata"):
+                    misure = []
+                    for _ in range(options["ripetizioni"]):
+                        with contesto.Pool(1, maxtasksperchild=1) as pool:
+                            misure.append(pool.apply(_misura, (metodo, percorso)))
+                    secondi, picco, byte = min(misure)
+                    self.stdout.write(
+                        f"{larghezza:>7}×{altezza:<8} {metodo:>12} {secondi * 1000:>7.0f}ms "
+                        f"{secondi * 1000 / megapixel:>7.1f} {picco:>8.0f}MB {byte / 1024:>7.0f}KB"
+                    )
@@ -0,0 +1,101 @@
+"""
+Micro-benchmark della compressione dei percorsi.
+
+Per ogni percorso confronta la dimensione della lista JSON di coordinate con
+quella della stringa encoded polyline (semplificata) e misura il tempo di
+decodifica. Senza percorsi nel database usa un percorso sintetico.
+
+Uso:
+    python manage.py benchmark_polyline
+    python manage.py benchmark_polyline --sintetico 5000 --tolleranza 5
+"""
+
+# Standard library imports
+import json
+import math
+import time
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Local imports
+from parco_verismo.models import Itinerario
+from parco_verismo.utils.polyline import comprimi_percorso, decodifica, decomprimi_percorso
+
+
+def percorso_sintetico(punti):
+    """Percorso tortuoso di circa 1 punto ogni 10 metri nei dintorni di Vizzini."""
+    lat, lng = 37.1617, 14.7497
+    coords = []
+    for i in range(punti):
+        lat += 0.00006 * math.cos(i / 40)
+        lng += 0.00009 * math.sin(i / 25) + 0.00003
+        coords.append([round(lat, 6), round(lng, 6)])
+    return {"coords": coords, "distance": punti * 10.0, "duration": punti * 7.2}
+
+
+class Command(BaseCommand):
+    help = "Confronta dimensione e tempo di decodifica dei percorsi JSON vs encoded polyline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sintetico",
+            type=int,
+            default=0,
+            help="Usa un percorso sintetico con N punti invece del database",
+        )
+        parser.add_argument(
+            "--tolleranza",
+            type=float,
+            default=None,
+            help="Tolleranza Douglas-Peucker in metri (default da settings)",
+        )
+        parser.add_argument(
+            "--ripetizioni", type=int, default=100, help="Ripetizioni per la decodifica"
+        )
+
+    def handle(self, *args, **options):
+        percorsi = []
+        if options["sintetico"]:
+            percorsi.append(("sintetico", percorso_sintetico(options["sintetico"])))
+        else:
+            for itinerario in Itinerario.objects.exclude(percorsi_calcolati={}):
+                for chiave, percorso in (itinerario.percorsi_calcolati or {}).items():
+                    # I percorsi già compressi vengono riportati alle coordinate
+                    percorsi.append(
+                        (f"{itinerario.slug}:{chiave}", decomprimi_percorso(percorso))
+                    )
+        if not percorsi:
+            self.stdout.write(self.style.WARNING(
+                "Nessun percorso nel database: uso un percorso sintetico di 2000 punti"
+            ))
+            percorsi.append(("sintetico", percorso_sintetico(2000)))
+
+        self.stdout.write(
+            f"{'Percorso':<40} {'Punti':>6} {'JSON (B)':>10} {'Polyline (B)':>13} "
+            f"{'Rapporto':>9} {'µs decodifica':>14}"
+        )
+
+        totale_json = totale_polyline = 0
+        for nome, percorso in percorsi:
+            compresso = comprimi_percorso(percorso, tolleranza=options["tolleranza"])
+            byte_json = len(json.dumps(percorso["coords"], separators=(",", ":")))
+            byte_polyline = len(compresso["polyline"])
+            totale_json += byte_json
+            totale_polyline += byte_polyline
+
+            t0 = time.perf_counter()
+            for _ in range(options["ripetizioni"]):
+                decodifica(compresso["polyline"])
+            decodifica_us = (time.perf_counter() - t0) / options["ripetizioni"] * 1_000_000
+
+            self.stdout.write(
+                f"{nome[:40]:<40} {len(percorso['coords']):>6} {byte_json:>10} "
+                f"{byte_polyline:>13} {byte_json / max(byte_polyline, 1):>8.1f}x "
+                f"{decodifica_us:>14.1f}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"\nTotale: {totale_json} B JSON → {totale_polyline} B polyline "
+            f"({totale_json / max(totale_polyline, 1):.1f}x)"
+        ))
@@ -1,130 +1,157 @@
 """
 Comando Django per calcolare e salvare i percorsi stradali degli itinerari.
-Usa OSRM per calcolare i percorsi pedonali reali tra le tappe.
-I percorsi vengono salvati nel database una sola volta.
+Usa OSRM (o un altro backend di routing) per calcolare i percorsi pedonali
+reali tra le tappe.
+
+Le tratte vengono identificate dalle coordinate di partenza e arrivo (vedi
+parco_verismo/services/routing_service.py): vengono ricalcolate solo quelle
+nuove o modificate, in parallelo e con un limite di richieste al secondo.
+
+Uso:
+    python manage.py calcola_percorsi_itinerari
+    python manage.py calcola_percorsi_itinerari --dry-run
+    python manage.py calcola_percorsi_itinerari --only-changed --workers 2 --rate 1
+    python manage.py calcola_percorsi_itinerari --backend linea-retta
 """
 
 from django.core.management.base import BaseCommand
 from parco_verismo.models import Itinerario
-import requests
-import time
+from parco_verismo.services.routing_service import (
+    CacheTratte,
+    calcola_tratte,
+    componi_percorsi,
+    get_routing_backend,
+    pianifica_tratte,
+)
 
 
 class Command(BaseCommand):
     help = 'Calcola e salva i percorsi stradali per tutti gli itinerari'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backend',
+            default=None,
+            help='Backend di routing: "osrm", "linea-retta" o percorso Python di una classe',
+        )
+        parser.add_argument(
+            '--workers', type=int, default=4, help='Richieste contemporanee al backend'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=1.5,
+            help='Richieste al secondo verso il backend (0 = nessun limite)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Mostra le tratte da calcolare senza chiamare il backend né salvare',
+        )
+        parser.add_argument(
+            '--only-changed',
+            action='store_true',
+            help='Salva solo gli itinerari con tratte nuove o modificate',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Ignora le tratte già calcolate e ricalcola tutto',
+        )
+
     def handle(self, *args, **options):
+        backend = get_routing_backend(options['backend'])
+        cache = CacheTratte()
         itinerari = Itinerario.objects.filter(is_active=True)
-        
+
         self.stdout.write(f"\n{'='*70}")
-        self.stdout.write(f"CALCOLO PERCORSI ITINERARI")
+        self.stdout.write(f"CALCOLO PERCORSI ITINERARI ({backend.__class__.__name__})")
         self.stdout.write(f"{'='*70}\n")
-        
+
+        # 1. Individua le tratte di ogni itinerario e quelle già disponibili
+        piani = []
+        da_calcolare = {}
         for itinerario in itinerari:
-            self.stdout.write(f"\n📍 Itinerario: {itinerario.titolo}")
-            self.stdout.write(f"   Tipo: {itinerario.get_tipo_display()}")
-            
-            if not itinerario.coordinate_tappe or len(itinerario.coordinate_tappe) < 2:
-                self.stdout.write(self.style.WARNING(f"   ⚠ Saltato: meno di 2 tappe\n"))
+            tappe = itinerario.coordinate_tappe or []
+            if len(tappe) < 2:
+                if not options['only_changed']:
+                    self.stdout.write(self.style.WARNING(
+                        f"📍 {itinerario.titolo}: saltato, meno di 2 tappe"
+                    ))
                 continue
-            
-            percorsi = {}
-            totale_tappe = len(itinerario.coordinate_tappe)
-            
-            self.stdout.write(f"   Tappe totali: {totale_tappe}")
-            self.stdout.write(f"   Percorsi da calcolare: {totale_tappe - 1}\n")
-            
-            for i in range(totale_tappe - 1):
-                tappa_corrente = itinerario.coordinate_tappe[i]
-                tappa_successiva = itinerario.coordinate_tappe[i + 1]
-                
-                start = tappa_corrente['coords']
-                end = tappa_successiva['coords']
-                
-                nome_corrente = tappa_corrente.get('nome', f'Tappa {i+1}')
-                nome_successiva = tappa_successiva.get('nome', f'Tappa {i+2}')
-                
-                self.stdout.write(f"   [{i+1}/{totale_tappe-1}] {nome_corrente} → {nome_successiva}")
-                
-                try:
-                    # Chiama OSRM per il routing pedonale
-                    url = (
-                        f"https://router.project-osrm.org/route/v1/foot/"
-                        f"{start[1]},{start[0]};{end[1]},{end[0]}"
-                        f"?overview=full&geometries=geojson"
-                    )
-                    
-                    self.stdout.write(f"       → Richiesta OSRM...", ending='')
-                    self.stdout.flush()
-                    
-                    response = requests.get(url, timeout=15)
-                    data = response.json()
-                    
-                    if data.get('code') == 'Ok' and data.get('routes'):
-                        coords = data['routes'][0]['geometry']['coordinates']
-                        # Converti [lng, lat] in [lat, lng] per Leaflet
-                        coords_lat_lng = [[c[1], c[0]] for c in coords]
-                        
-                        distance = data['routes'][0]['distance']  # metri
-                        duration = data['routes'][0]['duration']  # secondi
-                        
-                        percorsi[f"{i}_{i+1}"] = {
-                            'coords': coords_lat_lng,
-                            'distance': round(distance, 2),
-                            'duration': round(duration, 2),
-                            'tratteggiato': tappa_successiva.get('tratteggiato', False),
-                            'punti': len(coords_lat_lng)
-                        }
-                        
-                        self.stdout.write(self.style.SUCCESS(
-                            f" ✓ ({len(coords_lat_lng)} punti, {distance:.0f}m, {duration/60:.1f}min)"
-                        ))
-                    else:
-                        # Fallback a linea retta
-                        percorsi[f"{i}_{i+1}"] = {
-                            'coords': [start, end],
-                            'straight_line': True,
-                            'tratteggiato': tappa_successiva.get('tratteggiato', False)
-                        }
-                        error_code = data.get('code', 'unknown')
-                        self.stdout.write(self.style.WARNING(
-                            f" ⚠ Fallback linea retta (OSRM: {error_code})"
-                        ))
-                    
-                    # Pausa per non sovraccaricare OSRM
-                    time.sleep(0.6)
-                    
-                except requests.exceptions.Timeout:
-                    self.stdout.write(self.style.ERROR(f" ✗ Timeout"))
-                    percorsi[f"{i}_{i+1}"] = {
-                        'coords': [start, end],
-                        'straight_line': True,
-                        'tratteggiato': tappa_successiva.get('tratteggiato', False)
-                    }
-                    
-                except Exception as e:
-                    error_msg = str(e)[:50]
-                    self.stdout.write(self.style.ERROR(f" ✗ Errore: {error_msg}"))
-                    percorsi[f"{i}_{i+1}"] = {
-                        'coords': [start, end],
-                        'straight_line': True,
-                        'tratteggiato': tappa_successiva.get('tratteggiato', False)
-                    }
-            
+
+            tratte = pianifica_tratte(
+                itinerario, backend.profilo, cache, forza=options['force']
+            )
+            for _i, chiave, start, end, percorso in tratte:
+                if percorso is None:
+                    da_calcolare[chiave] = (start, end)
+
+            nuove = sum(1 for *_, percorso in tratte if percorso is None)
+            invariato = nuove == 0 and len(tratte) == len(itinerario.percorsi_calcolati or {})
+            if options['only_changed'] and invariato:
+                continue
+
+            piani.append((itinerario, tratte))
+            self.stdout.write(
+                f"📍 {itinerario.titolo}: {len(tratte)} tratte, "
+                f"{len(tratte) - nuove} già calcolate, {nuove} da calcolare"
+            )
+
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"\nDry run: {len(da_calcolare)} tratte da calcolare "
+                f"in {len(piani)} itinerari, nessuna modifica salvata\n"
+            ))
+            return
+
+        # 2. Calcola in parallelo le tratte mancanti (ognuna salvata subito in cache)
+        if da_calcolare:
+            self.stdout.write(f"\nCalcolo di {len(da_calcolare)} tratte...")
+            contatore = [0]
+
+            def progresso(chiave, percorso, errore):
+                contatore[0] += 1
+                prefisso = f"   [{contatore[0]}/{len(da_calcolare)}] {chiave[:10]}"
+                if errore:
+                    self.stdout.write(self.style.WARNING(
+                        f"{prefisso} ⚠ Fallback linea retta ({errore})"
+                    ))
+                else:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"{prefisso} ✓ ({len(percorso['coords'])} punti, "
+                        f"{percorso['distance']:.0f}m, {percorso['duration']/60:.1f}min)"
+                    ))
+
+            calcolate = calcola_tratte(
+                da_calcolare,
+                backend,
+                cache=cache,
+                workers=options['workers'],
+                rate=options['rate'] or None,
+                callback=progresso,
+            )
+        else:
+            calcolate = {}
+
+        # 3. Componi e salva i percorsi di ogni itinerario
+        for itinerario, tratte in piani:
+            percorsi = componi_percorsi(itinerario, tratte, calcolate)
+
             # Salva i percorsi nel database
             itinerario.percorsi_calcolati = percorsi
-            itinerario.save()
-            
+            itinerario.save(update_fields=['percorsi_calcolati'])
+
             total_points = sum(p.get('punti', 2) for p in percorsi.values())
             total_distance = sum(p.get('distance', 0) for p in percorsi.values())
-            
+
             self.stdout.write(self.style.SUCCESS(
-                f"\n   ✓ SALVATO: {len(percorsi)} percorsi, "
-                f"{total_points} punti, {total_distance:.0f}m totali\n"
+                f"   ✓ SALVATO {itinerario.titolo}: {len(percorsi)} percorsi, "
+                f"{total_points} punti, {total_distance:.0f}m totali"
             ))
-        
+
         self.stdout.write(self.style.SUCCESS(f"\n{'='*70}"))
         self.stdout.write(self.style.SUCCESS(
-            f"✓ COMPLETATO! Percorsi calcolati per {itinerari.count()} itinerari"
+            f"✓ COMPLETATO! Percorsi aggiornati per {len(piani)} itinerari"
         ))
         self.stdout.write(self.style.SUCCESS(f"{'='*70}\n"))
@@ -0,0 +1,72 @@
+"""
+Comando Django per cambiare in blocco lo stato delle richieste di contatto.
+
+Usa lo stesso servizio delle azioni dell'admin (services/richieste_service.py):
+una sola UPDATE qualunque sia il numero di richieste, con ultima_modifica,
+responsabile e data_completamento aggiornati come da admin. Utile per
+operazioni periodiche, es. chiudere le richieste confermate di una stagione.
+
+Uso:
+    python manage.py cambia_stato_richieste completata --da-stato confermata --prima-del 2025-09-30
+    python manage.py cambia_stato_richieste cancellata --id 12 --id 15 --responsabile segreteria
+    python manage.py cambia_stato_richieste in_lavorazione --da-stato nuova --dry-run
+"""
+
+# Standard library imports
+import time
+from datetime import date, datetime
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+# Local imports
+from parco_verismo.models import Richiesta
+from parco_verismo.services.richieste_service import cambia_stato
+
+STATI = [stato for stato, _etichetta in Richiesta.STATO_CHOICES]
+
+
+def _data(valore):
+    try:
+        return date.fromisoformat(valore)
+    except ValueError:
+        raise CommandError(f"Data non valida: {valore} (formato AAAA-MM-GG)")
+
+
+class Command(BaseCommand):
+    help = "Cambia lo stato delle richieste selezionate con una sola query"
+
+    def add_arguments(self, parser):
+        parser.add_argument("stato", choices=STATI, help="Nuovo stato")
+        parser.add_argument(
+            "--da-stato", action="append", choices=STATI, help="Solo le richieste in questo stato (ripetibile)"
+        )
+        parser.add_argument("--prima-del", help="Solo le richieste arrivate prima di questa data (AAAA-MM-GG)")
+        parser.add_argument("--id", type=int, action="append", help="Solo le richieste con questo id (ripetibile)")
+        parser.add_argument("--responsabile", default="", help="Responsabile da registrare (default: invariato)")
+        parser.add_argument("--dry-run", action="store_true", help="Mostra quante richieste cambierebbero")
+
+    def handle(self, *args, **options):
+        if not (options["da_stato"] or options["prima_del"] or options["id"]):
+            raise CommandError("Indicare almeno un filtro: --da-stato, --prima-del o --id")
+
+        queryset = Richiesta.objects.all()
+        if options["da_stato"]:
+            queryset = queryset.filter(stato__in=options["da_stato"])
+        if options["prima_del"]:
+            inizio = timezone.make_aware(datetime.combine(_data(options["prima_del"]), datetime.min.time()))
+            queryset = queryset.filter(data_richiesta__lt=inizio)
+        if options["id"]:
+            queryset = queryset.filter(pk__in=options["id"])
+
+        if options["dry_run"]:
+            numero = queryset.exclude(stato=options["stato"]).count()
+            self.stdout.write(f"{numero} richieste passerebbero a «{options['stato']}» (dry run)")
+            return
+
+        t0 = time.perf_counter()
+        numero = cambia_stato(queryset, options["stato"], responsabile=options["responsabile"])
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {numero} richieste passate a «{options['stato']}» ({time.perf_counter() - t0:.2f}s)"
+        ))
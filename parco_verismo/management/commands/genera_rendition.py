@@ -0,0 +1,62 @@
+"""
+Comando Django per generare le versioni ridimensionate delle immagini.
+
+Normalmente le rendition vengono generate in background al salvataggio o
+alla prima visualizzazione; questo comando le prepara tutte in anticipo
+(es. dopo il deploy o dopo aver cambiato IMAGE_RENDITION_WIDTHS).
+
+Uso:
+    python manage.py genera_rendition
+    python manage.py genera_rendition --modello Opera --force
+"""
+
+# Standard library imports
+import time
+
+# Django imports
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+# Local imports
+from parco_verismo.utils.renditions import CAMPI_RENDITION, genera_rendition
+
+
+class Command(BaseCommand):
+    help = "Genera le rendition (più larghezze e formati) di tutte le immagini"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modello",
+            action="append",
+            choices=list(CAMPI_RENDITION),
+            help="Modello da elaborare (ripetibile, default: tutti)",
+        )
+        parser.add_argument(
+            "--force", action="store_true", help="Rigenera anche le rendition esistenti"
+        )
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        generate = errori = 0
+        for nome in options["modello"] or CAMPI_RENDITION:
+            model = apps.get_model("parco_verismo", nome)
+            campi = CAMPI_RENDITION[nome]
+            for valori in model.objects.values_list(*campi).iterator():
+                for file_name in valori:
+                    if not file_name:
+                        continue
+                    try:
+                        manifest = genera_rendition(file_name, forza=options["force"])
+                    except (OSError, ValueError) as e:
+                        errori += 1
+                        self.stdout.write(self.style.ERROR(f"   ✗ {file_name}: {e}"))
+                        continue
+                    generate += 1
+                    varianti = ", ".join(
+                        f"{formato} {larghezze}" for formato, larghezze in manifest["varianti"].items()
+                    )
+                    self.stdout.write(f"   ✓ {file_name} ({manifest['larghezza']}px) → {varianti}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {generate} immagini elaborate, {errori} errori in {time.perf_counter() - t0:.1f}s"
+        ))
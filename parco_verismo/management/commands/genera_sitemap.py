@@ -0,0 +1,43 @@
+"""
+Comando Django per generare la sitemap precalcolata (indice e sezioni).
+
+I file vengono scritti in SITEMAP_DIR, anche compressi, e poi aggiornati dal
+worker a ogni salvataggio dei contenuti. Da eseguire al deploy dopo
+collectstatic o dopo import massivi fatti senza segnali (es. loaddata).
+
+Uso:
+    python manage.py genera_sitemap
+    python manage.py genera_sitemap --sezione eventi --sezione notizie
+"""
+
+# Standard library imports
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Local imports
+from parco_verismo.services.sitemap_service import genera_sitemap
+from parco_verismo.sitemaps import SITEMAPS
+
+
+class Command(BaseCommand):
+    help = "Genera la sitemap (indice e sezioni, anche in .gz) in SITEMAP_DIR"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sezione",
+            action="append",
+            choices=list(SITEMAPS),
+            help="Sezione da rigenerare (ripetibile, default: tutte)",
+        )
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        conteggi = genera_sitemap(options["sezione"])
+        for sezione, numero in conteggi.items():
+            self.stdout.write(f"   {sezione}: {numero} URL")
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Sitemap generata in {settings.SITEMAP_DIR} ({time.perf_counter() - t0:.2f}s)"
+        ))
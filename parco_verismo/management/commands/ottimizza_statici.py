@@ -0,0 +1,209 @@
+"""
+Comando Django che controlla le immagini statiche e ne genera le versioni
+ottimizzate (WebP/AVIF) in più larghezze.
+
+Le immagini in static/assets/img sono inserite a mano (galleria, luoghi delle
+opere, comuni, loghi) e non passano da optimize_image. Il comando segnala:
+- file più pesanti della soglia (--soglia-kb)
+- immagini più larghe della variante più grande (STATIC_IMMAGINI_WIDTHS)
+- JPEG/WebP poco compressi (troppi byte per pixel)
+- foto salvate in PNG (senza trasparenza)
+- formati che i browser non mostrano (HEIC, TIFF, BMP)
+- immagini senza versioni ottimizzate o con versioni non aggiornate
+
+Con --genera scrive le varianti in STATIC_IMMAGINI_DIR usando un processo per
+core (le immagini sono indipendenti) e aggiorna ottimizzate/manifest.json,
+usato dai tag {% srcset_statico %} e {% sorgenti_statiche %}. Sono rigenerate
+solo le immagini cambiate dall'ultima esecuzione. Eseguire prima di
+collectstatic.
+
+Uso:
+    python manage.py ottimizza_statici
+    python manage.py ottimizza_statici --genera
+    python manage.py ottimizza_statici --genera --processi 4 --force
+    python manage.py ottimizza_statici --cartella assets/img/galleria
+"""
+
+# Standard library imports
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+# Third-party imports
+from PIL import Image, UnidentifiedImageError
+
+# Django imports
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.core.management.base import BaseCommand
+
+# Local imports
+from parco_verismo.utils.immagini_statiche import cartella_varianti, codifica, get_manifest_statico
+
+ESTENSIONI = {".jpg", ".jpeg", ".png", ".webp", ".gif", ".heic", ".heif", ".tif", ".tiff", ".bmp"}
+NON_SUPPORTATE = {".heic", ".heif", ".tif", ".tiff", ".bmp"}
+
+# Oltre questa densità un JPEG/WebP è salvato con qualità inutilmente alta
+BYTE_PER_PIXEL_MAX = 0.5
+# Un PNG senza trasparenza più grande di così è quasi sempre una foto
+PNG_OPACO_MAX_BYTE = 100 * 1024
+
+
+def _kb(byte):
+    return f"{byte / 1024:,.0f} KB"
+
+
+def _impronta(percorso):
+    hash = hashlib.sha1()
+    with open(percorso, "rb") as f:
+        for blocco in iter(lambda: f.read(1 << 20), b""):
+            hash.update(blocco)
+    return hash.hexdigest()[:12]
+
+
+def _immagini(cartelle):
+    """(percorso tra gli statici, percorso sul disco) delle immagini nelle cartelle."""
+    for cartella in cartelle:
+        trovato = finders.find(cartella)
+        if trovato is None:
+            continue
+        for percorso in sorted(Path(trovato).rglob("*")):
+            if percorso.suffix.lower() in ESTENSIONI and percorso.is_file():
+                relativo = percorso.relative_to(trovato).as_posix()
+                yield f"{cartella.rstrip('/')}/{relativo}", percorso
+
+
+def _opaco(img):
+    if img.mode in ("RGBA", "LA", "PA"):
+        return img.getchannel("A").getextrema()[0] == 255
+    return "transparency" not in img.info
+
+
+class Command(BaseCommand):
+    help = "Controlla le immagini statiche e ne genera le versioni WebP/AVIF"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--cartella",
+            action="append",
+            help="Cartella tra gli statici (ripetibile, default: assets/img)",
+        )
+        parser.add_argument("--genera", action="store_true", help="Genera le versioni ottimizzate")
+        parser.add_argument(
+            "--processi",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Processi in parallelo per --genera (default: numero di core)",
+        )
+        parser.add_argument("--force", action="store_true", help="Rigenera anche le immagini non cambiate")
+        parser.add_argument("--soglia-kb", type=int, default=300, help="Peso oltre cui segnalare un file")
+
+    def handle(self, *args, **options):
+        cartelle = options["cartella"] or ["assets/img"]
+        manifest = self._leggi_manifest()
+        larghezza_max = max(settings.STATIC_IMMAGINI_WIDTHS)
+
+        da_generare = []
+        esistenti = set()
+        totale = segnalate = 0
+        for nome, percorso in _immagini(cartelle):
+            esistenti.add(nome)
+            byte = percorso.stat().st_size
+            totale += byte
+            problemi = []
+            if percorso.suffix.lower() in NON_SUPPORTATE:
+                problemi.append("formato non mostrato dai browser")
+            else:
+                try:
+                    with Image.open(percorso) as img:
+                        larghezza, altezza = img.size
+                        if byte > options["soglia_kb"] * 1024:
+                            problemi.append(f"pesante ({_kb(byte)})")
+                        if larghezza > larghezza_max:
+                            problemi.append(f"troppo grande ({larghezza}×{altezza})")
+                        if img.format in ("JPEG", "WEBP") and byte / (larghezza * altezza) > BYTE_PER_PIXEL_MAX:
+                            problemi.append(f"poco compressa ({byte / (larghezza * altezza):.2f} byte/pixel)")
+                        if img.format == "PNG" and byte > PNG_OPACO_MAX_BYTE and _opaco(img):
+                            problemi.append("foto in PNG senza trasparenza")
+                except (OSError, UnidentifiedImageError) as e:
+                    problemi.append(f"illeggibile: {e}")
+                else:
+                    impronta = _impronta(percorso)
+                    voce = manifest.get(nome)
+                    if options["force"] or not voce or voce.get("impronta") != impronta:
+                        problemi.append("versioni ottimizzate mancanti o vecchie")
+                        da_generare.append((nome, percorso, impronta))
+
+            if problemi:
+                segnalate += 1
+                self.stdout.write(self.style.WARNING(f"   ! {nome}: {'; '.join(problemi)}"))
+
+        self.stdout.write(f"{segnalate} immagini da controllare, {_kb(totale)} in totale")
+        if options["genera"]:
+            self._genera(da_generare, manifest, esistenti, cartelle, options)
+
+    def _leggi_manifest(self):
+        # Direttamente dalla cartella: può non essere ancora tra gli STATICFILES_DIRS
+        percorso = Path(settings.STATIC_IMMAGINI_DIR) / "manifest.json"
+        if not percorso.exists():
+            return {}
+        return json.loads(percorso.read_text(encoding="utf-8")).get("immagini", {})
+
+    def _genera(self, da_generare, manifest, esistenti, cartelle, options):
+        t0 = time.perf_counter()
+        radice = Path(settings.STATIC_IMMAGINI_DIR)
+        parametri = (
+            list(settings.STATIC_IMMAGINI_WIDTHS),
+            list(settings.STATIC_IMMAGINI_FORMATS),
+            settings.STATIC_IMMAGINI_QUALITY,
+        )
+
+        # Immagini rimosse dalle cartelle elaborate
+        for nome in list(manifest):
+            if any(nome.startswith(f"{c.rstrip('/')}/") for c in cartelle) and nome not in esistenti:
+                shutil.rmtree(radice / cartella_varianti(nome), ignore_errors=True)
+                del manifest[nome]
+
+        prima = dopo = errori = 0
+        with ProcessPoolExecutor(max_workers=max(1, options["processi"])) as pool:
+            futuri = {
+                pool.submit(codifica, str(percorso), str(radice / cartella_varianti(nome)), *parametri): (
+                    nome,
+                    percorso,
+                    impronta,
+                )
+                for nome, percorso, impronta in da_generare
+            }
+            for futuro in as_completed(futuri):
+                nome, percorso, impronta = futuri[futuro]
+                try:
+                    voce = futuro.result()
+                except (OSError, ValueError) as e:
+                    errori += 1
+                    self.stdout.write(self.style.ERROR(f"   ✗ {nome}: {e}"))
+                    continue
+                byte = voce.pop("byte")
+                manifest[nome] = {"impronta": impronta, **voce}
+                # Confronto con la variante che il browser scaricherebbe al posto dell'originale
+                piu_grande = max(voce["varianti"][settings.STATIC_IMMAGINI_FORMATS[-1]])
+                variante = radice / cartella_varianti(nome) / f"{piu_grande}w.{settings.STATIC_IMMAGINI_FORMATS[-1]}"
+                prima += percorso.stat().st_size
+                dopo += variante.stat().st_size
+                self.stdout.write(f"   ✓ {nome} → {_kb(byte)} in {len(voce['varianti'])} formati")
+
+        radice.mkdir(parents=True, exist_ok=True)
+        contenuto = json.dumps({"immagini": dict(sorted(manifest.items()))}, ensure_ascii=False, indent=1)
+        temporaneo = radice / "manifest.json.tmp"
+        temporaneo.write_text(contenuto, encoding="utf-8")
+        os.replace(temporaneo, radice / "manifest.json")
+        get_manifest_statico.cache_clear()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ {len(da_generare) - errori} immagini generate, {errori} errori in "
+            f"{time.perf_counter() - t0:.1f}s ({options['processi']} processi); "
+            f"originali {_kb(prima)} → variante più grande {_kb(dopo)}"
+        ))
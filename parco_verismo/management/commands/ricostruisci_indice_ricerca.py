@@ -0,0 +1,42 @@
+"""
+Comando Django per ricostruire l'indice di ricerca di opere, documenti e
+richieste di contatto.
+
+Da eseguire dopo la migrazione che crea l'indice o dopo import massivi fatti
+senza segnali (es. bulk_create, loaddata).
+
+Uso:
+    python manage.py ricostruisci_indice_ricerca
+    python manage.py ricostruisci_indice_ricerca --modello Opera
+    python manage.py ricostruisci_indice_ricerca --modello Richiesta
+"""
+
+# Standard library imports
+import time
+
+# Django imports
+from django.core.management.base import BaseCommand
+
+# Local imports
+from parco_verismo.services.search_index import MODELLI_INDICIZZATI, ricostruisci_indice
+
+
+class Command(BaseCommand):
+    help = "Ricostruisce l'indice di ricerca full-text di opere, documenti e richieste"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--modello",
+            action="append",
+            choices=list(MODELLI_INDICIZZATI),
+            help="Modello da reindicizzare (ripetibile, default: tutti)",
+        )
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        conteggi = ricostruisci_indice(options["modello"])
+        for modello, numero in conteggi.items():
+            self.stdout.write(f"   {modello}: {numero} oggetti indicizzati")
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Indice ricostruito in {time.perf_counter() - t0:.2f}s"
+        ))
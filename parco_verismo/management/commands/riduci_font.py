@@ -0,0 +1,214 @@
+"""
+Comando Django che riduce i font del sito ai soli caratteri e alle sole
+icone usati, in formato WOFF2.
+
+I font completi sono in parco_verismo/font_sorgenti/ (non serviti; le icone
+vengono copiate lì da `npm run copy-icons`). Il comando scrive in
+static/fonts/:
+- i font di testo (Perandory, TeX Gyre Termes) ridotti all'alfabeto latino
+  di base più i caratteri presenti nei template, nei JS e nei cataloghi
+  .po (it/en), con i rispettivi CSS @font-face e unicode-range
+- il font di Bootstrap Icons con le sole icone (classi bi-*) citate nei
+  template, nei JS e nel codice Python, e il CSS con le sole classi usate
+- il template components/preload_font.html con i <link rel="preload"> dei
+  font usati nella parte iniziale della pagina
+
+Da eseguire dopo aver aggiunto testi con caratteri nuovi o icone nuove,
+prima di `npm run bundle`. Richiede fonttools e brotli (requirements-dev.txt).
+
+Uso:
+    python manage.py riduci_font
+"""
+
+# Standard library imports
+import logging
+import re
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+APP_DIR = Path(__file__).resolve().parents[2]
+SORGENTI = APP_DIR / "font_sorgenti"
+STATIC_FONTS = APP_DIR / "static" / "fonts"
+TEMPLATE_PRELOAD = APP_DIR / "templates" / "parco_verismo" / "components" / "preload_font.html"
+
+# Alfabeto latino di base (come il subset "latin" dei font web): copre anche i
+# testi inseriti dall'admin, che non sono nei template
+CARATTERI_BASE = [
+    (0x0020, 0x007E),
+    (0x00A0, 0x00FF),
+    (0x0131, 0x0131),
+    (0x0152, 0x0153),
+    (0x02C6, 0x02C6),
+    (0x02DA, 0x02DA),
+    (0x02DC, 0x02DC),
+    (0x2013, 0x2014),
+    (0x2018, 0x201E),
+    (0x2020, 0x2022),
+    (0x2026, 0x2026),
+    (0x2030, 0x2030),
+    (0x2039, 0x203A),
+    (0x20AC, 0x20AC),
+    (0x2122, 0x2122),
+]
+
+# (file CSS, famiglia, [(file, stile, peso, precarica)])
+FONT_TESTO = [
+    (
+        "perandory/perandory.css",
+        "Perandory",
+        [("perandory/Perandory-SemiCondensed.woff2", "normal", 400, True)],
+    ),
+    (
+        "tex-gyre-termes/tex-gyre-termes.css",
+        "TeX Gyre Termes",
+        [
+            ("tex-gyre-termes/TeXGyreTermes-Regular.woff2", "normal", 400, True),
+            ("tex-gyre-termes/TeXGyreTermes-Italic.woff2", "italic", 400, False),
+            ("tex-gyre-termes/TeXGyreTermes-Bold.woff2", "normal", 700, False),
+        ],
+    ),
+]
+
+ICONE_CSS = "bootstrap-icons/bootstrap-icons.min.css"
+ICONE_FONT = "bootstrap-icons/fonts/bootstrap-icons.woff2"
+
+ICONA_RE = re.compile(r"\bbi-([a-z0-9]+(?:-[a-z0-9]+)*)")
+REGOLA_ICONA_RE = re.compile(r'\.bi-([a-z0-9-]+)::before\{content:"\\([0-9a-f]+)"\}')
+
+
+def _file_progetto(*estensioni):
+    """File di template, JS e Python del progetto (non i bundle generati)."""
+    for cartella in (APP_DIR / "templates", APP_DIR / "static" / "js", APP_DIR):
+        for percorso in cartella.rglob("*"):
+            if percorso.suffix in estensioni and "bundles" not in percorso.parts:
+                yield percorso
+
+
+def _testi():
+    """Testo dei template, dei JS e dei cataloghi .po."""
+    file = list(_file_progetto(".html", ".txt", ".js"))
+    file += [Path(d) / lingua / "LC_MESSAGES" / "django.po" for d in settings.LOCALE_PATHS for lingua in ("it", "en")]
+    for percorso in file:
+        if percorso.exists():
+            yield percorso.read_text(encoding="utf-8", errors="ignore")
+
+
+def _intervalli(codici):
+    """Codepoint ordinati -> stringa unicode-range (U+0020-007E,U+00A0,...)."""
+    intervalli = []
+    for codice in sorted(codici):
+        if intervalli and codice == intervalli[-1][1] + 1:
+            intervalli[-1][1] = codice
+        else:
+            intervalli.append([codice, codice])
+    return ",".join(
+        f"U+{inizio:04X}" if inizio == fine else f"U+{inizio:04X}-{fine:04X}" for inizio, fine in intervalli
+    )
+
+
+def _dimensione(percorso):
+    return f"{percorso.stat().st_size / 1024:.1f} KB"
+
+
+class Command(BaseCommand):
+    help = "Riduce i font ai caratteri e alle icone usati (WOFF2) e genera i preload"
+
+    def handle(self, *args, **options):
+        try:
+            from fontTools import subset
+        except ImportError:
+            raise CommandError("Serve fonttools: pip install fonttools brotli")
+        self._subset = subset
+        # Avvisi di fontTools sulle tabelle non usate dal browser (FFTM, post)
+        logging.getLogger("fontTools").setLevel(logging.ERROR)
+
+        caratteri = {c for inizio, fine in CARATTERI_BASE for c in range(inizio, fine + 1)}
+        for testo in _testi():
+            caratteri.update(ord(c) for c in testo if ord(c) >= 0x20)
+
+        preload = []
+        for css, famiglia, facce in FONT_TESTO:
+            regole = []
+            for nome, stile, peso, precarica in facce:
+                codici = self._riduci(nome, caratteri)
+                regole.append(
+                    "@font-face {\n"
+                    f"  font-family: '{famiglia}';\n"
+                    f"  font-style: {stile};\n"
+                    "  font-display: swap;\n"
+                    f"  font-weight: {peso};\n"
+                    f"  src: url('./{Path(nome).name}') format('woff2');\n"
+                    f"  unicode-range: {_intervalli(codici)};\n"
+                    "}\n"
+                )
+                if precarica:
+                    preload.append(f"fonts/{nome}")
+            intestazione = f"/* {famiglia} - generato da `python manage.py riduci_font`, non modificare */\n\n"
+            (STATIC_FONTS / css).write_text(intestazione + "\n".join(regole), encoding="utf-8")
+
+        self._riduci_icone()
+        self._scrivi_preload(preload)
+        self.stdout.write(self.style.SUCCESS("✓ Font ridotti: eseguire npm run bundle per aggiornare i bundle"))
+
+    def _riduci(self, nome, caratteri):
+        """Scrive il font ridotto ai caratteri dati; restituisce i codepoint inclusi."""
+        sorgente = SORGENTI / nome
+        destinazione = STATIC_FONTS / nome
+        font = self._subset.load_font(str(sorgente), self._subset.Options())
+        presenti = set(font.getBestCmap())
+        codici = caratteri & presenti
+
+        opzioni = self._subset.Options()
+        opzioni.flavor = "woff2"
+        opzioni.layout_features = ["*"]
+        subsetter = self._subset.Subsetter(opzioni)
+        subsetter.populate(unicodes=codici)
+        subsetter.subset(font)
+        destinazione.parent.mkdir(parents=True, exist_ok=True)
+        self._subset.save_font(font, str(destinazione), opzioni)
+        self.stdout.write(
+            f"   {nome}: {_dimensione(sorgente)} → {_dimensione(destinazione)} ({len(codici)} caratteri)"
+        )
+        return codici
+
+    def _riduci_icone(self):
+        css = (SORGENTI / ICONE_CSS).read_text(encoding="utf-8")
+        disponibili = {nome: int(codice, 16) for nome, codice in REGOLA_ICONA_RE.findall(css)}
+
+        usate = set()
+        for percorso in _file_progetto(".html", ".js", ".py"):
+            usate.update(ICONA_RE.findall(percorso.read_text(encoding="utf-8", errors="ignore")))
+        sconosciute = sorted(usate - set(disponibili))
+        usate &= set(disponibili)
+        if sconosciute:
+            self.stdout.write(self.style.WARNING(f"   Icone non in Bootstrap Icons: {', '.join(sconosciute)}"))
+
+        self._riduci(ICONE_FONT, {disponibili[nome] for nome in usate})
+
+        # Licenza, @font-face solo WOFF2 e regola comune, poi le sole icone usate
+        inizio = css[: REGOLA_ICONA_RE.search(css).start()]
+        inizio = re.sub(
+            r"src:url\([^}]*",
+            'src:url("fonts/bootstrap-icons.woff2") format("woff2")',
+            inizio,
+            count=1,
+        )
+        regole = "".join(
+            f'.bi-{nome}::before{{content:"\\{disponibili[nome]:x}"}}' for nome in sorted(usate)
+        )
+        (STATIC_FONTS / ICONE_CSS).write_text(inizio + regole + "\n", encoding="utf-8")
+        self.stdout.write(f"   {ICONE_CSS}: {len(usate)} icone su {len(disponibili)}")
+
+    def _scrivi_preload(self, preload):
+        righe = [
+            "{% load static %}",
+            "{# Generato da `python manage.py riduci_font`, non modificare #}",
+        ]
+        righe += [
+            f'<link rel="preload" href="{{% static \'{percorso}\' %}}" as="font" type="font/woff2" crossorigin>'
+            for percorso in preload
+        ]
+        TEMPLATE_PRELOAD.write_text("\n".join(righe) + "\n", encoding="utf-8")
@@ -0,0 +1,135 @@
+"""
+Comando Django che esegue i lavori in background accodati nel database
+(email, ottimizzazione immagini, rendition, percorsi degli itinerari).
+
+Più worker possono girare in parallelo, anche su macchine diverse: ogni
+lavoro viene preso in carico da uno solo (vedi services/job_queue.py).
+SIGTERM e SIGINT fermano il worker al termine dei lavori in corso.
+
+Uso:
+    python manage.py run_worker
+    python manage.py run_worker --concurrency 4
+    python manage.py run_worker --burst    # esegue i lavori pronti ed esce
+"""
+
+# Standard library imports
+import os
+import signal
+import socket
+import threading
+import time
+
+# Django imports
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+# Local imports
+from parco_verismo.services.job_queue import (
+    esegui_job,
+    prendi_job,
+    pulisci_job_completati,
+    recupera_job_bloccati,
+)
+
+# Ogni quanti secondi rimettere in coda i lavori bloccati e pulire i completati
+INTERVALLO_MANUTENZIONE = 60
+
+
+class Command(BaseCommand):
+    help = "Esegue i lavori in background accodati nel database"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency", type=int, default=1, help="Lavori eseguiti in parallelo (thread)"
+        )
+        parser.add_argument(
+            "--burst",
+            "--once",
+            action="store_true",
+            help="Esegue i lavori pronti ed esce quando la coda è vuota",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Secondi di attesa quando la coda è vuota",
+        )
+
+    def handle(self, *args, **options):
+        self.stop = threading.Event()
+        self.nome = f"{socket.gethostname()}:{os.getpid()}"
+        self.eseguiti = 0
+        self.falliti = 0
+        self._lock = threading.Lock()
+
+        for segnale in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(segnale, self._ferma)
+
+        self._manutenzione()
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {self.nome} avviato ({options['concurrency']} thread)"
+        ))
+
+        threads = [
+            threading.Thread(
+                target=self._ciclo,
+                args=(f"{self.nome}/{i}", options["burst"], options["sleep"]),
+                name=f"worker-{i}",
+            )
+            for i in range(max(1, options["concurrency"]))
+        ]
+        for thread in threads:
+            thread.start()
+
+        ultima_manutenzione = time.monotonic()
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+            if time.monotonic() - ultima_manutenzione > INTERVALLO_MANUTENZIONE:
+                self._manutenzione()
+                ultima_manutenzione = time.monotonic()
+        connection.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Worker {self.nome} fermato: {self.eseguiti} lavori eseguiti, {self.falliti} falliti"
+        ))
+
+    def _ferma(self, signum, frame):
+        self.stdout.write(self.style.WARNING("Arresto richiesto, attendo i lavori in corso..."))
+        self.stop.set()
+
+    def _manutenzione(self):
+        recuperati = recupera_job_bloccati()
+        if recuperati:
+            self.stdout.write(self.style.WARNING(f"{recuperati} lavori bloccati rimessi in coda"))
+        pulisci_job_completati()
+
+    def _ciclo(self, nome, burst, attesa):
+        """Ciclo di un thread: prende ed esegue lavori finché non viene fermato."""
+        try:
+            while not self.stop.is_set():
+                close_old_connections()
+                job = prendi_job(nome)
+                if job is None:
+                    if burst:
+                        return
+                    self.stop.wait(attesa)
+                    continue
+
+                inizio = time.perf_counter()
+                riuscito = esegui_job(job)
+                durata = time.perf_counter() - inizio
+                with self._lock:
+                    if riuscito:
+                        self.eseguiti += 1
+                    else:
+                        self.falliti += 1
+                if riuscito:
+                    self.stdout.write(f"   ✓ {job} in {durata:.2f}s")
+                else:
+                    self.stdout.write(self.style.ERROR(
+                        f"   ✗ {job} (tentativo {job.tentativi}/{job.max_tentativi})"
+                    ))
+        finally:
+            # Ogni thread ha la propria connessione al database
+            connection.close()
@@ -0,0 +1,153 @@
+"""
+Comando Django che verifica i piani di esecuzione delle query più frequenti
+delle pagine pubbliche e dei servizi: nessuna deve leggere per intero una
+tabella (full scan) invece di usare un indice.
+
+Per ogni query esegue EXPLAIN (EXPLAIN QUERY PLAN su SQLite) e cerca le
+letture complete:
+- SQLite: "SCAN <tabella>" senza indice, oppure la lettura di un intero
+  indice ("SCAN <tabella> USING INDEX") seguita da un ordinamento in memoria;
+  senza ordinamento l'indice viene letto in ordine e la LIMIT la ferma presto
+- PostgreSQL: "Seq Scan on <tabella>". Le letture sequenziali sono
+  disattivate durante la verifica (enable_seqscan = off): con tabelle
+  piccole il planner le preferirebbe comunque, nascondendo un indice mancante
+
+Gli altri ordinamenti in memoria (SQLite "USE TEMP B-TREE", PostgreSQL
+"Sort") sono segnalati ma non fanno fallire la verifica.
+
+Uso:
+    python manage.py verifica_piani_query
+    python manage.py verifica_piani_query --query notizie_pagina --query foto_autore
+    python manage.py verifica_piani_query -v 2   # mostra anche i piani
+"""
+
+# Standard library imports
+import re
+from datetime import timedelta
+
+# Django imports
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# Local imports
+from parco_verismo.models import Evento, FotoArchivio, Itinerario, Notizia, Richiesta
+from parco_verismo.services.search_service import (
+    get_eventi_futuri,
+    get_notizie_recenti,
+    ricerca_documenti,
+)
+from parco_verismo.views.documenti import AUTORI_ARCHIVIO, ORDINAMENTO_FOTO
+from parco_verismo.views.eventi import CALENDARIO_GIORNI
+
+# Elementi per pagina (più uno, come pagina_keyset) e istante dei filtri per data
+PAGINA = 21
+ADESSO = timezone.now()
+
+
+def _dopo(campo, valore):
+    """Filtro di pagina_keyset per la pagina successiva, ordinamento (-campo, -pk)."""
+    return Q(**{f"{campo}__lt": valore}) | Q(**{campo: valore, "pk__lt": 1_000_000})
+
+
+# Nome -> funzione che costruisce la query come fanno view e servizi
+QUERY = {
+    # Home, eventi, ricerca
+    "notizie_recenti": lambda: get_notizie_recenti(5),
+    "eventi_futuri": lambda: get_eventi_futuri(5),
+    "eventi_passati": lambda: Evento.objects.filter(is_active=True, data_inizio__lt=ADESSO)
+    .order_by("-data_inizio")[:5],
+    "evento_dettaglio": lambda: Evento.objects.filter(slug="verifica", is_active=True),
+    # Pagina notizie
+    "notizie_pagina": lambda: Notizia.objects.filter(is_active=True)
+    .order_by("-data_pubblicazione", "-pk")
+    .filter(_dopo("data_pubblicazione", ADESSO))[:PAGINA],
+    "notizie_calendario": lambda: Notizia.objects.filter(
+        is_active=True, data_pubblicazione__gte=ADESSO - timedelta(days=CALENDARIO_GIORNI)
+    ).order_by("-data_pubblicazione")[:100],
+    "notizia_dettaglio": lambda: Notizia.objects.filter(slug="verifica", is_active=True),
+    # Documenti
+    "documenti_pagina": lambda: ricerca_documenti("")
+    .order_by("-data_pubblicazione", "-pk")
+    .filter(_dopo("data_pubblicazione", ADESSO))[:PAGINA],
+    "documenti_tipo": lambda: ricerca_documenti("", tipo="studio")
+    .order_by("-data_pubblicazione", "-pk")[:PAGINA],
+    # Archivio fotografico
+    "foto_autore": lambda: FotoArchivio.objects.filter(is_active=True, autore=AUTORI_ARCHIVIO[0])
+    .order_by(*ORDINAMENTO_FOTO)[:PAGINA],
+    # exists(): senza ordinamento
+    "foto_altri_autori": lambda: FotoArchivio.objects.filter(is_active=True)
+    .exclude(autore__in=AUTORI_ARCHIVIO)
+    .order_by()[:1],
+    # Itinerari (mappa per tipo)
+    "itinerari_tipo": lambda: Itinerario.objects.filter(is_active=True, tipo="verga")
+    .order_by("ordine"),
+    # Traduzioni caricate da con_traduzioni()
+    "traduzioni_eventi": lambda: Evento._parler_meta.root_model.objects.filter(
+        master_id__in=[1, 2, 3], language_code__in=["it", "en"]
+    ),
+    # Dashboard delle richieste
+    "richieste_nuove": lambda: Richiesta.objects.filter(stato="nuova").order_by("-data_richiesta")[:10],
+    "richieste_in_ritardo": lambda: Richiesta.objects.in_ritardo().order_by("data_richiesta")[:10],
+}
+
+SCAN_SQLITE = re.compile(r"\bSCAN (?:TABLE )?(\w+)(.*)")
+SCAN_POSTGRESQL = re.compile(r"Seq Scan on (\w+)")
+ORDINAMENTO = re.compile(r"USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY|\bSort\b")
+
+
+class Command(BaseCommand):
+    help = "Verifica che le query più frequenti usino un indice (niente full scan)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--query", action="append", choices=list(QUERY), help="Query da verificare (ripetibile)"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ("sqlite", "postgresql"):
+            raise CommandError(f"Database non supportato: {connection.vendor}")
+        tabelle = set(connection.introspection.table_names())
+
+        errori = []
+        for nome in options["query"] or QUERY:
+            piano = self._piano(QUERY[nome]())
+            if options["verbosity"] > 1:
+                self.stdout.write(f"   {nome}:\n" + "\n".join(f"      {riga}" for riga in piano.splitlines()))
+
+            scansioni = self._scansioni(piano, tabelle)
+            if scansioni:
+                errori.append(nome)
+                self.stdout.write(self.style.ERROR(
+                    f"   ✗ {nome}: lettura completa di {', '.join(scansioni)}"
+                ))
+            elif ORDINAMENTO.search(piano):
+                self.stdout.write(self.style.WARNING(f"   ✓ {nome}: indice usato, ordinamento in memoria"))
+            else:
+                self.stdout.write(self.style.SUCCESS(f"   ✓ {nome}: indice usato"))
+
+        if errori:
+            raise CommandError(f"Query senza indice: {', '.join(errori)}")
+        self.stdout.write(self.style.SUCCESS("✓ Tutte le query usano un indice"))
+
+    def _piano(self, queryset):
+        if connection.vendor == "postgresql":
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL enable_seqscan = off")
+                return queryset.explain()
+        return queryset.explain()
+
+    def _scansioni(self, piano, tabelle):
+        """Tabelle lette per intero secondo il piano."""
+        if connection.vendor == "postgresql":
+            return sorted({tabella for tabella in SCAN_POSTGRESQL.findall(piano) if tabella in tabelle})
+        ordina = ORDINAMENTO.search(piano) is not None
+        return sorted(
+            {
+                tabella
+                for tabella, resto in SCAN_SQLITE.findall(piano)
+                if tabella in tabelle and ("USING" not in resto or ordina)
+            }
+        )
@@ -0,0 +1,130 @@
+"""
+Comando Django che verifica che template e JavaScript usino solo URL degli
+statici con hash nel nome.
+
+In produzione (STATICFILES_MANIFEST) i file statici sono serviti con cache
+"immutable" di un anno: un URL scritto a mano (/static/css/styles.css o
+{% static %}?v=3) non cambierebbe al deploy e i browser terrebbero la
+versione vecchia. Segnala:
+- URL /static/... scritti a mano nei template e nei file .js
+- query string aggiunte a {% static %} per forzare l'aggiornamento
+- {% static 'percorso' %} che non esistono (o non sono nel manifest dopo
+  collectstatic)
+- bundle CSS/JS mancanti o non rigenerati (npm run bundle) dopo una
+  modifica dei file sorgente
+
+Uso:
+    python manage.py verifica_statici
+"""
+
+# Standard library imports
+import os
+import re
+from pathlib import Path
+
+# Django imports
+from django.apps import apps
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management.base import BaseCommand, CommandError
+
+# Local imports
+from parco_verismo.utils.bundle import file_bundle, get_bundles, impronta, impronta_bundle, percorso_bundle
+
+# {% static 'percorso' %} con percorso letterale, e quello che segue il tag
+STATIC_TAG_RE = re.compile(r"""\{%\s*static\s+(['"])([^'"]+)\1\s*%\}(\?)?""")
+
+
+def _url_statici_re():
+    # /static/... dentro virgolette, parentesi o attributi (non {% static %})
+    return re.compile(r"""["'(=\s](%s[^"'\s)]+)""" % re.escape(settings.STATIC_URL))
+
+
+def _template():
+    cartelle = [Path(d) for config in settings.TEMPLATES for d in config.get("DIRS", [])]
+    # Solo le app del progetto: quelle installate con pip usano già {% static %}
+    cartelle += [
+        Path(config.path) / "templates"
+        for config in apps.get_app_configs()
+        if Path(config.path).is_relative_to(settings.BASE_DIR)
+    ]
+    for cartella in cartelle:
+        for radice, _dirs, nomi in os.walk(cartella):
+            for nome in nomi:
+                if nome.endswith((".html", ".txt", ".xml")):
+                    yield Path(radice) / nome
+
+
+def _javascript():
+    for cartella in settings.STATICFILES_DIRS:
+        if isinstance(cartella, (list, tuple)):
+            # (prefisso, cartella): generate, es. le immagini ottimizzate
+            continue
+        for percorso in Path(cartella).rglob("*.js"):
+            if not percorso.name.endswith(".min.js"):
+                yield percorso
+
+
+def _esiste(percorso):
+    """Il file è tra gli statici (nel manifest se collectstatic è attivo)."""
+    if settings.STATICFILES_MANIFEST:
+        return staticfiles_storage.nel_manifest(percorso)
+    return finders.find(percorso) is not None
+
+
+class Command(BaseCommand):
+    help = "Verifica che template e JS usino solo URL degli statici con hash"
+
+    def handle(self, *args, **options):
+        url_statici_re = _url_statici_re()
+        errori = []
+
+        for percorso in _template():
+            for numero, riga in enumerate(percorso.read_text(encoding="utf-8").splitlines(), 1):
+                posizione = f"{percorso.relative_to(settings.BASE_DIR)}:{numero}"
+                for match in STATIC_TAG_RE.finditer(riga):
+                    if match.group(3):
+                        errori.append(f"{posizione}: query string dopo {{% static '{match.group(2)}' %}}")
+                    if not _esiste(match.group(2)):
+                        errori.append(f"{posizione}: file statico inesistente '{match.group(2)}'")
+                for match in url_statici_re.finditer(riga):
+                    errori.append(f"{posizione}: URL senza hash {match.group(1)}")
+
+        for percorso in _javascript():
+            for numero, riga in enumerate(percorso.read_text(encoding="utf-8").splitlines(), 1):
+                for match in url_statici_re.finditer(riga):
+                    errori.append(
+                        f"{percorso.relative_to(settings.BASE_DIR)}:{numero}: "
+                        f"URL senza hash {match.group(1)}"
+                    )
+
+        errori += self._verifica_bundle()
+
+        for errore in errori:
+            self.stdout.write(self.style.ERROR(f"   ✗ {errore}"))
+        if errori:
+            raise CommandError(f"{len(errori)} riferimenti a statici senza hash")
+        self.stdout.write(self.style.SUCCESS("✓ Tutti gli statici sono referenziati con {% static %}"))
+
+    def _verifica_bundle(self):
+        errori = []
+        for tipo, bundles in get_bundles().items():
+            if tipo not in ("css", "js"):
+                continue
+            for nome, definizione in bundles.items():
+                try:
+                    atteso = impronta(file_bundle(tipo, nome))
+                except FileNotFoundError as e:
+                    errori.append(f"bundle {nome}.{tipo}: file sorgente inesistente '{e}'")
+                    continue
+                percorsi = [percorso_bundle(tipo, nome)]
+                if tipo == "css" and "critico" in definizione:
+                    percorsi.append(percorso_bundle(tipo, nome, critico=True))
+                for percorso in percorsi:
+                    trovato = impronta_bundle(percorso)
+                    if trovato is None:
+                        errori.append(f"{percorso} mancante: eseguire npm run bundle")
+                    elif trovato != atteso:
+                        errori.append(f"{percorso} non aggiornato: eseguire npm run bundle")
+        return errori
@@ -2,17 +2,22 @@
 Middleware personalizzato per rate limiting e sicurezza.
 """
 
-# Standard library imports
-import time
-
-
 # Django imports
-from django.core.cache import cache
 from django.http import HttpResponse
 from django.utils.translation import gettext as _
 from django.conf import settings
 from django.shortcuts import render
 
+# Local imports
+from .utils.file_radice import percorsi_file_radice
+from .utils.page_cache import (
+    build_response,
+    get_page_cache,
+    page_cache_key,
+    serialize_response,
+)
+from .utils.ratelimit import get_rate_limiter
+
 class MaintenanceMiddleware:
     """
     Middleware che intercetta tutte le richieste quando il sito è in manutenzione.
@@ -48,8 +53,14 @@ class SimpleRateLimitMiddleware:
     Per siti con buona affluenza (consigliato):
     - 10 richieste POST per minuto per IP
     - 100 richieste GET per minuto per IP
+
+    I contatori sono condivisi tra tutti i worker (vedi utils.ratelimit e
+    l'impostazione RATELIMIT_BACKEND).
     """
 
+    # robots.txt, favicon.ico, ...: serviti dalla memoria, non serve limitarli
+    FILE_RADICE = frozenset(percorsi_file_radice())
+
     def __init__(self, get_response):
         self.get_response = get_response
         # Configurazione rate limits
@@ -64,6 +75,7 @@ class SimpleRateLimitMiddleware:
             request.path.startswith("/admin/")
             or request.path.startswith("/static/")
             or request.path.startswith("/media/")
+            or request.path in self.FILE_RADICE
         ):
             return self.get_response(request)
 
@@ -98,27 +110,77 @@ class SimpleRateLimitMiddleware:
         if not limit_config:
             return True
 
-        cache_key = f"ratelimit:{method}:{ip_address}"
+        return get_rate_limiter().hit(
+            f"{method}:{ip_address}",
+            max_requests=limit_config["requests"],
+            window=limit_config["window"],
+        )
 
-        # Ottieni il contatore corrente
-        request_times = cache.get(cache_key, [])
-        current_time = time.time()
-        window = limit_config["window"]
-        max_requests = limit_config["requests"]
 
-        # Rimuovi richieste fuori dalla finestra temporale
-        request_times = [t for t in request_times if current_time - t < window]
+class AnonymousPageCacheMiddleware:
+    """
+    Cache delle pagine pubbliche per visitatori anonimi (GET/HEAD senza messaggi).
 
-        # Controlla se superato il limite
-        if len(request_times) >= max_requests:
-            return False
+    La chiave include lingua, query string e generazione dei contenuti,
+    quindi ogni salvataggio nell'admin invalida automaticamente la cache.
+    Va posizionato dopo Locale, Auth e Messages middleware.
+    """
+
+    # I file della radice sono già in memoria (vedi utils/file_radice.py)
+    EXCLUDED_PREFIXES = (
+        "/admin/", "/richieste/", "/static/", "/media/", "/i18n/", "/health/",
+        *percorsi_file_radice(),
+    )
 
-        # Aggiungi la richiesta corrente
-        request_times.append(current_time)
-        cache.set(cache_key, request_times, window)
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.timeout = getattr(settings, "PAGE_CACHE_TIMEOUT", 300)
+
+    def __call__(self, request):
+        if not self.is_cacheable_request(request):
+            return self.get_response(request)
 
+        cache = get_page_cache()
+        cache_key = page_cache_key(request)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            return build_response(request, entry)
+
+        response = self.get_response(request)
+        if self.is_cacheable_response(response):
+            cache.set(cache_key, serialize_response(request, response), self.timeout)
+        return response
+
+    def is_cacheable_request(self, request):
+        """Solo GET/HEAD anonimi, fuori da admin e file statici, senza messaggi in coda"""
+        if not getattr(settings, "PAGE_CACHE_ENABLED", True):
+            return False
+        if request.method not in ("GET", "HEAD"):
+            return False
+        if request.path.startswith(self.EXCLUDED_PREFIXES):
+            return False
+        user = getattr(request, "user", None)
+        if user is None or user.is_authenticated:
+            return False
+        # len() legge i messaggi senza marcarli come consumati
+        storage = getattr(request, "_messages", None)
+        if storage is not None and len(storage):
+            return False
+        # Le richieste condizionali arrivano alla view, che può rispondere 304
+        # con una sola query (vedi utils/condizionale.py)
+        if "HTTP_IF_NONE_MATCH" in request.META or "HTTP_IF_MODIFIED_SINCE" in request.META:
+            return False
         return True
 
+    def is_cacheable_response(self, response):
+        """Solo risposte 200 complete, senza cookie e senza Cache-Control privati"""
+        if response.status_code != 200 or response.streaming:
+            return False
+        if response.cookies:
+            return False
+        cache_control = response.get("Cache-Control", "")
+        return "private" not in cache_control and "no-store" not in cache_control
+
 
 class SecurityHeadersMiddleware:
     """
@@ -0,0 +1,90 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:47
+
+from django.db import migrations, models
+
+# Indice full-text specifico del database (vedi services/search_index.py)
+SQLITE_FORWARD = [
+    # Tabella FTS5 "external content": i testi restano in parco_verismo_vocericerca
+    """CREATE VIRTUAL TABLE parco_verismo_vocericerca_fts USING fts5(
+        titolo, testo, content='parco_verismo_vocericerca', content_rowid='id'
+    )""",
+    """CREATE TRIGGER parco_verismo_vocericerca_ai AFTER INSERT ON parco_verismo_vocericerca BEGIN
+        INSERT INTO parco_verismo_vocericerca_fts(rowid, titolo, testo)
+        VALUES (new.id, new.titolo, new.testo);
+    END""",
+    """CREATE TRIGGER parco_verismo_vocericerca_ad AFTER DELETE ON parco_verismo_vocericerca BEGIN
+        INSERT INTO parco_verismo_vocericerca_fts(parco_verismo_vocericerca_fts, rowid, titolo, testo)
+        VALUES ('delete', old.id, old.titolo, old.testo);
+    END""",
+    """CREATE TRIGGER parco_verismo_vocericerca_au AFTER UPDATE ON parco_verismo_vocericerca BEGIN
+        INSERT INTO parco_verismo_vocericerca_fts(parco_verismo_vocericerca_fts, rowid, titolo, testo)
+        VALUES ('delete', old.id, old.titolo, old.testo);
+        INSERT INTO parco_verismo_vocericerca_fts(rowid, titolo, testo)
+        VALUES (new.id, new.titolo, new.testo);
+    END""",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS parco_verismo_vocericerca_au",
+    "DROP TRIGGER IF EXISTS parco_verismo_vocericerca_ad",
+    "DROP TRIGGER IF EXISTS parco_verismo_vocericerca_ai",
+    "DROP TABLE IF EXISTS parco_verismo_vocericerca_fts",
+]
+
+# Il testo è già normalizzato in Python: basta la configurazione 'simple'
+POSTGRESQL_FORWARD = [
+    """CREATE INDEX parco_verismo_vocericerca_tsv ON parco_verismo_vocericerca USING GIN ((
+        setweight(to_tsvector('simple'::regconfig, titolo), 'A')
+        || setweight(to_tsvector('simple'::regconfig, testo), 'B')
+    ))""",
+]
+POSTGRESQL_BACKWARD = [
+    "DROP INDEX IF EXISTS parco_verismo_vocericerca_tsv",
+]
+
+
+def _esegui(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def crea_indice_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _esegui(schema_editor, SQLITE_FORWARD)
+    elif vendor == "postgresql":
+        _esegui(schema_editor, POSTGRESQL_FORWARD)
+
+
+def elimina_indice_fulltext(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "sqlite":
+        _esegui(schema_editor, SQLITE_BACKWARD)
+    elif vendor == "postgresql":
+        _esegui(schema_editor, POSTGRESQL_BACKWARD)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0027_alter_ristorante_options_remove_ristorante_indirizzo_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VoceRicerca',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('modello', models.CharField(max_length=50, verbose_name='Modello')),
+                ('oggetto_id', models.PositiveBigIntegerField(verbose_name='ID oggetto')),
+                ('lingua', models.CharField(max_length=15, verbose_name='Lingua')),
+                ('titolo', models.TextField(blank=True)),
+                ('testo', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Voce indice di ricerca',
+                'verbose_name_plural': 'Indice di ricerca',
+                'constraints': [models.UniqueConstraint(fields=('modello', 'oggetto_id', 'lingua'), name='voce_ricerca_unica')],
+            },
+        ),
+        migrations.RunPython(crea_indice_fulltext, elimina_indice_fulltext),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:55
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0028_voce_ricerca'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nome', models.CharField(max_length=100, verbose_name='Lavoro')),
+                ('argomenti', models.JSONField(blank=True, default=dict, verbose_name='Argomenti')),
+                ('stato', models.CharField(choices=[('in_coda', 'In coda'), ('in_esecuzione', 'In esecuzione'), ('completato', 'Completato'), ('fallito', 'Fallito')], default='in_coda', max_length=20, verbose_name='Stato')),
+                ('tentativi', models.PositiveIntegerField(default=0, verbose_name='Tentativi')),
+                ('max_tentativi', models.PositiveIntegerField(default=5, verbose_name='Tentativi massimi')),
+                ('esegui_dopo', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Esegui dopo')),
+                ('worker', models.CharField(blank=True, max_length=100, verbose_name='Worker')),
+                ('iniziato_il', models.DateTimeField(blank=True, null=True, verbose_name='Iniziato il')),
+                ('completato_il', models.DateTimeField(blank=True, null=True, verbose_name='Completato il')),
+                ('errore', models.TextField(blank=True, verbose_name='Ultimo errore')),
+                ('creato_il', models.DateTimeField(auto_now_add=True, verbose_name='Creato il')),
+            ],
+            options={
+                'verbose_name': 'Lavoro in background',
+                'verbose_name_plural': 'Lavori in background',
+                'ordering': ['-creato_il'],
+                'indexes': [models.Index(fields=['stato', 'esegui_dopo'], name='job_stato_esegui_idx')],
+            },
+        ),
+    ]
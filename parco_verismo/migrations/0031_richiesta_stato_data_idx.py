@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 18:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0030_documento_updated_at_evento_updated_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='richiesta',
+            index=models.Index(fields=['stato', 'data_richiesta'], name='richiesta_stato_data_idx'),
+        ),
+    ]
@@ -0,0 +1,47 @@
+from django.db import migrations
+
+from parco_verismo.utils.testo import tokenizza
+
+# Stessi campi di services/search_index._campi_richiesta, indicizzati in italiano
+CAMPI_TITOLO = ("nome", "cognome", "email", "ente", "oggetto", "guida_assegnata")
+CAMPI_TESTO = ("messaggio", "note_admin")
+
+
+def _token(richiesta, campi):
+    return " ".join(tokenizza(" ".join(getattr(richiesta, campo) or "" for campo in campi), "it"))
+
+
+def indicizza_richieste(apps, schema_editor):
+    """Le richieste già presenti: le nuove sono indicizzate dai segnali."""
+    Richiesta = apps.get_model("parco_verismo", "Richiesta")
+    VoceRicerca = apps.get_model("parco_verismo", "VoceRicerca")
+    voci = []
+    for richiesta in Richiesta.objects.iterator(chunk_size=1000):
+        voci.append(
+            VoceRicerca(
+                modello="Richiesta",
+                oggetto_id=richiesta.pk,
+                lingua="it",
+                titolo=_token(richiesta, CAMPI_TITOLO),
+                testo=_token(richiesta, CAMPI_TESTO),
+            )
+        )
+        if len(voci) == 1000:
+            VoceRicerca.objects.bulk_create(voci)
+            voci = []
+    VoceRicerca.objects.bulk_create(voci)
+
+
+def rimuovi_richieste(apps, schema_editor):
+    apps.get_model("parco_verismo", "VoceRicerca").objects.filter(modello="Richiesta").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0031_richiesta_stato_data_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(indicizza_richieste, rimuovi_richieste),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0032_indice_ricerca_richieste'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='documento',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['data_pubblicazione'], name='documento_attivo_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='documento',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['tipo', 'data_pubblicazione'], name='documento_attivo_tipo_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evento',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['data_inizio'], name='evento_attivo_inizio_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fotoarchivio',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['autore', 'ordine'], name='foto_attiva_autore_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notizia',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['data_pubblicazione'], name='notizia_attiva_data_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 19:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('parco_verismo', '0033_indici_liste_pubbliche'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='scade_il',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Assegnazione scade il'),
+        ),
+    ]
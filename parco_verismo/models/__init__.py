@@ -10,6 +10,8 @@ from .documenti import Documento, FotoArchivio
 from .itinerari import Itinerario, ItinerarioImmagine
 from .richieste import Richiesta
 from .ristoranti import Ristorante
+from .ricerca import VoceRicerca
+from .jobs import Job
 
 # Esporta tutti i modelli
 __all__ = [
@@ -35,4 +37,8 @@ __all__ = [
     "Richiesta",
     # Ristoranti
     "Ristorante",
+    # Indice di ricerca
+    "VoceRicerca",
+    # Lavori in background
+    "Job",
 ]
@@ -4,15 +4,17 @@ Modelli per Autori e Opere letterarie.
 # Django imports
 from django.db import models
 from django.urls import reverse
-from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
 
 # Third-party imports
 from parler.models import TranslatableModel, TranslatedFields
-from parco_verismo.utils.image_optimizer import optimize_image
 
+# Local imports
+from .managers import TraduzioniManager
+from parco_verismo.utils.mixins import ValoriOriginaliMixin, SlugUnicoMixin
 
-class LuogoLetterario(models.Model):
+
+class LuogoLetterario(SlugUnicoMixin, models.Model):
     """Luoghi dell'ispirazione letteraria (Vizzini, Mineo, Licodia Eubea)"""
     nome = models.CharField(max_length=100, unique=True, verbose_name=_("Nome del luogo"))
     slug = models.SlugField(max_length=100, unique=True, blank=True)
@@ -29,17 +31,11 @@ class LuogoLetterario(models.Model):
     
     def save(self, *args, **kwargs):
         if not self.slug:
-            base_slug = slugify(self.nome)
-            slug = base_slug
-            counter = 1
-            while LuogoLetterario.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = self.genera_slug_unico(self.nome)
         super().save(*args, **kwargs)
 
 
-class Autore(models.Model):
+class Autore(SlugUnicoMixin, models.Model):
     nome = models.CharField(max_length=100, unique=True)
     slug = models.SlugField(max_length=100, unique=True, blank=True, help_text=_("Lascia vuoto per generare automaticamente dal nome."))
     # ... puoi aggiungere biografia, foto, etc.
@@ -50,13 +46,7 @@ class Autore(models.Model):
     def save(self, *args, **kwargs):
         # Genera slug automaticamente dal nome se non specificato
         if not self.slug:
-            base_slug = slugify(self.nome)
-            slug = base_slug
-            counter = 1
-            while Autore.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = self.genera_slug_unico(self.nome)
         super().save(*args, **kwargs)
 
     class Meta:
@@ -64,7 +54,7 @@ class Autore(models.Model):
         verbose_name_plural = _("Autori")
 
 
-class Opera(TranslatableModel):
+class Opera(ValoriOriginaliMixin, SlugUnicoMixin, TranslatableModel):
     FONTE_CHOICES = [
         ('wikisource', _('WikiSource')),
         ('internet_archive', _('Internet Archive')),
@@ -85,6 +75,8 @@ class Opera(TranslatableModel):
     )
     copertina = models.ImageField(upload_to="copertine/", blank=True, null=True, help_text=_("Carica la copertina dell'opera."))
 
+    objects = TraduzioniManager()
+
     translations = TranslatedFields(
         titolo=models.CharField(max_length=200),
         breve_descrizione=models.TextField(blank=True, null=True, verbose_name=_("Breve descrizione")),
@@ -104,22 +96,7 @@ class Opera(TranslatableModel):
         if not self.slug:
             # Tenta di ottenere titolo (fallback a "opera" se vuoto)
             titolo = self.safe_translation_getter('titolo', any_language=True) or "opera"
-            base_slug = slugify(titolo)
-            slug = base_slug
-            counter = 1
-            while Opera.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
-        # Ottimizza l'immagine (copertina)
-        if self.copertina:
-            try:
-                this = Opera.objects.get(pk=self.pk)
-                if this.copertina != self.copertina:
-                    self.copertina = optimize_image(self.copertina)
-            except Opera.DoesNotExist:
-                self.copertina = optimize_image(self.copertina)
+            self.slug = self.genera_slug_unico(titolo)
 
         super().save(*args, **kwargs)
     
@@ -4,15 +4,18 @@ Modelli per Documenti e Archivio Fotografico.
 
 # Django imports
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse
-from django.utils.text import slugify
 
 # Third-party imports
 from parler.models import TranslatableModel, TranslatedFields
-from parco_verismo.utils.image_optimizer import optimize_image
 
+# Local imports
+from .managers import TraduzioniManager
+from parco_verismo.utils.mixins import ValoriOriginaliMixin, SlugUnicoMixin
 
-class Documento(TranslatableModel):
+
+class Documento(ValoriOriginaliMixin, SlugUnicoMixin, TranslatableModel):
     """
     Modello per documenti e studi pubblicati dal Parco Letterario.
     Solo gli admin possono creare e modificare questi documenti.
@@ -35,6 +38,9 @@ class Documento(TranslatableModel):
     is_active = models.BooleanField(
         default=True, help_text="Se il documento è attivo e visibile."
     )
+
+    # Ultima modifica (ETag/Last-Modified delle pagine, vedi utils/condizionale.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     tipo = models.CharField(
         max_length=50,
         choices=[
@@ -53,6 +59,8 @@ class Documento(TranslatableModel):
         help_text="Autori del documento/studio (es: 'Mario Rossi, Luigi Bianchi').",
     )
 
+    objects = TraduzioniManager()
+
     translations = TranslatedFields(
         titolo=models.CharField(
             max_length=200, help_text="Titolo del documento o studio."
@@ -73,6 +81,18 @@ class Documento(TranslatableModel):
 
     class Meta:
         ordering = ["-data_pubblicazione"]
+        indexes = [
+            # Lista dei documenti attivi in ordine di data, anche filtrata per tipo
+            # (parziali come quelli di Evento e Notizia)
+            models.Index(
+                fields=["data_pubblicazione"], condition=Q(is_active=True), name="documento_attivo_data_idx"
+            ),
+            models.Index(
+                fields=["tipo", "data_pubblicazione"],
+                condition=Q(is_active=True),
+                name="documento_attivo_tipo_idx",
+            ),
+        ]
         verbose_name = "Documento"
         verbose_name_plural = "Documenti e Studi"
 
@@ -82,22 +102,7 @@ class Documento(TranslatableModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             titolo = self.safe_translation_getter('titolo', any_language=True) or "documento"
-            base_slug = slugify(titolo)
-            slug = base_slug
-            counter = 1
-            while Documento.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
-        # Ottimizza l'immagine (anteprima)
-        if self.anteprima:
-            try:
-                this = Documento.objects.get(pk=self.pk)
-                if this.anteprima != self.anteprima:
-                    self.anteprima = optimize_image(self.anteprima)
-            except Documento.DoesNotExist:
-                self.anteprima = optimize_image(self.anteprima)
+            self.slug = self.genera_slug_unico(titolo)
 
         super().save(*args, **kwargs)
 
@@ -105,7 +110,7 @@ class Documento(TranslatableModel):
         return reverse("documento_detail", kwargs={"slug": self.slug})
 
 
-class FotoArchivio(TranslatableModel):
+class FotoArchivio(ValoriOriginaliMixin, TranslatableModel):
     """
     Modello per le foto dell'archivio fotografico.
     Solo gli admin possono aggiungere foto.
@@ -142,6 +147,8 @@ class FotoArchivio(TranslatableModel):
         help_text="Categoria della foto (es: 'Luoghi', 'Eventi', 'Personaggi').",
     )
 
+    objects = TraduzioniManager()
+
     translations = TranslatedFields(
         titolo=models.CharField(
             max_length=200,
@@ -156,20 +163,14 @@ class FotoArchivio(TranslatableModel):
 
     class Meta:
         ordering = ["ordine", "-data_aggiunta"]
+        indexes = [
+            # Pagine dell'archivio fotografico per autore
+            models.Index(
+                fields=["autore", "ordine"], condition=Q(is_active=True), name="foto_attiva_autore_idx"
+            ),
+        ]
         verbose_name = "Foto Archivio"
         verbose_name_plural = "Archivio Fotografico"
 
     def __str__(self):
         return f"Foto #{self.pk}"
-
-    def save(self, *args, **kwargs):
-        # Ottimizza l'immagine
-        if self.immagine:
-            try:
-                this = FotoArchivio.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except FotoArchivio.DoesNotExist:
-                self.immagine = optimize_image(self.immagine)
-        
-        super().save(*args, **kwargs)
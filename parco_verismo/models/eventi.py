@@ -4,15 +4,18 @@ Modelli per Eventi e Notizie.
 
 # Django imports
 from django.db import models
+from django.db.models import Q
 from django.urls import reverse
-from django.utils.text import slugify
 from django.utils import timezone
 
 from parler.models import TranslatableModel, TranslatedFields
-from parco_verismo.utils.image_optimizer import optimize_image
 
+# Local imports
+from .managers import TraduzioniManager
+from parco_verismo.utils.mixins import ValoriOriginaliMixin, SlugUnicoMixin
 
-class Evento(TranslatableModel):
+
+class Evento(ValoriOriginaliMixin, SlugUnicoMixin, TranslatableModel):
     slug = models.SlugField(max_length=200, unique=True, blank=True, help_text="Lascia vuoto per generare automaticamente dal titolo.")
     data_inizio = models.DateTimeField(help_text="Data e ora di inizio dell'evento.")
     data_fine = models.DateTimeField(
@@ -28,6 +31,11 @@ class Evento(TranslatableModel):
         default=True, help_text="Se l'evento è attivo e visibile."
     )
 
+    # Ultima modifica (ETag/Last-Modified delle pagine, vedi utils/condizionale.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TraduzioniManager()
+
     translations = TranslatedFields(
         titolo=models.CharField(max_length=200),
         descrizione=models.TextField(help_text="Descrizione dettagliata dell'evento."),
@@ -41,6 +49,14 @@ class Evento(TranslatableModel):
 
     class Meta:
         ordering = ["-data_inizio"]
+        indexes = [
+            # Eventi attivi futuri o passati, in ordine di data (home, notizie, ricerca).
+            # Parziale: su SQLite un indice che inizia con is_active non serve al
+            # filtro is_active=True, che Django scrive come WHERE "is_active"
+            models.Index(
+                fields=["data_inizio"], condition=Q(is_active=True), name="evento_attivo_inizio_idx"
+            ),
+        ]
         verbose_name = "Evento"
         verbose_name_plural = "Eventi"
 
@@ -53,22 +69,7 @@ class Evento(TranslatableModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             titolo = self.safe_translation_getter('titolo', any_language=True) or "evento"
-            base_slug = slugify(titolo)
-            slug = base_slug
-            counter = 1
-            while Evento.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-        
-        # Ottimizza l'immagine
-        if self.immagine:
-            try:
-                this = Evento.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except Evento.DoesNotExist:
-                self.immagine = optimize_image(self.immagine)
+            self.slug = self.genera_slug_unico(titolo)
         
         super().save(*args, **kwargs)
 
@@ -79,7 +80,7 @@ class Evento(TranslatableModel):
         return self.data_inizio < timezone.now()
 
 
-class Notizia(TranslatableModel):
+class Notizia(ValoriOriginaliMixin, SlugUnicoMixin, TranslatableModel):
     slug = models.SlugField(max_length=200, unique=True, blank=True, help_text="Lascia vuoto per generare automaticamente dal titolo.")
     data_pubblicazione = models.DateTimeField(default=timezone.now)
     immagine = models.ImageField(
@@ -92,6 +93,11 @@ class Notizia(TranslatableModel):
         default=True, help_text="Se la notizia è attiva e visibile."
     )
 
+    # Ultima modifica (ETag/Last-Modified delle pagine, vedi utils/condizionale.py)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TraduzioniManager()
+
     translations = TranslatedFields(
         titolo=models.CharField(max_length=200),
         contenuto=models.TextField(help_text="Contenuto completo della notizia."),
@@ -102,6 +108,12 @@ class Notizia(TranslatableModel):
 
     class Meta:
         ordering = ["-data_pubblicazione"]
+        indexes = [
+            # Notizie attive in ordine di data (home, eventi, pagine della lista)
+            models.Index(
+                fields=["data_pubblicazione"], condition=Q(is_active=True), name="notizia_attiva_data_idx"
+            ),
+        ]
         verbose_name = "Notizia"
         verbose_name_plural = "Notizie"
 
@@ -111,22 +123,7 @@ class Notizia(TranslatableModel):
     def save(self, *args, **kwargs):
         if not self.slug:
             titolo = self.safe_translation_getter('titolo', any_language=True) or "notizia"
-            base_slug = slugify(titolo)
-            slug = base_slug
-            counter = 1
-            while Notizia.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
-
-        # Ottimizza l'immagine
-        if self.immagine:
-            try:
-                this = Notizia.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except Notizia.DoesNotExist:
-                self.immagine = optimize_image(self.immagine)
+            self.slug = self.genera_slug_unico(titolo)
 
         super().save(*args, **kwargs)
 
@@ -134,7 +131,7 @@ class Notizia(TranslatableModel):
         return reverse("notizia_detail", kwargs={"slug": self.slug})
 
 
-class EventoImage(models.Model):
+class EventoImage(ValoriOriginaliMixin, models.Model):
     evento = models.ForeignKey(Evento, related_name='additional_images', on_delete=models.CASCADE)
     immagine = models.ImageField(upload_to="eventi/gallery/")
     didascalia = models.CharField(max_length=200, blank=True, null=True)
@@ -145,18 +142,8 @@ class EventoImage(models.Model):
         verbose_name = "Immagine Evento"
         verbose_name_plural = "Immagini Evento"
 
-    def save(self, *args, **kwargs):
-        if self.immagine:
-            try:
-                this = EventoImage.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except EventoImage.DoesNotExist:
-                self.immagine = optimize_image(self.immagine)
-        super().save(*args, **kwargs)
-
 
-class NotiziaImage(models.Model):
+class NotiziaImage(ValoriOriginaliMixin, models.Model):
     notizia = models.ForeignKey(Notizia, related_name='additional_images', on_delete=models.CASCADE)
     immagine = models.ImageField(upload_to="notizie/gallery/")
     didascalia = models.CharField(max_length=200, blank=True, null=True)
@@ -167,16 +154,6 @@ class NotiziaImage(models.Model):
         verbose_name = "Immagine Notizia"
         verbose_name_plural = "Immagini Notizia"
 
-    def save(self, *args, **kwargs):
-        if self.immagine:
-            try:
-                this = NotiziaImage.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except NotiziaImage.DoesNotExist:
-                self.immagine = optimize_image(self.immagine)
-        super().save(*args, **kwargs)
-
 
 class EventoDocumento(models.Model):
     evento = models.ForeignKey(Evento, related_name='documenti', on_delete=models.CASCADE)
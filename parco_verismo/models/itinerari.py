@@ -5,14 +5,17 @@ Modelli per Itinerari e Tappe - Sistema Rinnovato
 # Django imports
 from django.db import models
 from django.urls import reverse
-from django.utils.text import slugify
 
 # Third-party imports
 from parler.models import TranslatableModel, TranslatedFields
-from parco_verismo.utils.image_optimizer import optimize_image
 
+# Local imports
+from .managers import TraduzioniManager
+from parco_verismo.utils.mixins import ValoriOriginaliMixin, SlugUnicoMixin
+from parco_verismo.utils.polyline import comprimi_percorso, decomprimi_percorso
 
-class Itinerario(TranslatableModel):
+
+class Itinerario(ValoriOriginaliMixin, SlugUnicoMixin, TranslatableModel):
     """
     Modello per gli itinerari letterari (Verghiani, Capuaniani, Cammino del Verismo).
     Sistema completamente rinnovato con supporto per mappe interattive e tappe JSON.
@@ -108,6 +111,8 @@ class Itinerario(TranslatableModel):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = TraduzioniManager()
+
     # Campi traducibili
     translations = TranslatedFields(
         titolo=models.CharField(
@@ -122,6 +127,9 @@ class Itinerario(TranslatableModel):
             help_text="Note aggiuntive, informazioni pratiche, consigli."
         )
     )
+
+    # Le tappe modificate fanno ricalcolare i percorsi (vedi signals.py)
+    campi_tracciati = ("immagine", "coordinate_tappe")
     
     class Meta:
         ordering = ["tipo", "ordine"]
@@ -139,25 +147,8 @@ class Itinerario(TranslatableModel):
         # Genera slug automaticamente dal titolo se non specificato
         if not self.slug:
             titolo = self.safe_translation_getter('titolo', any_language=True) or f'itinerario-{self.pk or "new"}'
-            base_slug = slugify(titolo)
-            slug = base_slug
-            counter = 1
-            while Itinerario.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                slug = f"{base_slug}-{counter}"
-                counter += 1
-            self.slug = slug
+            self.slug = self.genera_slug_unico(titolo)
         
-        # Ottimizza l'immagine se presente e se è stata modificata (o è nuova)
-        if self.immagine:
-            # Controlliamo se è un nuovo file o se è cambiato
-            try:
-                this = Itinerario.objects.get(pk=self.pk)
-                if this.immagine != self.immagine:
-                    self.immagine = optimize_image(self.immagine)
-            except Itinerario.DoesNotExist:
-                # Se l'oggetto è nuovo
-                self.immagine = optimize_image(self.immagine)
-
         super().save(*args, **kwargs)
 
     def get_absolute_url(self):
@@ -190,8 +181,26 @@ class Itinerario(TranslatableModel):
             return 0
         return len(self.coordinate_tappe)
 
+    def get_percorsi_decodificati(self):
+        """Restituisce i percorsi calcolati con le coordinate [lat, lng] decodificate"""
+        if not isinstance(self.percorsi_calcolati, dict):
+            return {}
+        return {
+            chiave: decomprimi_percorso(percorso)
+            for chiave, percorso in self.percorsi_calcolati.items()
+        }
+
+    def get_percorsi_compressi(self):
+        """Restituisce i percorsi calcolati in formato encoded polyline (per il front-end)"""
+        if not isinstance(self.percorsi_calcolati, dict):
+            return {}
+        return {
+            chiave: comprimi_percorso(percorso)
+            for chiave, percorso in self.percorsi_calcolati.items()
+        }
+
 
-class ItinerarioImmagine(models.Model):
+class ItinerarioImmagine(ValoriOriginaliMixin, models.Model):
     """
     Modello per le immagini della galleria di un itinerario.
     """
@@ -0,0 +1,54 @@
+"""
+Modelli per la coda dei lavori in background.
+"""
+
+# Django imports
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class Job(models.Model):
+    """
+    Un lavoro da eseguire fuori dalla richiesta HTTP (email, immagini, percorsi).
+
+    I lavori vengono accodati con services.job_queue.accoda() ed eseguiti dal
+    comando `python manage.py run_worker`.
+    """
+
+    STATO_CHOICES = [
+        ("in_coda", _("In coda")),
+        ("in_esecuzione", _("In esecuzione")),
+        ("completato", _("Completato")),
+        ("fallito", _("Fallito")),
+    ]
+
+    nome = models.CharField(max_length=100, verbose_name=_("Lavoro"))
+    argomenti = models.JSONField(default=dict, blank=True, verbose_name=_("Argomenti"))
+    stato = models.CharField(
+        max_length=20, choices=STATO_CHOICES, default="in_coda", verbose_name=_("Stato")
+    )
+
+    tentativi = models.PositiveIntegerField(default=0, verbose_name=_("Tentativi"))
+    max_tentativi = models.PositiveIntegerField(default=5, verbose_name=_("Tentativi massimi"))
+    esegui_dopo = models.DateTimeField(default=timezone.now, verbose_name=_("Esegui dopo"))
+
+    worker = models.CharField(max_length=100, blank=True, verbose_name=_("Worker"))
+    iniziato_il = models.DateTimeField(null=True, blank=True, verbose_name=_("Iniziato il"))
+    # Rinnovato dal worker finché il lavoro è in esecuzione: scaduto, il lavoro torna in coda
+    scade_il = models.DateTimeField(null=True, blank=True, verbose_name=_("Assegnazione scade il"))
+    completato_il = models.DateTimeField(null=True, blank=True, verbose_name=_("Completato il"))
+    errore = models.TextField(blank=True, verbose_name=_("Ultimo errore"))
+
+    creato_il = models.DateTimeField(auto_now_add=True, verbose_name=_("Creato il"))
+
+    class Meta:
+        verbose_name = _("Lavoro in background")
+        verbose_name_plural = _("Lavori in background")
+        ordering = ["-creato_il"]
+        indexes = [
+            models.Index(fields=["stato", "esegui_dopo"], name="job_stato_esegui_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.nome} #{self.pk} ({self.get_stato_display()})"
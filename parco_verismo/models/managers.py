@@ -0,0 +1,46 @@
+"""
+Manager e QuerySet condivisi dai modelli traducibili.
+"""
+
+# Django imports
+from django.db.models import Prefetch
+from django.utils import translation
+
+# Third-party imports
+from parler import appsettings
+from parler.managers import TranslatableManager, TranslatableQuerySet
+
+
+def lingue_traduzione(lingua=None):
+    """Lingua attiva seguita dalle lingue di fallback di parler (es. ["en", "it"])."""
+    lingua = lingua or translation.get_language() or appsettings.PARLER_DEFAULT_LANGUAGE_CODE
+    lingue = [lingua]
+    for fallback in appsettings.PARLER_LANGUAGES.get_fallback_languages(lingua):
+        if fallback not in lingue:
+            lingue.append(fallback)
+    return lingue
+
+
+class TraduzioniQuerySet(TranslatableQuerySet):
+    """QuerySet con il prefetch delle traduzioni per le liste."""
+
+    def con_traduzioni(self, lingua=None):
+        """
+        Carica con una sola query le traduzioni nella lingua attiva e in quella
+        di fallback, invece di una query per oggetto nei template.
+        """
+        modello_traduzioni = self.model._parler_meta.root_model
+        return self.prefetch_related(
+            Prefetch(
+                self.model._parler_meta.root_rel_name,
+                queryset=modello_traduzioni.objects.filter(
+                    language_code__in=lingue_traduzione(lingua)
+                ),
+            )
+        )
+
+
+class TraduzioniManager(TranslatableManager):
+    """Manager dei modelli traducibili: espone con_traduzioni() sul QuerySet."""
+
+    _queryset_class = TraduzioniQuerySet
@@ -0,0 +1,38 @@
+"""
+Modelli per l'indice di ricerca di opere e documenti.
+"""
+
+# Django imports
+from django.db import models
+from django.utils.translation import gettext_lazy as _
+
+
+class VoceRicerca(models.Model):
+    """
+    Una riga dell'indice di ricerca: un oggetto in una lingua.
+
+    I campi contengono i token già normalizzati (vedi utils/testo.py). L'indice
+    full-text vero e proprio dipende dal database: tabella FTS5 su SQLite,
+    indice GIN su tsvector su PostgreSQL (vedi migrazione 0028 e
+    services/search_index.py). Gestito automaticamente dai segnali.
+    """
+
+    modello = models.CharField(max_length=50, verbose_name=_("Modello"))
+    oggetto_id = models.PositiveBigIntegerField(verbose_name=_("ID oggetto"))
+    lingua = models.CharField(max_length=15, verbose_name=_("Lingua"))
+
+    # Campi ad alto peso (titolo, autore, parole chiave) e testo descrittivo
+    titolo = models.TextField(blank=True)
+    testo = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = _("Voce indice di ricerca")
+        verbose_name_plural = _("Indice di ricerca")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["modello", "oggetto_id", "lingua"], name="voce_ricerca_unica"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.modello} #{self.oggetto_id} ({self.lingua})"
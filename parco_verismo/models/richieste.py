@@ -2,10 +2,99 @@
 Modelli per il sistema di Richieste.
 """
 
+# Standard library imports
+from datetime import datetime, time, timedelta
+
 # Django imports
+from django.conf import settings
 from django.db import models
+from django.db.models import Case, Count, DurationField, ExpressionWrapper, F, Q, Value, When
+from django.db.models.functions import Now, TruncDate
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+# Richieste in attesa di una risposta (possono andare in ritardo), ancora da
+# erogare (mostrate nella dashboard) e chiuse
+STATI_IN_ATTESA = ("nuova", "in_lavorazione")
+STATI_ATTIVI = STATI_IN_ATTESA + ("confermata",)
+STATI_CHIUSI = ("completata", "cancellata")
+
+
+def _inizio_giorno(giorni_fa):
+    """Mezzanotte (ora locale) di `giorni_fa` giorni fa."""
+    giorno = timezone.localdate() - timedelta(days=giorni_fa)
+    return timezone.make_aware(datetime.combine(giorno, time.min))
+
+
+def limite_ritardo():
+    """
+    Inizio del giorno oltre il quale una richiesta in attesa è in ritardo.
+
+    In ritardo = in attesa da più di RICHIESTE_GIORNI_RITARDO giorni di
+    calendario. Il confronto con un istante (invece che con la data) usa
+    l'indice su data_richiesta.
+    """
+    return _inizio_giorno(settings.RICHIESTE_GIORNI_RITARDO)
+
+
+def espressione_giorni_attesa():
+    """Giorni di attesa come espressione SQL (DurationField), vedi Richiesta.giorni_attesa."""
+    fine = Case(
+        When(stato__in=STATI_CHIUSI, data_completamento__isnull=False, then=F("data_completamento")),
+        default=Now(),
+        output_field=models.DateTimeField(),
+    )
+    return ExpressionWrapper(TruncDate(fine) - TruncDate("data_richiesta"), output_field=DurationField())
+
+
+class RichiestaQuerySet(models.QuerySet):
+    def attive(self):
+        return self.filter(stato__in=STATI_ATTIVI)
+
+    def in_ritardo(self):
+        return self.filter(stato__in=STATI_IN_ATTESA, data_richiesta__lt=limite_ritardo())
+
+    def con_ritardo(self):
+        """Annota in_ritardo (confronto tra colonne, economico anche su molte righe)."""
+        return self.annotate(
+            in_ritardo=Case(
+                When(stato__in=STATI_IN_ATTESA, data_richiesta__lt=limite_ritardo(), then=Value(True)),
+                default=Value(False),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+    def con_attesa(self):
+        """
+        Annota giorni_attesa (durata in giorni interi) e in_ritardo, calcolati
+        dal database come le omonime property: si possono usare in filter() e
+        order_by() e le property restituiscono i valori annotati.
+
+        Su SQLite giorni_attesa usa funzioni Python (date nel fuso locale): va
+        annotato solo su poche righe o quando serve ordinare/filtrare.
+        """
+        return self.con_ritardo().annotate(giorni_attesa=espressione_giorni_attesa())
+
+    def statistiche(self, **altri):
+        """
+        Conteggi per la dashboard con una sola query (aggregazione condizionale).
+        Gli aggregati in `altri` vengono calcolati nella stessa query.
+        """
+        settimana_fa = _inizio_giorno(7)
+        conteggi = {
+            "totali": Count("id"),
+            "nuove": Count("id", filter=Q(stato="nuova")),
+            "in_lavorazione": Count("id", filter=Q(stato="in_lavorazione")),
+            "confermate": Count("id", filter=Q(stato="confermata")),
+            "completate": Count("id", filter=Q(stato="completata")),
+            "cancellate": Count("id", filter=Q(stato="cancellata")),
+            "priorita_alta": Count("id", filter=Q(stato__in=STATI_IN_ATTESA, priorita="alta")),
+            "in_ritardo": Count("id", filter=Q(stato__in=STATI_IN_ATTESA, data_richiesta__lt=limite_ritardo())),
+            "settimana": Count("id", filter=Q(data_richiesta__gte=settimana_fa)),
+            **altri,
+        }
+        return self.aggregate(**conteggi)
+
 
 class Richiesta(models.Model):
     """Modello per salvare le richieste dal form della homepage"""
@@ -87,8 +176,14 @@ class Richiesta(models.Model):
     # Metadati
     ultima_modifica = models.DateTimeField(auto_now=True, verbose_name="Ultima modifica")
 
+    objects = RichiestaQuerySet.as_manager()
+
     class Meta:
         ordering = ["-data_richiesta"]
+        indexes = [
+            # Liste della dashboard (per stato, in ordine di data) e richieste in ritardo
+            models.Index(fields=["stato", "data_richiesta"], name="richiesta_stato_data_idx"),
+        ]
         verbose_name = "Richiesta di contatto"
         verbose_name_plural = "Richieste di contatto"
 
@@ -105,8 +200,6 @@ class Richiesta(models.Model):
         return f"{emoji} {self.nome} {self.cognome} - {descr}"
 
     def save(self, *args, **kwargs):
-        from django.utils import timezone
-
         # Auto-update data completamento quando stato diventa completata
         if self.stato == "completata" and not self.data_completamento:
             self.data_completamento = timezone.now()
@@ -116,18 +209,27 @@ class Richiesta(models.Model):
     @property
     def giorni_attesa(self):
         """Calcola i giorni di attesa dalla richiesta"""
-        from django.utils import timezone
+        # Valore annotato da RichiestaQuerySet.con_attesa()
+        if "_giorni_attesa" in self.__dict__:
+            return self._giorni_attesa
 
-        if self.stato in ["completata", "cancellata"]:
+        if self.stato in STATI_CHIUSI:
             data_fine = self.data_completamento or timezone.now()
         else:
             data_fine = timezone.now()
-        return (data_fine.date() - self.data_richiesta.date()).days
+        return (timezone.localdate(data_fine) - timezone.localdate(self.data_richiesta)).days
+
+    @giorni_attesa.setter
+    def giorni_attesa(self, valore):
+        self._giorni_attesa = valore.days if isinstance(valore, timedelta) else valore
 
     @property
     def in_ritardo(self):
-        """Verifica se la richiesta è in ritardo (semplice heuristic)"""
-        if self.stato in ["completata", "cancellata"]:
-            return False
-        # Se non abbiamo una data preferita, non possiamo determinare ritardo
-        return False
+        """In attesa di risposta da più di RICHIESTE_GIORNI_RITARDO giorni"""
+        if "_in_ritardo" in self.__dict__:
+            return self._in_ritardo
+        return self.stato in STATI_IN_ATTESA and self.data_richiesta < limite_ritardo()
+
+    @in_ritardo.setter
+    def in_ritardo(self, valore):
+        self._in_ritardo = valore
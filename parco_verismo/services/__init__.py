@@ -5,28 +5,75 @@ Servizi business logic del Parco Letterario Giovanni Verga e Luigi Capuana.
 from .email_service import (
     invia_email_richiesta_confermata,
     invia_notifica_admin_nuova_richiesta,
+    invia_notifica_contatto,
+    invia_esportazione_pronta,
 )
 from .search_service import (
     ricerca_opere,
     ricerca_documenti,
     get_eventi_futuri,
+    get_eventi_in_evidenza,
     get_notizie_recenti,
 )
+from .search_index import (
+    cerca,
+    ricostruisci_indice,
+)
+from .itinerari_service import (
+    get_mappa_itinerari,
+    invalida_mappa_itinerari,
+)
+from .routing_service import (
+    calcola_tratte,
+    get_routing_backend,
+)
+from .job_queue import (
+    accoda,
+    task,
+)
+from .export_service import (
+    file_esportazione,
+    nome_esportazione,
+    risposta_csv,
+)
+from .richieste_service import cambia_stato
 from .stats_service import (
     get_stats_richieste,
     get_stats_contenuti,
+    get_dashboard_richieste,
+    invalida_dashboard_richieste,
 )
 
 __all__ = [
     # Email
     "invia_email_richiesta_confermata",
     "invia_notifica_admin_nuova_richiesta",
+    "invia_notifica_contatto",
+    "invia_esportazione_pronta",
     # Ricerca
     "ricerca_opere",
     "ricerca_documenti",
     "get_eventi_futuri",
+    "get_eventi_in_evidenza",
     "get_notizie_recenti",
+    "cerca",
+    "ricostruisci_indice",
+    # Itinerari
+    "get_mappa_itinerari",
+    "invalida_mappa_itinerari",
+    "calcola_tratte",
+    "get_routing_backend",
+    # Lavori in background
+    "accoda",
+    "task",
+    # Richieste
+    "cambia_stato",
+    "file_esportazione",
+    "nome_esportazione",
+    "risposta_csv",
     # Statistiche
     "get_stats_richieste",
     "get_stats_contenuti",
+    "get_dashboard_richieste",
+    "invalida_dashboard_richieste",
 ]
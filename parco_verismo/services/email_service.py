@@ -106,3 +106,86 @@ def invia_notifica_admin_nuova_richiesta(richiesta):
             getattr(richiesta, "id", "unknown"),
         )
         return False
+
+
+def invia_notifica_contatto(richiesta, url_dashboard):
+    """
+    Invia alla segreteria la notifica di una richiesta arrivata dal modulo contatti.
+
+    Args:
+        richiesta: Oggetto Richiesta
+        url_dashboard: URL assoluto della dashboard richieste
+
+    Returns:
+        True se l'email è stata inviata con successo, False altrimenti
+    """
+    try:
+        subject = f"Nuova richiesta dal sito: {richiesta.oggetto}"
+        message = f"""
+Hai ricevuto una nuova richiesta di contatto dal sito web.
+
+Dettagli:
+Nome: {richiesta.nome} {richiesta.cognome}
+Email: {richiesta.email}
+Ente: {richiesta.ente or 'Non specificato'}
+Oggetto: {richiesta.oggetto}
+
+Messaggio:
+{richiesta.messaggio}
+
+Puoi gestire questa richiesta dal pannello di amministrazione:
+{url_dashboard}
+        """
+
+        send_mail(
+            subject,
+            message,
+            settings.DEFAULT_FROM_EMAIL,  # Mittente (configurato in settings)
+            ["info@parcovergacapuana.it"],  # Destinatario
+            fail_silently=False,
+        )
+
+        return True
+    except Exception:
+        logging.exception(
+            "Errore invio email per richiesta contatto id=%s",
+            getattr(richiesta, "id", "unknown"),
+        )
+        return False
+
+
+def invia_esportazione_pronta(email, url, righe):
+    """
+    Avvisa l'operatore che l'esportazione CSV richiesta dall'admin è pronta.
+
+    Args:
+        email: Indirizzo dell'operatore
+        url: URL assoluto per scaricare il file
+        righe: Numero di richieste esportate
+
+    Returns:
+        True se l'email è stata inviata con successo, False altrimenti
+    """
+    try:
+        subject = "Esportazione richieste pronta"
+        message = f"""
+L'esportazione CSV di {righe} richieste di contatto è pronta.
+
+Puoi scaricarla (dopo aver effettuato l'accesso) da:
+{url}
+
+Il file viene eliminato dopo {settings.RICHIESTE_EXPORT_CONSERVA_GIORNI} giorni.
+        """
+
+        send_mail(
+            subject,
+            message,
+            settings.DEFAULT_FROM_EMAIL,
+            [email],
+            fail_silently=False,
+        )
+
+        return True
+    except Exception:
+        logging.exception("Errore invio email di esportazione pronta a %s", email)
+        return False
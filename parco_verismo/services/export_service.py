@@ -0,0 +1,155 @@
+"""
+Esportazione CSV delle richieste di contatto.
+
+Il CSV viene prodotto un blocco di righe alla volta, leggendo le richieste a
+blocchi: la memoria usata non dipende dal numero di richieste. Due modi:
+- risposta_csv: StreamingHttpResponse, per le selezioni normali dall'admin
+- scrivi_esportazione: file in RICHIESTE_EXPORT_DIR, scritto dal worker per
+  le selezioni oltre RICHIESTE_EXPORT_MAX_RIGHE (lavoro richieste.esporta_csv,
+  che ricostruisce il queryset dai filtri dell'admin invece di ricevere la
+  lista delle chiavi); l'operatore riceve per email il link per scaricarlo
+  (file_esportazione)
+"""
+
+# Standard library imports
+import csv
+import io
+import os
+import re
+import secrets
+import time
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+
+# Righe lette dal database e scritte nel CSV a ogni blocco
+RIGHE_PER_BLOCCO = 1000
+
+INTESTAZIONE = [
+    "Nome",
+    "Cognome",
+    "Ente",
+    "Oggetto",
+    "Email",
+    "Messaggio",
+    "Stato",
+    "Priorità",
+    "Data richiesta",
+    "Data completamento",
+    "Responsabile",
+    "Guida",
+    "Note",
+]
+
+# Nomi dei file generati da scrivi_esportazione (anche contro i percorsi nel link)
+NOME_FILE_RE = re.compile(r"^richieste_\d{8}_\d{4}_[0-9a-f]{8}\.csv$")
+
+
+def _etichette():
+    """Etichette di stato e priorità, tradotte una volta sola per esportazione."""
+    from ..models import Richiesta
+
+    # get_stato_display() ricostruisce a ogni chiamata il dizionario delle
+    # scelte (con le etichette lazy): era la parte più lenta dell'esportazione
+    return (
+        {valore: str(etichetta) for valore, etichetta in Richiesta.STATO_CHOICES},
+        {valore: str(etichetta) for valore, etichetta in Richiesta.PRIORITA_CHOICES},
+    )
+
+
+def _riga(obj, stati, priorita):
+    return [
+        obj.nome,
+        obj.cognome,
+        obj.ente or "",
+        obj.oggetto or "",
+        obj.email,
+        obj.messaggio,
+        stati.get(obj.stato, obj.stato),
+        priorita.get(obj.priorita, obj.priorita),
+        obj.data_richiesta.strftime("%d/%m/%Y %H:%M"),
+        obj.data_completamento.strftime("%d/%m/%Y %H:%M") if obj.data_completamento else "",
+        obj.responsabile or "",
+        obj.guida_assegnata or "",
+        obj.note_admin,
+    ]
+
+
+def genera_csv(richieste):
+    """
+    Genera il CSV (con BOM per Excel) a blocchi di RIGHE_PER_BLOCCO righe.
+
+    `richieste` va letto a blocchi (queryset.iterator), non caricato tutto in
+    memoria.
+    """
+    stati, priorita = _etichette()
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # BOM per Excel
+    writer.writerow(INTESTAZIONE)
+    for numero, obj in enumerate(richieste, start=1):
+        writer.writerow(_riga(obj, stati, priorita))
+        if numero % RIGHE_PER_BLOCCO == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def nome_esportazione():
+    """Nome del file CSV: data e ora, più un suffisso casuale."""
+    return f"richieste_{timezone.now().strftime('%Y%m%d_%H%M')}_{secrets.token_hex(4)}.csv"
+
+
+def risposta_csv(queryset):
+    """
+    Risposta in streaming con il CSV del queryset, letto con iterator():
+    senza cache dei risultati e, su PostgreSQL, con un cursore lato server.
+    """
+    richieste = queryset.iterator(chunk_size=RIGHE_PER_BLOCCO)
+    response = StreamingHttpResponse(
+        (blocco.encode("utf-8") for blocco in genera_csv(richieste)),
+        content_type="text/csv; charset=utf-8",
+    )
+    filename = f"richieste_{timezone.now().strftime('%Y%m%d_%H%M')}.csv"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _export_dir():
+    return Path(settings.RICHIESTE_EXPORT_DIR)
+
+
+def rimuovi_esportazioni_scadute():
+    """Elimina i file più vecchi di RICHIESTE_EXPORT_CONSERVA_GIORNI giorni."""
+    limite = time.time() - settings.RICHIESTE_EXPORT_CONSERVA_GIORNI * 86400
+    for percorso in _export_dir().glob("richieste_*.csv"):
+        if percorso.stat().st_mtime < limite:
+            percorso.unlink(missing_ok=True)
+
+
+def scrivi_esportazione(queryset, nome):
+    """
+    Scrive il CSV del queryset in RICHIESTE_EXPORT_DIR/<nome>, letto con iterator().
+
+    Il file compare con il nome definitivo solo quando è completo.
+    """
+    cartella = _export_dir()
+    cartella.mkdir(parents=True, exist_ok=True)
+    rimuovi_esportazioni_scadute()
+    temporaneo = cartella / f".{nome}.tmp"
+    with open(temporaneo, "w", encoding="utf-8", newline="") as f:
+        for blocco in genera_csv(queryset.iterator(chunk_size=RIGHE_PER_BLOCCO)):
+            f.write(blocco)
+    os.replace(temporaneo, cartella / nome)
+
+
+def file_esportazione(nome):
+    """Percorso di un'esportazione completata, o None."""
+    if not NOME_FILE_RE.match(nome):
+        return None
+    percorso = _export_dir() / nome
+    return percorso if percorso.is_file() else None
@@ -0,0 +1,142 @@
+"""
+Servizi per i dati delle mappe degli itinerari.
+
+Il payload di ogni pagina (uno per tipo di itinerario e per lingua) viene
+costruito una sola volta e salvato come file JSON in ITINERARI_MAPPA_DIR,
+condiviso da tutti i worker. Ogni processo tiene inoltre una copia in memoria
+finché il file non cambia. I segnali di Itinerario e ItinerarioImmagine
+cancellano i file (vedi invalida_mappa_itinerari).
+"""
+
+# Standard library imports
+import json
+import os
+import tempfile
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.utils import translation
+
+TIPI_ITINERARIO = ("verghiano", "capuaniano", "tematico")
+
+# Cache di processo: (tipo, lingua) -> (mtime_ns del file, payload)
+_memoria = {}
+
+
+def _mappa_dir():
+    return Path(
+        getattr(
+            settings,
+            "ITINERARI_MAPPA_DIR",
+            Path(tempfile.gettempdir()) / "parco_verismo_itinerari",
+        )
+    )
+
+
+def _mappa_path(tipo, lingua):
+    return _mappa_dir() / f"itinerari_{tipo}_{lingua}.json"
+
+
+def _json_per_script(data):
+    """Serializza per un tag <script type="application/json"> (niente '</script>')."""
+    return json.dumps(data, ensure_ascii=False).replace("<", "\\u003c")
+
+
+def serializza_itinerario(itinerario):
+    """
+    Restituisce i dati di un itinerario per la card della sidebar e per la mappa.
+
+    Il campo "json" contiene il payload per la mappa già serializzato.
+    """
+    descrizione = itinerario.descrizione or ""
+    parole = descrizione.split()
+    descrizione_breve = " ".join(parole[:20]) + "..." if len(parole) > 20 else descrizione
+
+    mappa = {
+        "id": itinerario.id,
+        "slug": itinerario.slug,
+        "titolo": itinerario.titolo,
+        "descrizione": descrizione,
+        "descrizione_breve": descrizione_breve,
+        "colore_percorso": itinerario.colore_percorso,
+        "durata_stimata": itinerario.durata_stimata or "Non specificata",
+        "difficolta": itinerario.get_difficolta_display(),
+        "coordinate_tappe": itinerario.coordinate_tappe or [],
+        "percorsi_calcolati": itinerario.get_percorsi_compressi(),
+        "centro_mappa": itinerario.get_centro_mappa(),
+        "numero_tappe": itinerario.get_numero_tappe(),
+        "url_detail": itinerario.get_absolute_url(),
+        "link_maps": itinerario.link_maps,
+        "url_immagine": itinerario.immagine.url if itinerario.immagine else None,
+        "galleria_immagini": [img.immagine.url for img in itinerario.galleria.all()],
+    }
+
+    return {
+        "id": itinerario.id,
+        "titolo": itinerario.titolo,
+        "descrizione": descrizione,
+        "durata_stimata": itinerario.durata_stimata,
+        "difficolta": mappa["difficolta"],
+        "numero_tappe": mappa["numero_tappe"],
+        "json": _json_per_script(mappa),
+    }
+
+
+def _costruisci_mappa(tipo):
+    from ..models import Itinerario
+
+    itinerari = (
+        Itinerario.objects.filter(is_active=True, tipo=tipo)
+        .prefetch_related("translations", "galleria")
+        .order_by("ordine")
+    )
+    return [serializza_itinerario(itinerario) for itinerario in itinerari]
+
+
+def get_mappa_itinerari(tipo):
+    """
+    Restituisce la lista degli itinerari attivi di un tipo, nella lingua attiva,
+    con il payload della mappa già serializzato.
+    """
+    lingua = translation.get_language() or settings.LANGUAGE_CODE
+    path = _mappa_path(tipo, lingua)
+
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    if mtime is not None:
+        cached = _memoria.get((tipo, lingua))
+        if cached and cached[0] == mtime:
+            return cached[1]
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            _memoria[(tipo, lingua)] = (mtime, payload)
+            return payload
+        except (OSError, ValueError):
+            pass  # File rimosso o incompleto: lo ricostruiamo
+
+    payload = _costruisci_mappa(tipo)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Scrittura atomica: gli altri worker non leggono mai un file a metà
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+        json.dump(payload, tmp, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+    _memoria[(tipo, lingua)] = (path.stat().st_mtime_ns, payload)
+    return payload
+
+
+def invalida_mappa_itinerari():
+    """Elimina i payload salvati di tutti i tipi e di tutte le lingue."""
+    for tipo in TIPI_ITINERARIO:
+        for lingua, _nome in settings.LANGUAGES:
+            try:
+                _mappa_path(tipo, lingua).unlink()
+            except FileNotFoundError:
+                pass
+    _memoria.clear()
@@ -0,0 +1,245 @@
+"""
+Coda di lavori in background basata sul database, senza broker esterni.
+
+I lavori sono righe del modello Job. Un lavoro viene "preso" da un worker con
+un UPDATE condizionato (stato in_coda -> in_esecuzione): solo un worker può
+vincere, sia su SQLite che su PostgreSQL. In caso di errore il lavoro torna
+in coda con un ritardo esponenziale finché non supera max_tentativi.
+
+L'assegnazione a un worker scade dopo il timeout del lavoro (scade_il) e
+viene rinnovata da un thread finché il lavoro è in esecuzione: torna in coda
+solo il lavoro di un worker terminato, non quello di un worker lento. L'esito
+viene salvato solo se il lavoro è ancora assegnato al worker.
+
+Le funzioni eseguibili si registrano con il decoratore @task (vedi
+parco_verismo/tasks.py):
+
+    @task("email.notifica_admin", timeout=120)
+    def notifica_admin(richiesta_id):
+        ...
+
+    accoda("email.notifica_admin", richiesta_id=richiesta.pk)
+
+Con JOB_QUEUE_EAGER = True (default con DEBUG) i lavori vengono eseguiti
+subito, nel processo che li accoda (in sviluppo non serve un worker attivo).
+"""
+
+# Standard library imports
+import logging
+import random
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+# Django imports
+from django.conf import settings
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Registro dei lavori: nome -> funzione
+TASKS = {}
+# Lavori con un timeout diverso da JOB_QUEUE_TIMEOUT: nome -> secondi
+TIMEOUT = {}
+
+
+def task(nome, timeout=None):
+    """
+    Registra una funzione come lavoro eseguibile in background.
+
+    `timeout`: secondi senza rinnovo dell'assegnazione dopo i quali il lavoro
+    torna in coda (default JOB_QUEUE_TIMEOUT).
+    """
+
+    def decorator(func):
+        TASKS[nome] = func
+        if timeout:
+            TIMEOUT[nome] = timeout
+        return func
+
+    return decorator
+
+
+def timeout_lavoro(nome):
+    """Secondi di validità dell'assegnazione di un lavoro a un worker."""
+    return TIMEOUT.get(nome) or getattr(settings, "JOB_QUEUE_TIMEOUT", 600)
+
+
+def accoda(lavoro, ritardo=0, max_tentativi=None, **argomenti):
+    """
+    Accoda un lavoro.
+
+    Args:
+        lavoro: Nome del lavoro registrato con @task
+        ritardo: Secondi da attendere prima dell'esecuzione
+        max_tentativi: Tentativi massimi (default JOB_QUEUE_MAX_TENTATIVI)
+        **argomenti: Argomenti della funzione (serializzabili in JSON)
+
+    Returns:
+        Il Job creato (None in modalità eager)
+    """
+    from ..models import Job
+
+    if lavoro not in TASKS:
+        raise ValueError(f"Lavoro non registrato: {lavoro}")
+
+    if getattr(settings, "JOB_QUEUE_EAGER", False):
+        TASKS[lavoro](**argomenti)
+        return None
+
+    return Job.objects.create(
+        nome=lavoro,
+        argomenti=argomenti,
+        max_tentativi=max_tentativi or getattr(settings, "JOB_QUEUE_MAX_TENTATIVI", 5),
+        esegui_dopo=timezone.now() + timedelta(seconds=ritardo),
+    )
+
+
+def prendi_job(worker):
+    """
+    Prende in carico il primo lavoro pronto, o restituisce None.
+
+    Il primo UPDATE che cambia lo stato vince: se un altro worker è stato più
+    veloce si passa al candidato successivo.
+    """
+    from ..models import Job
+
+    adesso = timezone.now()
+    candidati = (
+        Job.objects.filter(stato="in_coda", esegui_dopo__lte=adesso)
+        .order_by("esegui_dopo", "pk")
+        .values_list("pk", "nome")[:10]
+    )
+    for pk, nome in candidati:
+        preso = Job.objects.filter(pk=pk, stato="in_coda").update(
+            stato="in_esecuzione",
+            worker=worker,
+            iniziato_il=adesso,
+            scade_il=adesso + timedelta(seconds=timeout_lavoro(nome)),
+        )
+        if preso:
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def backoff(tentativi):
+    """Secondi di attesa prima del prossimo tentativo (esponenziale con jitter)."""
+    base = getattr(settings, "JOB_QUEUE_BACKOFF", 30)
+    return base * 2 ** (tentativi - 1) * random.uniform(0.8, 1.2)
+
+
+def _assegnato(job):
+    """Il lavoro, se è ancora in esecuzione e assegnato al worker che lo ha preso."""
+    from ..models import Job
+
+    return Job.objects.filter(pk=job.pk, worker=job.worker, stato="in_esecuzione")
+
+
+def _rinnova(job, fine):
+    """
+    Rinnova l'assegnazione del lavoro ogni terzo del timeout, finché `fine`
+    non viene impostato o il lavoro non è più del worker.
+    """
+    timeout = timeout_lavoro(job.nome)
+    try:
+        while not fine.wait(timeout / 3):
+            rinnovato = _assegnato(job).update(scade_il=timezone.now() + timedelta(seconds=timeout))
+            if not rinnovato:
+                logger.warning("Lavoro %s #%s non più assegnato a %s", job.nome, job.pk, job.worker)
+                return
+    finally:
+        # Il thread ha la propria connessione al database
+        connection.close()
+
+
+@contextmanager
+def _assegnazione_rinnovata(job):
+    """Tiene assegnato il lavoro al worker (thread di rinnovo) durante il blocco."""
+    fine = threading.Event()
+    rinnovo = threading.Thread(target=_rinnova, args=(job, fine), name=f"rinnovo-job-{job.pk}", daemon=True)
+    rinnovo.start()
+    try:
+        yield
+    finally:
+        fine.set()
+        rinnovo.join()
+
+
+def _salva_esito(job, *campi):
+    """Salva i campi dell'esito, solo se il lavoro è ancora del worker."""
+    salvato = _assegnato(job).update(**{campo: getattr(job, campo) for campo in campi})
+    if not salvato:
+        logger.warning(
+            "Lavoro %s #%s rimesso in coda durante l'esecuzione su %s: esito ignorato",
+            job.nome, job.pk, job.worker,
+        )
+
+
+def esegui_job(job):
+    """Esegue un lavoro già preso in carico e ne aggiorna lo stato."""
+    job.tentativi += 1
+    try:
+        func = TASKS[job.nome]
+        with _assegnazione_rinnovata(job):
+            func(**job.argomenti)
+    except Exception:
+        job.errore = traceback.format_exc()[-4000:]
+        if job.tentativi >= job.max_tentativi:
+            job.stato = "fallito"
+            logger.error("Lavoro %s #%s fallito definitivamente", job.nome, job.pk)
+        else:
+            job.stato = "in_coda"
+            job.esegui_dopo = timezone.now() + timedelta(seconds=backoff(job.tentativi))
+            logger.warning(
+                "Lavoro %s #%s fallito (tentativo %s), nuovo tentativo alle %s",
+                job.nome, job.pk, job.tentativi, job.esegui_dopo,
+            )
+        _salva_esito(job, "tentativi", "stato", "esegui_dopo", "errore")
+        return False
+
+    job.stato = "completato"
+    job.completato_il = timezone.now()
+    _salva_esito(job, "tentativi", "stato", "completato_il")
+    return True
+
+
+def recupera_job_bloccati():
+    """
+    Rimette in coda i lavori la cui assegnazione è scaduta senza rinnovo
+    (es. worker terminato durante l'esecuzione).
+
+    L'esecuzione interrotta conta come un tentativo: un lavoro che blocca o
+    fa terminare il worker (es. un'immagine enorme) diventa "fallito" dopo
+    max_tentativi, invece di tornare in coda all'infinito.
+
+    Returns:
+        Il numero di lavori rimessi in coda
+    """
+    from ..models import Job
+
+    # scade_il vuoto: lavori presi prima che esistesse l'assegnazione a tempo
+    bloccati = Job.objects.filter(
+        Q(scade_il__lt=timezone.now()) | Q(scade_il__isnull=True), stato="in_esecuzione"
+    )
+
+    falliti = bloccati.filter(tentativi__gte=F("max_tentativi") - 1).update(
+        stato="fallito",
+        worker="",
+        tentativi=F("tentativi") + 1,
+        errore="Esecuzione interrotta: assegnazione al worker scaduta",
+    )
+    if falliti:
+        logger.error("%s lavori bloccati falliti definitivamente", falliti)
+    return bloccati.update(stato="in_coda", worker="", tentativi=F("tentativi") + 1)
+
+
+def pulisci_job_completati(giorni=None):
+    """Elimina i lavori completati più vecchi di `giorni` giorni."""
+    from ..models import Job
+
+    giorni = giorni or getattr(settings, "JOB_QUEUE_CONSERVA_GIORNI", 7)
+    limite = timezone.now() - timedelta(days=giorni)
+    return Job.objects.filter(stato="completato", completato_il__lt=limite).delete()[0]
@@ -0,0 +1,50 @@
+"""
+Cambi di stato delle richieste di contatto in blocco.
+
+Usato dalle azioni dell'admin e dal comando cambia_stato_richieste: una sola
+UPDATE per qualsiasi numero di richieste, invece di un save() per riga.
+"""
+
+# Django imports
+from django.db.models import F, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+# Local imports
+from .stats_service import invalida_dashboard_richieste
+
+
+def cambia_stato(queryset, stato, responsabile=None):
+    """
+    Porta le richieste del queryset allo stato dato.
+
+    Replica in SQL quello che farebbe Richiesta.save() riga per riga:
+    ultima_modifica aggiornata e, per "completata", data_completamento
+    impostata dove manca. Le richieste già nello stato dato non vengono
+    toccate (come in save_model dell'admin, il responsabile cambia solo con lo
+    stato).
+
+    Args:
+        queryset: Richieste da modificare (anche filtrate o ordinate dall'admin)
+        stato: Uno dei valori di Richiesta.STATO_CHOICES
+        responsabile: Chi ha eseguito il cambio (es. username), facoltativo
+
+    Returns:
+        Numero di richieste modificate
+    """
+    stati = dict(queryset.model.STATO_CHOICES)
+    if stato not in stati:
+        raise ValueError(f"Stato non valido: {stato} (validi: {', '.join(stati)})")
+
+    adesso = timezone.now()
+    campi = {"stato": stato, "ultima_modifica": adesso}
+    if responsabile:
+        campi["responsabile"] = responsabile
+    if stato == "completata":
+        campi["data_completamento"] = Coalesce(F("data_completamento"), Value(adesso))
+
+    # update() non invia post_save e non passa da save()
+    aggiornate = queryset.exclude(stato=stato).update(**campi)
+    if aggiornate:
+        invalida_dashboard_richieste()
+    return aggiornate
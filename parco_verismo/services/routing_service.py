@@ -0,0 +1,333 @@
+"""
+Servizi per il calcolo dei percorsi stradali tra le tappe degli itinerari.
+
+Ogni tratta (tappa -> tappa successiva) viene identificata da una chiave
+calcolata dalle coordinate arrotondate di partenza e arrivo e dal profilo
+di routing: la stessa tratta in due itinerari, o in due esecuzioni del
+comando calcola_percorsi_itinerari, viene calcolata una sola volta.
+
+Il calcolo vero e proprio è delegato a un backend di routing:
+- OSRMBackend: server OSRM (pubblico o locale);
+- LineaRettaBackend: nessuna rete, restituisce la linea retta tra le tappe
+  (utile in sviluppo e per provare il comando senza chiamare OSRM).
+Backend personalizzati si indicano con il percorso Python della classe in
+settings.ITINERARI_ROUTING_BACKEND.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Django imports
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Decimali delle coordinate nella chiave di una tratta (~1 metro)
+PRECISIONE_CHIAVE = 5
+
+
+class RoutingError(Exception):
+    """Il backend non è riuscito a calcolare il percorso di una tratta."""
+
+
+class RoutingBackend:
+    """
+    Interfaccia dei backend di routing.
+
+    Le sottoclassi implementano `percorso(start, end)` e restituiscono un
+    dizionario con "coords" ([lat, lng], ...), "distance" (metri) e
+    "duration" (secondi), oppure sollevano RoutingError.
+    """
+
+    profilo = "foot"
+
+    def percorso(self, start, end):
+        raise NotImplementedError
+
+
+class OSRMBackend(RoutingBackend):
+    """Backend OSRM (API /route/v1)."""
+
+    def __init__(self, base_url=None, profilo=None, timeout=15):
+        self.base_url = (
+            base_url
+            or getattr(settings, "ITINERARI_OSRM_URL", "https://router.project-osrm.org")
+        ).rstrip("/")
+        self.profilo = profilo or self.profilo
+        self.timeout = timeout
+
+    def percorso(self, start, end):
+        url = (
+            f"{self.base_url}/route/v1/{self.profilo}/"
+            f"{start[1]},{start[0]};{end[1]},{end[0]}"
+            f"?overview=full&geometries=geojson"
+        )
+        try:
+            with urllib.request.urlopen(url, timeout=self.timeout) as response:
+                data = json.load(response)
+        except urllib.error.HTTPError as e:
+            # OSRM risponde 400 con un JSON che contiene il codice di errore
+            try:
+                data = json.load(e)
+            except ValueError:
+                raise RoutingError(f"HTTP {e.code}") from e
+        except (OSError, ValueError) as e:
+            raise RoutingError(str(e)[:50]) from e
+
+        if data.get("code") != "Ok" or not data.get("routes"):
+            raise RoutingError(f"OSRM: {data.get('code', 'unknown')}")
+
+        route = data["routes"][0]
+        return {
+            # Converti [lng, lat] in [lat, lng] per Leaflet
+            "coords": [[c[1], c[0]] for c in route["geometry"]["coordinates"]],
+            "distance": round(route["distance"], 2),
+            "duration": round(route["duration"], 2),
+        }
+
+
+class LineaRettaBackend(RoutingBackend):
+    """Backend senza rete: linea retta tra le tappe, a passo d'uomo (5 km/h)."""
+
+    profilo = "linea-retta"
+
+    def percorso(self, start, end):
+        distanza = distanza_metri(start, end)
+        return {
+            "coords": [list(start), list(end)],
+            "distance": round(distanza, 2),
+            "duration": round(distanza / (5000 / 3600), 2),
+        }
+
+
+BACKENDS = {
+    "osrm": OSRMBackend,
+    "linea-retta": LineaRettaBackend,
+}
+
+
+def get_routing_backend(nome=None):
+    """Restituisce un'istanza del backend indicato (alias o percorso Python)."""
+    nome = nome or getattr(settings, "ITINERARI_ROUTING_BACKEND", "osrm")
+    classe = BACKENDS.get(nome) or import_string(nome)
+    return classe()
+
+
+def distanza_metri(a, b):
+    """Distanza in metri tra due punti [lat, lng] (formula dell'emisenoverso)."""
+    lat1, lng1, lat2, lng2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return 2 * 6_371_000 * math.asin(math.sqrt(h))
+
+
+def chiave_tratta(start, end, profilo):
+    """Chiave di una tratta: hash delle coordinate arrotondate e del profilo."""
+    testo = (
+        f"{profilo}:"
+        f"{start[0]:.{PRECISIONE_CHIAVE}f},{start[1]:.{PRECISIONE_CHIAVE}f}:"
+        f"{end[0]:.{PRECISIONE_CHIAVE}f},{end[1]:.{PRECISIONE_CHIAVE}f}"
+    )
+    return hashlib.sha1(testo.encode()).hexdigest()
+
+
+class CacheTratte:
+    """
+    Cache su file delle tratte calcolate, un file JSON per chiave.
+
+    Ogni tratta viene scritta appena calcolata: se il comando viene interrotto,
+    l'esecuzione successiva riparte dalle tratte mancanti.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = Path(
+            directory
+            or getattr(
+                settings,
+                "ITINERARI_PERCORSI_CACHE_DIR",
+                Path(tempfile.gettempdir()) / "parco_verismo_percorsi",
+            )
+        )
+
+    def _path(self, chiave):
+        return self.directory / chiave[:2] / f"{chiave}.json"
+
+    def get(self, chiave):
+        try:
+            return json.loads(self._path(chiave).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def set(self, chiave, percorso):
+        path = self._path(chiave)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as tmp:
+            json.dump(percorso, tmp, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+class TokenBucket:
+    """Limita le richieste al backend a `rate` al secondo (raffiche fino a `capacita`)."""
+
+    def __init__(self, rate, capacita=1):
+        self.rate = rate
+        self.capacita = capacita
+        self.token = capacita
+        self.ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquisisci(self):
+        """Attende finché non è disponibile un token."""
+        if not self.rate:
+            return
+        while True:
+            with self._lock:
+                adesso = time.monotonic()
+                self.token = min(
+                    self.capacita, self.token + (adesso - self.ultimo) * self.rate
+                )
+                self.ultimo = adesso
+                if self.token >= 1:
+                    self.token -= 1
+                    return
+                attesa = (1 - self.token) / self.rate
+            time.sleep(attesa)
+
+
+def calcola_tratte(tratte, backend, cache=None, workers=4, rate=None, callback=None):
+    """
+    Calcola in parallelo le tratte indicate.
+
+    Args:
+        tratte: Dizionario {chiave: (start, end)} delle tratte da calcolare
+        backend: Istanza di RoutingBackend
+        cache: CacheTratte in cui salvare le tratte calcolate (opzionale)
+        workers: Numero massimo di richieste contemporanee
+        rate: Richieste al secondo verso il backend (None = nessun limite)
+        callback: Funzione chiamata con (chiave, percorso, errore) a ogni tratta
+
+    Returns:
+        Dizionario {chiave: percorso} delle sole tratte calcolate con successo
+    """
+    bucket = TokenBucket(rate) if rate else None
+
+    def calcola(chiave, start, end):
+        if bucket:
+            bucket.acquisisci()
+        try:
+            percorso = backend.percorso(start, end)
+        except RoutingError as e:
+            return chiave, None, e
+        if cache is not None:
+            cache.set(chiave, percorso)
+        return chiave, percorso, None
+
+    risultati = {}
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        futures = [
+            executor.submit(calcola, chiave, start, end)
+            for chiave, (start, end) in tratte.items()
+        ]
+        for future in futures:
+            chiave, percorso, errore = future.result()
+            if percorso is not None:
+                risultati[chiave] = percorso
+            if callback:
+                callback(chiave, percorso, errore)
+    return risultati
+
+
+def pianifica_tratte(itinerario, profilo, cache=None, forza=False):
+    """
+    Individua le tratte di un itinerario e quelle già calcolate.
+
+    Una tratta è riutilizzata se la sua chiave coincide con quella di un
+    percorso già salvato nell'itinerario o presente nella cache su file.
+
+    Returns:
+        Lista di tuple (indice, chiave, start, end, percorso o None)
+    """
+    tappe = itinerario.coordinate_tappe or []
+    salvate = {
+        p.get("chiave"): p
+        for p in (itinerario.percorsi_calcolati or {}).values()
+        if isinstance(p, dict) and not p.get("straight_line")
+    }
+    tratte = []
+    for i in range(len(tappe) - 1):
+        start, end = tappe[i]["coords"], tappe[i + 1]["coords"]
+        chiave = chiave_tratta(start, end, profilo)
+        percorso = None
+        if not forza:
+            percorso = salvate.get(chiave) or (cache.get(chiave) if cache else None)
+        tratte.append((i, chiave, start, end, percorso))
+    return tratte
+
+
+def componi_percorsi(itinerario, tratte, calcolate):
+    """
+    Compone il dizionario percorsi_calcolati dell'itinerario.
+
+    Le tratte non calcolate diventano linee rette (e verranno ricalcolate alla
+    prossima esecuzione, perché non sono salvate nella cache).
+    """
+    from ..utils.polyline import comprimi_percorso
+
+    tappe = itinerario.coordinate_tappe
+    percorsi = {}
+    for i, chiave, start, end, percorso in tratte:
+        percorso = percorso or calcolate.get(chiave)
+        if percorso is None:
+            percorso = {"coords": [start, end], "straight_line": True}
+        percorso = {
+            **percorso,
+            "chiave": chiave,
+            "tratteggiato": tappe[i + 1].get("tratteggiato", False),
+        }
+        # Semplifica e codifica in encoded polyline
+        percorsi[f"{i}_{i+1}"] = comprimi_percorso(percorso)
+    return percorsi
+
+
+def aggiorna_percorsi_itinerario(itinerario, backend=None, cache=None, rate=1.5):
+    """
+    Ricalcola le sole tratte nuove o modificate di un itinerario e lo salva
+    se i percorsi sono cambiati.
+
+    Returns:
+        True se l'itinerario è stato aggiornato
+    """
+    backend = backend or get_routing_backend()
+    cache = cache or CacheTratte()
+    if len(itinerario.coordinate_tappe or []) < 2:
+        return False
+
+    tratte = pianifica_tratte(itinerario, backend.profilo, cache)
+    da_calcolare = {
+        chiave: (start, end) for _i, chiave, start, end, percorso in tratte if percorso is None
+    }
+    calcolate = calcola_tratte(da_calcolare, backend, cache=cache, workers=2, rate=rate)
+    if len(calcolate) < len(da_calcolare):
+        # Il backend non ha risposto per qualche tratta: il lavoro verrà ritentato
+        raise RoutingError(
+            f"{len(da_calcolare) - len(calcolate)} tratte non calcolate per {itinerario.slug}"
+        )
+
+    percorsi = componi_percorsi(itinerario, tratte, calcolate)
+    if percorsi == itinerario.percorsi_calcolati:
+        return False
+    itinerario.percorsi_calcolati = percorsi
+    itinerario.save(update_fields=["percorsi_calcolati"])
+    return True
@@ -0,0 +1,282 @@
+"""
+Indice di ricerca full-text per opere, documenti e richieste di contatto.
+
+Per ogni oggetto e per ogni lingua viene salvata una VoceRicerca con i token
+normalizzati (minuscolo, senza accenti, ridotti alla radice: vedi
+utils/testo.py) divisi in "titolo" (peso alto) e "testo". La ricerca usa
+l'indice nativo del database:
+- SQLite: tabella FTS5 parco_verismo_vocericerca_fts, ordinata con bm25;
+- PostgreSQL: indice GIN sul tsvector pesato, ordinato con ts_rank;
+- altri database: filtro icontains sulle voci, senza ordinamento per rilevanza.
+
+Le richieste sono indicizzate solo in italiano (LINGUE_MODELLO) e cercate
+dall'admin con filtra(), che aggiunge al queryset una sottoquery sull'indice.
+
+L'indice viene aggiornato dai segnali (vedi parco_verismo/signals.py) e può
+essere ricostruito con `python manage.py ricostruisci_indice_ricerca`.
+"""
+
+# Django imports
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+# Local imports
+from ..utils.testo import tokenizza
+
+SQL_SQLITE = """
+    SELECT v.oggetto_id
+    FROM parco_verismo_vocericerca_fts f
+    JOIN parco_verismo_vocericerca v ON v.id = f.rowid
+    WHERE parco_verismo_vocericerca_fts MATCH %s AND v.modello = %s AND v.lingua = %s
+    ORDER BY bm25(parco_verismo_vocericerca_fts, 10.0, 1.0)
+"""
+
+# L'espressione deve coincidere con quella dell'indice GIN (migrazione 0028)
+TSVECTOR_POSTGRESQL = (
+    "setweight(to_tsvector('simple'::regconfig, titolo), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, testo), 'B')"
+)
+SQL_POSTGRESQL = f"""
+    SELECT oggetto_id
+    FROM parco_verismo_vocericerca
+    WHERE modello = %s AND lingua = %s
+      AND ({TSVECTOR_POSTGRESQL}) @@ to_tsquery('simple', %s)
+    ORDER BY ts_rank(({TSVECTOR_POSTGRESQL}), to_tsquery('simple', %s)) DESC
+"""
+
+# Sottoquery senza ordinamento per filtrare un queryset (filtra). Su SQLite il
+# MATCH va in una sottoquery a parte: con la JOIN, senza ORDER BY bm25, SQLite
+# scorre le voci del modello e valuta il MATCH per ognuna (secondi, non ms)
+SUBQUERY_SQLITE = """
+    SELECT oggetto_id
+    FROM parco_verismo_vocericerca
+    WHERE id IN (
+        SELECT rowid FROM parco_verismo_vocericerca_fts WHERE parco_verismo_vocericerca_fts MATCH %s
+    ) AND modello = %s AND lingua = %s
+"""
+SUBQUERY_POSTGRESQL = f"""
+    SELECT oggetto_id
+    FROM parco_verismo_vocericerca
+    WHERE modello = %s AND lingua = %s
+      AND ({TSVECTOR_POSTGRESQL}) @@ to_tsquery('simple', %s)
+"""
+
+
+def _traduzione(istanza, campo, lingua):
+    return istanza.safe_translation_getter(campo, language_code=lingua, any_language=True) or ""
+
+
+def _campi_opera(opera, lingua):
+    titolo = [_traduzione(opera, "titolo", lingua), opera.autore.nome]
+    testo = [
+        _traduzione(opera, "breve_descrizione", lingua),
+        _traduzione(opera, "trama", lingua),
+    ]
+    return titolo, testo
+
+
+def _campi_documento(documento, lingua):
+    titolo = [
+        _traduzione(documento, "titolo", lingua),
+        documento.autori or "",
+        _traduzione(documento, "parole_chiave", lingua),
+    ]
+    testo = [
+        _traduzione(documento, "riassunto", lingua),
+        _traduzione(documento, "descrizione", lingua),
+    ]
+    return titolo, testo
+
+
+def _campi_richiesta(richiesta, lingua):
+    # I campi di search_fields dell'admin delle richieste
+    titolo = [
+        richiesta.nome,
+        richiesta.cognome,
+        richiesta.email,
+        richiesta.ente,
+        richiesta.oggetto,
+        richiesta.guida_assegnata,
+    ]
+    testo = [richiesta.messaggio, richiesta.note_admin]
+    return titolo, testo
+
+
+# Modelli indicizzati: nome del modello -> funzione che estrae (titolo, testo)
+MODELLI_INDICIZZATI = {
+    "Opera": _campi_opera,
+    "Documento": _campi_documento,
+    "Richiesta": _campi_richiesta,
+}
+
+# Lingue dell'indice per i modelli non tradotti (default: tutte le LANGUAGES)
+LINGUE_MODELLO = {
+    "Richiesta": ("it",),
+}
+
+
+def _lingue(modello):
+    return LINGUE_MODELLO.get(modello) or [lingua for lingua, _nome in settings.LANGUAGES]
+
+
+def _match(token):
+    """Query di ricerca per prefisso per il database in uso."""
+    if connection.vendor == "sqlite":
+        # Ogni token è alfanumerico: la ricerca per prefisso "token"* è sicura
+        return " ".join(f'"{t}"*' for t in token)
+    return " & ".join(f"{t}:*" for t in token)
+
+
+def _voci(istanza):
+    """(lingua, titolo, testo) normalizzati di un oggetto, per ogni lingua dell'indice."""
+    modello = istanza.__class__.__name__
+    estrai = MODELLI_INDICIZZATI[modello]
+    for lingua in _lingue(modello):
+        titolo, testo = estrai(istanza, lingua)
+        yield (
+            lingua,
+            " ".join(tokenizza(" ".join(titolo), lingua)),
+            " ".join(tokenizza(" ".join(testo), lingua)),
+        )
+
+
+def indicizza(istanza):
+    """Aggiorna le voci dell'indice di un oggetto in tutte le lingue del sito."""
+    from ..models import VoceRicerca
+
+    for lingua, titolo, testo in _voci(istanza):
+        VoceRicerca.objects.update_or_create(
+            modello=istanza.__class__.__name__,
+            oggetto_id=istanza.pk,
+            lingua=lingua,
+            defaults={"titolo": titolo, "testo": testo},
+        )
+
+
+def rimuovi(modello, oggetto_id):
+    """Elimina dall'indice tutte le voci di un oggetto."""
+    from ..models import VoceRicerca
+
+    VoceRicerca.objects.filter(modello=modello, oggetto_id=oggetto_id).delete()
+
+
+def ricostruisci_indice(modelli=None):
+    """
+    Ricostruisce da zero l'indice dei modelli indicati (default: tutti).
+
+    Returns:
+        Dizionario {modello: numero di oggetti indicizzati}
+    """
+    from django.apps import apps
+    from django.db import transaction
+    from ..models import VoceRicerca
+
+    conteggi = {}
+    with transaction.atomic():
+        for modello in modelli or MODELLI_INDICIZZATI:
+            VoceRicerca.objects.filter(modello=modello).delete()
+            queryset = apps.get_model("parco_verismo", modello).objects.all()
+            if hasattr(queryset.model, "_parler_meta"):
+                queryset = queryset.prefetch_related("translations")
+            if modello == "Opera":
+                queryset = queryset.select_related("autore")
+            conteggi[modello] = 0
+            voci = []
+            for istanza in queryset.iterator(chunk_size=200):
+                # Indice appena svuotato: inserimenti in blocco, senza update_or_create
+                voci += [
+                    VoceRicerca(modello=modello, oggetto_id=istanza.pk, lingua=lingua, titolo=titolo, testo=testo)
+                    for lingua, titolo, testo in _voci(istanza)
+                ]
+                if len(voci) >= 1000:
+                    VoceRicerca.objects.bulk_create(voci)
+                    voci = []
+                conteggi[modello] += 1
+            VoceRicerca.objects.bulk_create(voci)
+
+        if connection.vendor == "sqlite":
+            # Riallinea la tabella FTS5 al contenuto (compatta anche l'indice)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "INSERT INTO parco_verismo_vocericerca_fts(parco_verismo_vocericerca_fts) "
+                    "VALUES ('rebuild')"
+                )
+    return conteggi
+
+
+def indice_disponibile(modello):
+    """True se l'indice del modello contiene almeno una voce."""
+    from ..models import VoceRicerca
+
+    return VoceRicerca.objects.filter(modello=modello).exists()
+
+
+def cerca(modello, query, lingua=None):
+    """
+    Cerca nell'indice gli oggetti di un modello.
+
+    Args:
+        modello: Nome del modello ("Opera" o "Documento")
+        query: Testo cercato dall'utente
+        lingua: Lingua dell'indice (default: lingua attiva)
+
+    Returns:
+        Lista degli ID degli oggetti trovati, dal più rilevante
+    """
+    from django.utils import translation
+    from ..models import VoceRicerca
+
+    lingua = lingua or translation.get_language() or settings.LANGUAGE_CODE
+    token = tokenizza(query, lingua)
+    if not token:
+        return []
+
+    if connection.vendor == "sqlite":
+        with connection.cursor() as cursor:
+            cursor.execute(SQL_SQLITE, [_match(token), modello, lingua])
+            return [row[0] for row in cursor.fetchall()]
+
+    if connection.vendor == "postgresql":
+        tsquery = _match(token)
+        with connection.cursor() as cursor:
+            cursor.execute(SQL_POSTGRESQL, [modello, lingua, tsquery, tsquery])
+            return [row[0] for row in cursor.fetchall()]
+
+    voci = VoceRicerca.objects.filter(modello=modello, lingua=lingua)
+    for t in token:
+        voci = voci.filter(Q(titolo__icontains=t) | Q(testo__icontains=t))
+    return list(voci.values_list("oggetto_id", flat=True))
+
+
+def filtra(queryset, query, lingua=None):
+    """
+    Filtra un queryset con l'indice: gli oggetti che contengono tutte le
+    parole cercate (per prefisso), con una sottoquery invece di una lista di ID.
+
+    Args:
+        queryset: Queryset del modello indicizzato (es. quello dell'admin)
+        query: Testo cercato
+        lingua: Lingua dell'indice (default: la prima del modello)
+
+    Returns:
+        Il queryset filtrato, o None se la query non contiene parole cercabili
+    """
+    from django.db.models.expressions import RawSQL
+    from ..models import VoceRicerca
+
+    modello = queryset.model.__name__
+    lingua = lingua or _lingue(modello)[0]
+    token = tokenizza(query, lingua)
+    if not token:
+        return None
+
+    if connection.vendor == "sqlite":
+        return queryset.filter(pk__in=RawSQL(SUBQUERY_SQLITE, [_match(token), modello, lingua]))
+    if connection.vendor == "postgresql":
+        return queryset.filter(pk__in=RawSQL(SUBQUERY_POSTGRESQL, [modello, lingua, _match(token)]))
+
+    voci = VoceRicerca.objects.filter(modello=modello, lingua=lingua)
+    for t in token:
+        voci = voci.filter(Q(titolo__icontains=t) | Q(testo__icontains=t))
+    return queryset.filter(pk__in=voci.values("oggetto_id"))
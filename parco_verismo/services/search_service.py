@@ -2,12 +2,34 @@
 Servizi per ricerche e filtri.
 """
 
-from django.db.models import Q
+from django.core.cache import cache
+from django.db.models import Case, IntegerField, Q, When, prefetch_related_objects
+from django.utils import timezone, translation
+
+from ..utils.page_cache import get_generation
+from .search_index import cerca, indice_disponibile
+
+# Durata massima in cache degli eventi in evidenza (secondi)
+EVENTI_EVIDENZA_TIMEOUT = 3600
+
+
+def _ordina_per_rilevanza(queryset, ids):
+    """Filtra il queryset sugli ID trovati mantenendo l'ordine di rilevanza."""
+    if not ids:
+        return queryset.none()
+    ordine = Case(
+        *[When(pk=pk, then=posizione) for posizione, pk in enumerate(ids)],
+        output_field=IntegerField(),
+    )
+    return queryset.filter(pk__in=ids).order_by(ordine)
 
 
 def ricerca_opere(query, queryset=None):
     """
-    Effettua una ricerca nelle opere per titolo o autore.
+    Effettua una ricerca nelle opere per titolo, autore o trama.
+
+    Usa l'indice di ricerca (risultati ordinati per rilevanza); finché
+    l'indice non è stato costruito ripiega su una ricerca icontains.
 
     Args:
         query: Stringa di ricerca
@@ -24,6 +46,9 @@ def ricerca_opere(query, queryset=None):
     if not query:
         return queryset
 
+    if indice_disponibile("Opera"):
+        return _ordina_per_rilevanza(queryset, cerca("Opera", query))
+
     return queryset.filter(
         Q(translations__titolo__icontains=query)
         | Q(autore__nome__icontains=query)
@@ -35,6 +60,8 @@ def ricerca_documenti(query, tipo=None, queryset=None):
     """
     Effettua una ricerca nei documenti.
 
+    Con una query i risultati sono ordinati per rilevanza (vedi ricerca_opere).
+
     Args:
         query: Stringa di ricerca
         tipo: Tipo di documento (opzionale)
@@ -51,7 +78,9 @@ def ricerca_documenti(query, tipo=None, queryset=None):
     if tipo:
         queryset = queryset.filter(tipo=tipo)
 
-    if query:
+    if query and indice_disponibile("Documento"):
+        queryset = _ordina_per_rilevanza(queryset, cerca("Documento", query))
+    elif query:
         queryset = queryset.filter(
             Q(translations__titolo__icontains=query)
             | Q(translations__descrizione__icontains=query)
@@ -85,6 +114,46 @@ def get_eventi_futuri(limit=None):
     return eventi
 
 
+def get_eventi_in_evidenza(limit=5):
+    """
+    Restituisce fino a `limit` eventi attivi: prima i futuri (dal più vicino),
+    poi i passati (dal più recente), con le traduzioni già caricate.
+
+    Al più due query limitate (i futuri, poi i passati se i futuri non
+    bastano) più una per le traduzioni. Il risultato resta in cache fino all'inizio del primo
+    evento futuro (quando l'ordine cambia) e viene invalidato dai salvataggi
+    dei contenuti (generazione della cache pagine).
+
+    Returns:
+        Lista di eventi
+    """
+    from ..models import Evento
+
+    chiave = f"eventi-in-evidenza:{get_generation()}:{limit}"
+    eventi = cache.get(chiave)
+    if eventi is None:
+        adesso = timezone.now()
+        attivi = Evento.objects.filter(is_active=True)
+        eventi = list(attivi.filter(data_inizio__gte=adesso).order_by("data_inizio")[:limit])
+        if len(eventi) < limit:
+            eventi += list(
+                attivi.filter(data_inizio__lt=adesso).order_by("-data_inizio")[: limit - len(eventi)]
+            )
+        # Traduzioni di tutti gli eventi con una sola query
+        prefetch_related_objects(eventi, "translations")
+
+        timeout = EVENTI_EVIDENZA_TIMEOUT
+        if eventi and eventi[0].data_inizio >= adesso:
+            timeout = min(timeout, (eventi[0].data_inizio - adesso).total_seconds())
+        cache.set(chiave, eventi, max(1, int(timeout)))
+
+    # Gli oggetti in cache ricordano la lingua della richiesta che li ha caricati
+    lingua = translation.get_language()
+    for evento in eventi:
+        evento.set_current_language(lingua)
+    return eventi
+
+
 def get_notizie_recenti(limit=None):
     """
     Restituisce le notizie più recenti.
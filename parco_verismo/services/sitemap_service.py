@@ -0,0 +1,131 @@
+"""
+Sitemap precalcolata: un indice (sitemap.xml) e un file per sezione
+(sitemap-eventi.xml, ...), ognuno anche compresso (.xml.gz).
+
+I file vengono scritti in SITEMAP_DIR e serviti da nginx (gzip_static) o,
+in sviluppo, da views/seo.py: una visita dei crawler non esegue query.
+Il comando genera_sitemap li crea tutti; i segnali di salvataggio accodano
+l'aggiornamento della sola sezione cambiata e dell'indice.
+"""
+
+# Standard library imports
+import gzip
+import os
+import tempfile
+from pathlib import Path
+from urllib.parse import urlsplit
+
+# Django imports
+from django.conf import settings
+from django.contrib.sitemaps.views import SitemapIndexItem
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+# Local imports
+from ..sitemaps import SITEMAPS
+from ..utils.page_cache import get_page_cache
+from .job_queue import accoda
+
+NOME_INDICE = "sitemap.xml"
+
+# Modello -> sezione della sitemap che ne elenca gli oggetti (vedi signals.py)
+SEZIONI_MODELLI = {
+    "Autore": "autori",
+    "Evento": "eventi",
+    "Notizia": "notizie",
+    "Documento": "documenti",
+    "Itinerario": "itinerari",
+}
+
+# Chiave (nella cache condivisa con il worker) usata per non accodare più
+# aggiornamenti della stessa sezione
+AGGIORNAMENTO_IN_CODA = "sitemap:in-coda:{sezione}"
+AGGIORNAMENTO_TIMEOUT = 600
+
+
+class Sito:
+    """Dominio del sito per gli URL assoluti (al posto di contrib.sites)."""
+
+    def __init__(self, url):
+        parti = urlsplit(url)
+        self.protocollo = parti.scheme or "https"
+        self.domain = self.name = parti.netloc or parti.path
+
+
+def _sitemap_dir():
+    return Path(settings.SITEMAP_DIR)
+
+
+def nome_file(sezione=None):
+    """Nome del file di una sezione, o dell'indice se sezione è None."""
+    return NOME_INDICE if sezione is None else f"sitemap-{sezione}.xml"
+
+
+def percorso_file(sezione=None):
+    return _sitemap_dir() / nome_file(sezione)
+
+
+def _scrivi(nome, contenuto):
+    """Scrive il file e la versione .gz in modo atomico."""
+    cartella = _sitemap_dir()
+    cartella.mkdir(parents=True, exist_ok=True)
+    dati = contenuto.encode("utf-8")
+    # mtime=0: stesso contenuto, stesso file compresso
+    for percorso, corpo in (
+        (cartella / nome, dati),
+        (cartella / f"{nome}.gz", gzip.compress(dati, compresslevel=9, mtime=0)),
+    ):
+        fd, tmp_path = tempfile.mkstemp(dir=cartella, suffix=".tmp")
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(corpo)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, percorso)
+
+
+def genera_sezione(sezione):
+    """Scrive il file di una sezione; restituisce il numero di URL."""
+    sitemap = SITEMAPS[sezione]()
+    sito = Sito(settings.SITE_URL)
+    urls = []
+    for pagina in sitemap.paginator.page_range:
+        urls.extend(sitemap.get_urls(page=pagina, site=sito, protocol=sito.protocollo))
+    _scrivi(nome_file(sezione), render_to_string("sitemap.xml", {"urlset": urls}))
+    return len(urls)
+
+
+def genera_indice():
+    """Scrive l'indice con la data dell'ultima modifica di ogni sezione."""
+    sito = Sito(settings.SITE_URL)
+    voci = []
+    for sezione, classe in SITEMAPS.items():
+        lastmod = classe().get_latest_lastmod()
+        location = f"{sito.protocollo}://{sito.domain}" + reverse(
+            "sitemap_sezione", kwargs={"sezione": sezione}
+        )
+        voci.append(SitemapIndexItem(location, lastmod))
+    _scrivi(NOME_INDICE, render_to_string("sitemap_index.xml", {"sitemaps": voci}))
+
+
+def genera_sitemap(sezioni=None):
+    """Scrive le sezioni indicate (default: tutte) e l'indice."""
+    risultati = {sezione: genera_sezione(sezione) for sezione in sezioni or SITEMAPS}
+    genera_indice()
+    return risultati
+
+
+def richiedi_aggiornamento(sezione):
+    """
+    Accoda l'aggiornamento di una sezione, se non ce n'è già uno in coda:
+    più salvataggi di seguito producono un solo lavoro.
+    """
+    chiave = AGGIORNAMENTO_IN_CODA.format(sezione=sezione)
+    if get_page_cache().add(chiave, True, AGGIORNAMENTO_TIMEOUT):
+        accoda("sitemap.aggiorna", sezione=sezione)
+
+
+def aggiorna_sezione(sezione):
+    """Rigenera una sezione e l'indice (eseguito dal worker)."""
+    # Da qui in poi un nuovo salvataggio deve accodare un altro aggiornamento
+    get_page_cache().delete(AGGIORNAMENTO_IN_CODA.format(sezione=sezione))
+    genera_sezione(sezione)
+    genera_indice()
@@ -1,11 +1,21 @@
 """
 Servizi per statistiche e report.
+
+Le statistiche delle richieste sono calcolate con una sola query
+(RichiestaQuerySet.statistiche). Il contenuto della dashboard delle richieste
+resta in cache per RICHIESTE_DASHBOARD_CACHE_TIMEOUT secondi ed è invalidato
+dai segnali di Richiesta (vedi invalida_dashboard_richieste).
 """
 
-from django.db.models import Count
-from django.utils import timezone
 from datetime import timedelta
 
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+from django.utils import timezone
+
+DASHBOARD_RICHIESTE_CACHE_KEY = "richieste:dashboard"
+
 
 def get_stats_richieste():
     """
@@ -16,26 +26,74 @@ def get_stats_richieste():
     """
     from ..models import Richiesta
 
-    oggi = timezone.now().date()
-    settimana_fa = oggi - timedelta(days=7)
-    mese_fa = oggi - timedelta(days=30)
+    ora = timezone.now()
+    settimana_fa = ora - timedelta(days=7)
+    mese_fa = ora - timedelta(days=30)
+
+    conteggi = Richiesta.objects.statistiche(
+        questa_settimana=Count("id", filter=Q(data_richiesta__gte=settimana_fa)),
+        questo_mese=Count("id", filter=Q(data_richiesta__gte=mese_fa)),
+        **{
+            f"priorita_{priorita}": Count("id", filter=Q(priorita=priorita))
+            for priorita, _etichetta in Richiesta.PRIORITA_CHOICES
+        },
+    )
+    per_priorita = [
+        {"priorita": priorita, "count": conteggi.pop(f"priorita_{priorita}")}
+        for priorita, _etichetta in Richiesta.PRIORITA_CHOICES
+    ]
 
     stats = {
-        "totali": Richiesta.objects.count(),
-        "nuove": Richiesta.objects.filter(stato="nuova").count(),
-        "in_lavorazione": Richiesta.objects.filter(stato="in_lavorazione").count(),
-        "confermate": Richiesta.objects.filter(stato="confermata").count(),
-        "completate": Richiesta.objects.filter(stato="completata").count(),
-        "questa_settimana": Richiesta.objects.filter(
-            data_richiesta__gte=settimana_fa
-        ).count(),
-        "questo_mese": Richiesta.objects.filter(data_richiesta__gte=mese_fa).count(),
-        "per_priorita": Richiesta.objects.values("priorita").annotate(count=Count("id")).order_by("-count"),
+        **conteggi,
+        "per_priorita": sorted(
+            (voce for voce in per_priorita if voce["count"]), key=lambda voce: -voce["count"]
+        ),
     }
 
     return stats
 
 
+def get_dashboard_richieste():
+    """
+    Statistiche e liste della dashboard delle richieste: 5 query in tutto,
+    indipendenti dal numero di richieste, e in cache per pochi secondi.
+
+    Returns:
+        Dict con stats, richieste_urgenti, in_ritardo, richieste_recenti e
+        richieste_cancellate
+    """
+    from ..models import Richiesta
+
+    cache = caches[settings.RICHIESTE_DASHBOARD_CACHE_ALIAS]
+    dashboard = cache.get(DASHBOARD_RICHIESTE_CACHE_KEY)
+    if dashboard is not None:
+        return dashboard
+
+    dashboard = {
+        "stats": Richiesta.objects.statistiche(),
+        # Richieste urgenti (priorità alta + non completate)
+        "richieste_urgenti": list(
+            Richiesta.objects.filter(stato__in=["nuova", "in_lavorazione"], priorita="alta").order_by(
+                "-data_richiesta"
+            )[:10]
+        ),
+        # Le più vecchie tra quelle in attesa da più di RICHIESTE_GIORNI_RITARDO giorni
+        "in_ritardo": list(Richiesta.objects.in_ritardo().con_attesa().order_by("data_richiesta")[:10]),
+        # Ultime richieste attive
+        "richieste_recenti": list(Richiesta.objects.attive().order_by("-data_richiesta")[:15]),
+        "richieste_cancellate": list(
+            Richiesta.objects.filter(stato="cancellata").order_by("-ultima_modifica")[:15]
+        ),
+    }
+    cache.set(DASHBOARD_RICHIESTE_CACHE_KEY, dashboard, settings.RICHIESTE_DASHBOARD_CACHE_TIMEOUT)
+    return dashboard
+
+
+def invalida_dashboard_richieste():
+    """Da chiamare quando cambiano le richieste (anche con update() in blocco)."""
+    caches[settings.RICHIESTE_DASHBOARD_CACHE_ALIAS].delete(DASHBOARD_RICHIESTE_CACHE_KEY)
+
+
 def get_stats_contenuti():
     """
     Restituisce statistiche sui contenuti pubblicati.
@@ -0,0 +1,260 @@
+"""
+Segnali dell'app: invalidazione delle cache quando cambiano i contenuti e
+lavori in background (ottimizzazione immagini, percorsi degli itinerari).
+"""
+
+# Standard library imports
+import logging
+
+# Django imports
+from django.apps import apps
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.utils import timezone
+
+# Third-party imports
+from parler.signals import post_translation_delete, post_translation_save
+
+# Local imports
+from .services import search_index, sitemap_service
+from .services.job_queue import accoda
+from .services.itinerari_service import invalida_mappa_itinerari
+from .services.stats_service import invalida_dashboard_richieste
+from .utils.page_cache import bump_generation
+from .utils.renditions import CAMPI_RENDITION, richiedi_rendition
+
+logger = logging.getLogger(__name__)
+
+# Modelli che non compaiono nelle pagine pubbliche: salvarli non invalida la cache
+# (le richieste di contatto arrivano dal form pubblico e sarebbero troppo frequenti;
+# le voci dell'indice cambiano solo insieme all'oggetto indicizzato; i lavori in
+# coda vengono creati anche durante il rendering delle pagine, vedi renditions.py)
+PAGE_CACHE_IGNORED_MODELS = ("Job", "Richiesta", "VoceRicerca")
+
+# Modelli con updated_at (vedi utils/condizionale.py) e modelli collegati mostrati
+# nelle loro pagine: modello collegato -> ForeignKey verso il modello principale.
+# Anche le traduzioni contano: parler le salva a parte, con il proprio segnale.
+MODELLI_DATA_MODIFICA = ("Evento", "Notizia", "Documento", "Itinerario")
+COLLEGATI_DATA_MODIFICA = {
+    "EventoImage": "evento",
+    "EventoDocumento": "evento",
+    "NotiziaImage": "notizia",
+    "NotiziaDocumento": "notizia",
+    "ItinerarioImmagine": "itinerario",
+}
+
+
+def invalida_cache_pagine(sender, **kwargs):
+    """Qualsiasi modifica ai contenuti rende obsolete le pagine in cache."""
+    bump_generation()
+
+
+def invalida_mappe_itinerari(sender, **kwargs):
+    """Gli itinerari o le loro gallerie sono cambiati: rigenera i payload delle mappe."""
+    # Dopo il commit: prima, una richiesta concorrente ricostruirebbe il payload
+    # dai dati vecchi e lo lascerebbe in cache fino alla modifica successiva
+    transaction.on_commit(invalida_mappa_itinerari)
+
+
+def invalida_statistiche_richieste(sender, **kwargs):
+    """Una richiesta è cambiata: la dashboard va ricalcolata."""
+    invalida_dashboard_richieste()
+
+
+def aggiorna_data_modifica(sender, instance, **kwargs):
+    """Un oggetto collegato è cambiato: aggiorna updated_at di quello principale."""
+    campo = sender._meta.get_field(COLLEGATI_DATA_MODIFICA.get(sender.__name__, "master"))
+    # update() non invia segnali e non passa da save()
+    campo.related_model.objects.filter(pk=getattr(instance, campo.attname)).update(
+        updated_at=timezone.now()
+    )
+
+
+def aggiorna_indice_ricerca(sender, instance, **kwargs):
+    search_index.indicizza(instance)
+
+
+def aggiorna_indice_traduzione(sender, instance, **kwargs):
+    """Una traduzione è stata salvata o eliminata: reindicizza l'oggetto."""
+    # Rilegge l'oggetto: quello collegato alla traduzione può avere traduzioni
+    # vecchie in memoria (la cache di parler è già aggiornata a questo punto)
+    istanza = sender.objects.filter(pk=instance.master_id).first()
+    if istanza is not None:
+        search_index.indicizza(istanza)
+
+
+def rimuovi_da_indice_ricerca(sender, instance, **kwargs):
+    search_index.rimuovi(sender.__name__, instance.pk)
+
+
+def aggiorna_indice_opere_autore(sender, instance, **kwargs):
+    """Il nome dell'autore è indicizzato insieme alle sue opere."""
+    for opera in instance.opere.prefetch_related("translations"):
+        search_index.indicizza(opera)
+
+
+def rileva_immagini_modificate(sender, instance, **kwargs):
+    """Annota i campi immagine nuovi o sostituiti, da ottimizzare dopo il salvataggio."""
+    if getattr(instance, "_ottimizzazione_in_corso", False):
+        instance._immagini_da_ottimizzare = []
+        return
+
+    # I valori originali vengono da ValoriOriginaliMixin: nessuna query
+    instance._immagini_da_ottimizzare = [
+        campo
+        for campo in CAMPI_RENDITION[sender.__name__]
+        if getattr(instance, campo) and instance.campo_modificato(campo)
+    ]
+
+
+def elabora_immagini(sender, instance, **kwargs):
+    """
+    Accoda la conversione in WebP delle immagini appena caricate e la
+    generazione delle rendition di quelle già ottimizzate.
+    """
+    da_ottimizzare = getattr(instance, "_immagini_da_ottimizzare", [])
+    instance._immagini_da_ottimizzare = []
+    for campo in CAMPI_RENDITION[sender.__name__]:
+        field_file = getattr(instance, campo)
+        if not field_file or not field_file.name:
+            continue
+        if campo in da_ottimizzare:
+            _accoda_dopo_commit(
+                "immagini.ottimizza",
+                modello=sender.__name__,
+                pk=instance.pk,
+                campo=campo,
+                nome=field_file.name,
+            )
+        else:
+            richiedi_rendition(field_file.name)
+
+
+def ricalcola_percorsi_itinerario(sender, instance, **kwargs):
+    """Le tappe sono cambiate: ricalcola in background le tratte nuove."""
+    if not instance.campo_modificato("coordinate_tappe"):
+        return
+    if len(instance.coordinate_tappe or []) < 2:
+        return
+    _accoda_dopo_commit("itinerari.calcola_percorsi", itinerario_id=instance.pk)
+
+
+def aggiorna_sitemap(sender, **kwargs):
+    """Un oggetto elencato nella sitemap è cambiato: rigenera la sua sezione."""
+    # Le traduzioni di parler hanno una ForeignKey "master" verso l'oggetto
+    modello = sender.master.field.related_model if hasattr(sender, "master") else sender
+    sezione = sitemap_service.SEZIONI_MODELLI[modello.__name__]
+    transaction.on_commit(lambda: sitemap_service.richiedi_aggiornamento(sezione))
+
+
+def _accoda_dopo_commit(lavoro, **argomenti):
+    """Accoda il lavoro dopo il commit: il worker deve trovare i dati già salvati."""
+
+    def _accoda():
+        try:
+            accoda(lavoro, **argomenti)
+        except Exception:
+            logger.exception("Impossibile accodare il lavoro %s %s", lavoro, argomenti)
+
+    transaction.on_commit(_accoda)
+
+
+def connect_signals():
+    # get_models() include anche i modelli *Translation generati da parler
+    for model in apps.get_app_config("parco_verismo").get_models():
+        if model.__name__ in PAGE_CACHE_IGNORED_MODELS:
+            continue
+        post_save.connect(
+            invalida_cache_pagine, sender=model, dispatch_uid=f"pagecache_save_{model.__name__}"
+        )
+        post_delete.connect(
+            invalida_cache_pagine, sender=model, dispatch_uid=f"pagecache_delete_{model.__name__}"
+        )
+
+    Itinerario = apps.get_model("parco_verismo", "Itinerario")
+    for model in (
+        Itinerario,
+        Itinerario._parler_meta.root_model,
+        apps.get_model("parco_verismo", "ItinerarioImmagine"),
+    ):
+        post_save.connect(
+            invalida_mappe_itinerari, sender=model, dispatch_uid=f"mappe_save_{model.__name__}"
+        )
+        post_delete.connect(
+            invalida_mappe_itinerari, sender=model, dispatch_uid=f"mappe_delete_{model.__name__}"
+        )
+
+    Richiesta = apps.get_model("parco_verismo", "Richiesta")
+    post_save.connect(
+        invalida_statistiche_richieste, sender=Richiesta, dispatch_uid="dashboard_save_Richiesta"
+    )
+    post_delete.connect(
+        invalida_statistiche_richieste, sender=Richiesta, dispatch_uid="dashboard_delete_Richiesta"
+    )
+
+    # Data di ultima modifica degli oggetti con pagina propria
+    collegati = [apps.get_model("parco_verismo", nome) for nome in COLLEGATI_DATA_MODIFICA]
+    collegati += [
+        apps.get_model("parco_verismo", nome)._parler_meta.root_model
+        for nome in MODELLI_DATA_MODIFICA
+    ]
+    for model in collegati:
+        post_save.connect(
+            aggiorna_data_modifica, sender=model, dispatch_uid=f"modifica_save_{model.__name__}"
+        )
+        post_delete.connect(
+            aggiorna_data_modifica, sender=model, dispatch_uid=f"modifica_delete_{model.__name__}"
+        )
+
+    # Sitemap: le traduzioni contano per la data di ultima modifica
+    for nome in sitemap_service.SEZIONI_MODELLI:
+        model = apps.get_model("parco_verismo", nome)
+        modelli = [model]
+        if hasattr(model, "_parler_meta"):
+            modelli.append(model._parler_meta.root_model)
+        for model in modelli:
+            post_save.connect(
+                aggiorna_sitemap, sender=model, dispatch_uid=f"sitemap_save_{model.__name__}"
+            )
+            post_delete.connect(
+                aggiorna_sitemap, sender=model, dispatch_uid=f"sitemap_delete_{model.__name__}"
+            )
+
+    # Indice di ricerca: parler salva le traduzioni dopo il post_save del modello
+    # e invia i propri segnali dopo aver aggiornato la sua cache delle traduzioni
+    for nome in search_index.MODELLI_INDICIZZATI:
+        model = apps.get_model("parco_verismo", nome)
+        post_save.connect(
+            aggiorna_indice_ricerca, sender=model, dispatch_uid=f"ricerca_save_{nome}"
+        )
+        post_delete.connect(
+            rimuovi_da_indice_ricerca, sender=model, dispatch_uid=f"ricerca_delete_{nome}"
+        )
+        if not hasattr(model, "_parler_meta"):
+            continue
+        post_translation_save.connect(
+            aggiorna_indice_traduzione, sender=model, dispatch_uid=f"ricerca_trad_save_{nome}"
+        )
+        post_translation_delete.connect(
+            aggiorna_indice_traduzione, sender=model, dispatch_uid=f"ricerca_trad_delete_{nome}"
+        )
+    post_save.connect(
+        aggiorna_indice_opere_autore,
+        sender=apps.get_model("parco_verismo", "Autore"),
+        dispatch_uid="ricerca_save_Autore",
+    )
+
+    for nome in CAMPI_RENDITION:
+        model = apps.get_model("parco_verismo", nome)
+        pre_save.connect(
+            rileva_immagini_modificate, sender=model, dispatch_uid=f"immagini_pre_save_{nome}"
+        )
+        post_save.connect(
+            elabora_immagini, sender=model, dispatch_uid=f"immagini_save_{nome}"
+        )
+
+    post_save.connect(
+        ricalcola_percorsi_itinerario,
+        sender=Itinerario,
+        dispatch_uid="percorsi_save_Itinerario",
+    )
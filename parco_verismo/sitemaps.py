@@ -1,12 +1,35 @@
+"""
+Sitemap del sito, una per sezione, con gli URL in tutte le lingue e le
+alternative hreflang. I file vengono generati da services/sitemap_service.py.
+"""
+
 # Django imports
 from django.contrib.sitemaps import Sitemap
+from django.db.models import Max
 from django.urls import reverse
 
 # Local imports
-from .models import Opera, Evento, Notizia, Documento, Itinerario, Autore
+from .models import Evento, Notizia, Documento, Itinerario, Autore
+
+
+class SitemapMultilingua(Sitemap):
+    """Un URL per lingua (it, en) con i link hreflang alle altre lingue."""
+    i18n = True
+    alternates = True
+    x_default = True
+
+
+class UltimaModificaMixin:
+    """lastmod da updated_at; la data più recente con una query aggregata."""
+
+    def lastmod(self, obj):
+        return obj.updated_at
 
+    def get_latest_lastmod(self):
+        return self.items().aggregate(ultima=Max("updated_at"))["ultima"]
 
-class StaticViewSitemap(Sitemap):
+
+class StaticViewSitemap(SitemapMultilingua):
     """Sitemap per le pagine statiche del sito"""
     priority = 0.8
     changefreq = 'monthly'
@@ -32,82 +55,66 @@ class StaticViewSitemap(Sitemap):
             'privacy_policy',
             'cookie_policy',
             'note_legali',
-
         ]
 
     def location(self, item):
         return reverse(item)
 
 
-class OperaSitemap(Sitemap):
-    """Sitemap per le opere letterarie"""
+class AutoreSitemap(SitemapMultilingua):
+    """Sitemap per le pagine degli autori (le opere non hanno una pagina propria)"""
     changefreq = 'monthly'
     priority = 0.7
 
     def items(self):
-        return Opera.objects.all()
-
-    def lastmod(self, obj):
-        # Le opere non hanno data di modifica, usa None
-        return None
-
-
-class AutoreSitemap(Sitemap):
-    """Sitemap per le pagine degli autori"""
-    changefreq = 'monthly'
-    priority = 0.7
-
-    def items(self):
-        return Autore.objects.all()
+        return Autore.objects.order_by("nome")
 
     def location(self, obj):
         return reverse('opere_per_autore', kwargs={'autore_slug': obj.slug})
 
 
-class EventoSitemap(Sitemap):
+class EventoSitemap(UltimaModificaMixin, SitemapMultilingua):
     """Sitemap per gli eventi"""
     changefreq = 'weekly'
     priority = 0.9
 
     def items(self):
-        return Evento.objects.filter(is_active=True)
-
-    def lastmod(self, obj):
-        return obj.data_inizio
+        return Evento.objects.filter(is_active=True).order_by("pk")
 
 
-class NotiziaSitemap(Sitemap):
+class NotiziaSitemap(UltimaModificaMixin, SitemapMultilingua):
     """Sitemap per le notizie"""
     changefreq = 'daily'
     priority = 0.8
 
     def items(self):
-        return Notizia.objects.filter(is_active=True)
-
-    def lastmod(self, obj):
-        return obj.data_pubblicazione
+        return Notizia.objects.filter(is_active=True).order_by("pk")
 
 
-class DocumentoSitemap(Sitemap):
+class DocumentoSitemap(UltimaModificaMixin, SitemapMultilingua):
     """Sitemap per i documenti e studi"""
     changefreq = 'monthly'
     priority = 0.6
 
     def items(self):
-        return Documento.objects.filter(is_active=True)
-
-    def lastmod(self, obj):
-        return obj.data_pubblicazione
+        return Documento.objects.filter(is_active=True).order_by("pk")
 
 
-class ItinerarioSitemap(Sitemap):
+class ItinerarioSitemap(UltimaModificaMixin, SitemapMultilingua):
     """Sitemap per gli itinerari"""
     changefreq = 'monthly'
     priority = 0.7
 
     def items(self):
-        return Itinerario.objects.filter(is_active=True)
-
-    def lastmod(self, obj):
-        # Gli itinerari non hanno data di modifica
-        return None
+        return Itinerario.objects.filter(is_active=True).order_by("pk")
+
+
+# Sezioni della sitemap: nome -> classe (sitemap-<nome>.xml)
+SITEMAPS = {
+    "static": StaticViewSitemap,
+    "autori": AutoreSitemap,
+    "eventi": EventoSitemap,
+    "notizie": NotiziaSitemap,
+    "documenti": DocumentoSitemap,
+    "itinerari": ItinerarioSitemap,
+}
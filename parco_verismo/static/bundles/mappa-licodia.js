@@ -0,0 +1,210 @@
+/*! bundle mappa-licodia 81fd54c651d1 */
+// js/map/points_licodia.js
+var licodiaPoints = [
+    /*
+    // -------------------------------
+    // SERVIZI PUBBLICI
+    // -------------------------------
+    { name: "Comune di Licodia Eubea", coords: [37.155839520120296, 14.703029875170497], type: "Servizi Pubblici" },
+    { name: "Guardia Medica", coords: [37.15643563692656, 14.706274111726971], type: "Servizi Pubblici" },
+    { name: "Farmacia Leonardi", coords: [37.15550779484555, 14.702389079044565], type: "Servizi Pubblici" },
+    { name: "Stazione Carabinieri", coords: [37.15598494632054, 14.70773062521889], type: "Servizi Pubblici" },
+    { name: "Banca Agricola Popolare di Sicilia", coords: [37.15689943740032, 14.704662125218958], type: "Servizi Pubblici" },
+    { name: "Ufficio Postale", coords: [37.15617984238757, 14.706272454054922], type: "Servizi Pubblici" },
+
+    // -------------------------------
+    // SERVIZI CULTURALI
+    // -------------------------------
+    { name: "Ufficio Turistico", coords: [37.155814660700685, 14.702974081414455], type: "Servizi Culturali" },
+    { name: "Museo Civico Archeologico \"Antonino Di Vita\"", coords: [37.1563877977828, 14.70344668445429], type: "Servizi Culturali" },
+    { name: "Museo Civico Etnografico \"P. Angelo Coniglione\"", coords: [37.15581075781377, 14.701948626093838], type: "Servizi Culturali" },
+    { name: "Biblioteca Comunale", coords: [37.15657458739952, 14.703022209874762], type: "Servizi Culturali" },
+    { name: "Biblioteca Archeoclub \"Mario Di Benedetto\"", coords: [37.155708897242775, 14.702241811850143], type: "Servizi Culturali" },
+    { name: "Ex Chiesa della Badia di S. Benedetto e S. Chiara", coords: [37.155446306487164, 14.701216278517006], type: "Servizi Culturali" },
+    { name: "Libreria EuBook", coords: [37.15547473720298, 14.70096699638281], type: "Servizi Culturali" },
+    { name: "Informazioni Turistiche / Visite Guidate – Archeoclub", coords: [37.155811839983606, 14.702221709874687], type: "Servizi Culturali" },
+    { name: "Parco archeologico Vincenzo Cannizzo", coords: [37.16157906739131, 14.709749852300988], type: "Servizi Culturali" },
+
+    // -------------------------------
+    // PRODOTTI TIPICI
+    // -------------------------------
+    { name: "Torrone Renna", coords: [37.15528112190162, 14.700374601971124], type: "Prodotti Tipici" },
+    { name: "Tenuta Tremollito (Vini)", coords: [37.161612824221116, 14.721939754055187], type: "Prodotti Tipici" },
+    { name: "Terre di Giurfo (Vini / Olio)", coords: [37.11133738675372, 14.632760882888979], type: "Prodotti Tipici" },
+    { name: "Caseificio Savoca", coords: [37.15570730796464, 14.701237463517703], type: "Prodotti Tipici" },
+    { name: "Caseificio Polizzi", coords: [37.15831100709591, 14.707779491591173], type: "Prodotti Tipici" },
+
+    // -------------------------------
+    // OSPITALITÀ
+    // -------------------------------
+    { name: "La Gardenia B&B", coords: [37.15656813973657, 14.700885225218931], type: "Ospitalità" },
+    { name: "Mugnos Charme Living", coords: [37.15555468440031, 14.700190467546813], type: "Ospitalità" },
+    { name: "Santapau Charme Living", coords: [37.15541728282574, 14.69951579638283], type: "Ospitalità" },
+    { name: "Experience Il Paesino", coords: [37.155768592683046, 14.702774609874687], type: "Ospitalità" },
+    { name: "AmeCasa", coords: [37.15705555520639, 14.705051801873298], type: "Ospitalità" },
+    { name: "Home Restaurant Mugnos", coords: [37.15539953554547, 14.699660782890945], type: "Ospitalità" },
+    { name: "Casa Vacanza Nonna Vita", coords: [37.15264070305198, 14.69813144639994], type: "Ospitalità" },
+    { name: "Affitta Camere Mandorle e Gelsi", coords: [37.153156248612426, 14.698535867546699], type: "Ospitalità" },
+
+
+    // -------------------------------
+    // RISTORAZIONE
+    // -------------------------------
+    { name: "Cortile Arabo", coords: [37.15445871250081, 14.700527265736685], type: "Ristorazione" },
+    { name: "La Rusticana", coords: [37.1583366383493, 14.705307745450027], type: "Ristorazione" },
+    { name: "Pizzeria Ellepi", coords: [37.15853708516749, 14.70903806939925], type: "Ristorazione" },
+    { name: "Pizzeria Quirico Pannitteri", coords: [37.15775586101524, 14.706561776246962], type: "Ristorazione" },
+    { name: "Pizzeria La Rosa dei Venti", coords: [37.15525843212889, 14.700458311727022], type: "Ristorazione" },
+    { name: "Bar Boccadifuoco", coords: [37.15610713763271, 14.703218969399094], type: "Ristorazione" },
+    { name: "Bar Nazionale", coords: [37.157848587036625, 14.707095940563141], type: "Ristorazione" },
+    { name: "Eubea Caffè 81", coords: [37.155521889781014, 14.7016799252189], type: "Ristorazione" },
+
+    // -------------------------------
+    // LUOGHI VERGHIANI
+    // -------------------------------
+    { name: "Luoghi Fotografati da Giovanni Verga", coords: [37.154017340005275, 14.6987897424153], type: "Luoghi Verghiani" },
+    { name: "Luoghi Letterari Verghiani", coords: [37.155164794322225, 14.700044625218881], type: "Luoghi Verghiani" },
+    { name: "Luoghi della famiglia Verga – Contrada Giardino del Barone", coords: [37.15703520249028, 14.707157355531645], type: "Luoghi Verghiani" }
+    */
+];
+;
+// js/map/script_licodia.js
+document.addEventListener("DOMContentLoaded", function() {
+  // Inizializza mappa
+  var map = L.map(document.querySelector(".map-container"), { zoomControl: false }).setView([37.1564, 14.7043], 17);
+
+  L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+    maxZoom: 19,
+    attribution: '© OpenStreetMap contributors'
+  }).addTo(map);
+
+  L.control.zoom({ position: 'bottomleft' }).addTo(map);
+
+  // Legge le variabili CSS dal tema corrente
+  const rootStyles = getComputedStyle(document.documentElement);
+  const getColor = (varName) => rootStyles.getPropertyValue(varName).trim();
+
+  // Funzione per creare icona marker con Bootstrap Icons
+  function createMarkerIcon(iconClass, bgColor) {
+    return L.divIcon({
+      className: 'custom-marker',
+      html: `<div class="marker-pin" style="background: ${bgColor};">
+               <i class="bi ${iconClass}"></i>
+             </div>`,
+      iconSize: [36, 36],
+      iconAnchor: [18, 36],
+      popupAnchor: [0, -36]
+    });
+  }
+
+  // Colori da variabili CSS del tema
+  const colors = {
+    primary: getColor('--color-primary') || '#823228',
+    primaryLight: getColor('--color-primary-light') || '#C76A52',
+    secondary: getColor('--color-secondary') || '#C08C3B',
+    secondaryDark: getColor('--color-secondary-dark') || '#8F6110',
+    accent: getColor('--color-accent') || '#2F6D5C',
+    success: getColor('--color-success') || '#4B9F7C',
+    info: getColor('--color-info') || '#2F6E8C',
+    warning: getColor('--color-warning') || '#D07A00'
+  };
+
+  // Icone categorie con colori dal tema
+  var categoryIcons = {
+    "Servizi Pubblici": createMarkerIcon("bi-building-fill", colors.info),
+    "Servizi Culturali": createMarkerIcon("bi-bank2", colors.primary),
+    "Prodotti Tipici": createMarkerIcon("bi-basket2-fill", colors.secondaryDark),
+    "Ospitalità": createMarkerIcon("bi-house-heart-fill", colors.accent),
+    "Luoghi Verghiani": createMarkerIcon("bi-book-fill", colors.secondary),
+    "Ristorazione": createMarkerIcon("bi-cup-hot-fill", colors.warning)
+  };
+
+  var markers = [];
+  var allPointsData = [];
+
+  // Aggiungi marker
+  licodiaPoints.forEach(p => {
+    allPointsData.push(p);
+    if(!p.coords) return;
+
+    // 🔵 LINK GRATUITO GOOGLE MAPS PER IL PERCORSO
+    var routeLink = `https://www.google.com/maps/dir/?api=1&destination=${p.coords[0]},${p.coords[1]}`;
+
+    // Marker + popup con link percorso
+    var m = L.marker(p.coords, {icon: categoryIcons[p.type]})
+             .bindPopup(`
+                <strong>${p.name}</strong><br>
+                ${p.type}<br><br>
+                <a href="${routeLink}" target="_blank" style="color:#007bff; font-weight:bold;">
+                  ➤ Ottieni percorso
+                </a>
+             `);
+
+    m.type = p.type;
+    m.name = p.name;
+    markers.push(m);
+    m.addTo(map);
+  });
+
+  // Filtri
+  function filterMarkers(type){
+    markers.forEach(m => {
+      if(type === "all" || m.type === type){
+        if(!map.hasLayer(m)) map.addLayer(m);
+      } else {
+        if(map.hasLayer(m)) map.removeLayer(m);
+      }
+    });
+  }
+
+  const filterItems = document.querySelectorAll(".filter-item");
+
+  filterItems.forEach(item => {
+    item.addEventListener("click", function(){
+      const type = this.dataset.type;
+      filterMarkers(type);
+
+      filterItems.forEach(i => i.classList.remove("active"));
+      this.classList.add("active");
+    });
+  });
+
+  // Ricerca live
+  const searchBox = document.querySelector(".search-box");
+  const searchResults = document.querySelector(".search-results");
+
+  searchBox.addEventListener("input", function(){
+    const q = this.value.toLowerCase().trim();
+    searchResults.innerHTML = "";
+    if(q.length < 2){
+      searchResults.style.display = "none";
+      return;
+    }
+
+    const filtered = allPointsData.filter(p => p.name.toLowerCase().includes(q));
+
+    filtered.forEach(p => {
+      const div = document.createElement("div");
+      div.className = "search-result-item";
+      div.textContent = p.name;
+      div.addEventListener("click", function(){
+        if(p.coords) map.setView(p.coords, 18);
+        const m = markers.find(m => m.name === p.name);
+        if(m) m.openPopup();
+
+        searchBox.value = "";
+        searchResults.style.display = "none";
+      });
+      searchResults.appendChild(div);
+    });
+
+    searchResults.style.display = filtered.length ? "block" : "none";
+  });
+
+  document.addEventListener("click", function(e){
+    if(!e.target.closest(".search-container")){
+      searchResults.style.display = "none";
+    }
+  });
+});
+;
@@ -0,0 +1,248 @@
+/*! bundle mappa-mineo 02c2a454d001 */
+// js/map/points_mineo.js
+var mineoPoints = [
+    /*
+    // -------------------------------
+    // SERVIZI PUBBLICI
+    // -------------------------------
+    { name: "Comune di Mineo", coords: [37.26484238685861, 14.691158239654497], type: "Servizi Pubblici" },
+    { name: "Guardia Medica", coords: [37.268441557775596, 14.690886852207976], type: "Servizi Pubblici" },
+    { name: "Farmacia", coords: [37.26474177995953, 14.690808932550503], type: "Servizi Pubblici" },
+    { name: "Stazione Carabinieri", coords: [37.27011599562139, 14.692895582895838], type: "Servizi Pubblici" },
+    { name: "Ufficio Postale", coords: [37.26323826188573, 14.688680038715335], type: "Servizi Pubblici" },
+    { name: "Polizia Municipale", coords: [37.265054010774584, 14.691428096387458], type: "Servizi Pubblici" },
+
+    // -------------------------------
+    // SERVIZI CULTURALI
+    // -------------------------------
+    { name: "Castello di Mineo", coords: [37.26795767707405, 14.692625415635504], type: "Servizi Culturali" },
+    { name: "Chiesa Madre di Sant'Agrippina", coords: [37.26472893202025, 14.688345960935301], type: "Servizi Culturali" },
+    { name: "Biblioteca Comunale Luigi Capuana", coords: [37.265968352342924, 14.690644335463302], type: "Servizi Culturali" },
+    { name: "Museo Civico Corrado Tamburino Merlini", coords: [37.26343695281996, 14.690087349329241], type: "Servizi Culturali" },
+    { name: "Chiesa di San Pietro", coords: [37.26667017632246, 14.690075140567803], type: "Servizi Culturali" },
+    { name: "Chiesa del SS. Salvatore", coords: [37.267193140754266, 14.692529656782403], type: "Servizi Culturali" },
+    { name: "Convento dei Cappuccini", coords: [37.26773372587575, 14.686131932155918], type: "Servizi Culturali" },
+    { name: "Porta Adinolfo", coords: [37.34027859074482, 14.574389625226667], type: "Servizi Culturali" },
+    { name: "Palazzo Comunale", coords: [37.26491220242852, 14.691135678657934], type: "Servizi Culturali" },
+    { name: "Ufficio Turistico", coords: [37.264790528928515, 14.690945241818191], type: "Servizi Culturali" },
+
+    // -------------------------------
+    // PRODOTTI TIPICI
+    // -------------------------------
+    { name: "Azienda Agricola Aranceto Rosso", coords: [37.26883617394301, 14.690440651899028], type: "Prodotti Tipici" },
+    { name: "Frantoio Oleario Iblei", coords: [37.28138880871856, 14.681468476706074], type: "Prodotti Tipici" },
+    { name: "Caseificio Mineo", coords: [37.26571727067056, 14.690473396387551], type: "Prodotti Tipici" },
+    { name: "Pasticceria Dolci Siciliani", coords: [37.26569906956432, 14.690842673541525], type: "Prodotti Tipici" },
+    { name: "Salumeria Tradizionale", coords: [37.26523850470764, 14.693172832301105], type: "Prodotti Tipici" },
+
+    // -------------------------------
+    // OSPITALITÀ
+    // -------------------------------
+    { name: "B&B Casa Capuana", coords: [37.26671666434023, 14.690263645795572], type: "Ospitalità" },
+    { name: "Albergo Diffuso Mineo Centro Storico", coords: [37.26628353321865, 14.68880944016056], type: "Ospitalità" },
+    { name: "Agriturismo Borgo degli Iblei", coords: [37.26679737102812, 14.692454611861988], type: "Ospitalità" },
+    { name: "B&B La Terrazza sul Castello", coords: [37.267438201973256, 14.688609196036095], type: "Ospitalità" },
+    { name: "Casa Vacanze Panorama Etna", coords: [37.266063469105, 14.69184442249876], type: "Ospitalità" },
+
+    // -------------------------------
+    // RISTORAZIONE
+    // -------------------------------
+    { name: "Trattoria da Luigi", coords: [37.26428747057269, 14.690900284927109], type: "Ristorazione" },
+    { name: "Ristorante Il Castello", coords: [37.26433870187924, 14.687703091785625], type: "Ristorazione" },
+    { name: "Pizzeria La Fontana", coords: [37.2633909169436, 14.689805943650878], type: "Ristorazione" },
+    { name: "Osteria del Borgo", coords: [37.265132782789884, 14.691104132811898], type: "Ristorazione" },
+    { name: "Ristorante Capuana", coords: [37.26606346909798, 14.690159995239124], type: "Ristorazione" },
+    { name: "Bar Centrale", coords: [37.26349338074867, 14.688089329883118], type: "Ristorazione" },
+    { name: "Caffè Letterario", coords: [37.26446672425929, 14.691511828401236], type: "Ristorazione" },
+    { name: "Gelateria Sicilia", coords: [37.26531197871345, 14.691597658910439], type: "Ristorazione" },
+    { name: "Pasticceria Bar Il Verismo", coords: [37.264286596516136, 14.690236238287463], type: "Ristorazione" },
+
+    // -------------------------------
+    // LUOGHI CAPUANIANI (equivalente Luoghi Verghiani)
+    // -------------------------------
+    { name: "Casa dove nacque Luigi Capuana", coords: [37.266715083265, 14.690873063210999], type: "Luoghi Capuaniani" },
+    { name: "Piazza dove Capuana ambientò 'Il Marchese di Roccaverdina'", coords: [37.26473894531444, 14.689763981004784], type: "Luoghi Capuaniani" },
+    { name: "Palazzo Baronale - Ispirazione per 'La Sfinge'", coords: [37.26900145919647, 14.692417619878162], type: "Luoghi Capuaniani" },
+    { name: "Chiesa citata in 'Profumo'", coords: [37.26561782160434, 14.691242196453912], type: "Luoghi Capuaniani" },
+    { name: "Belvedere - Panorama descritto nelle Novelle", coords: [37.26551401751246, 14.692703482895629], type: "Luoghi Capuaniani" }
+    */
+];
+;
+// js/map/script_mineo.js
+document.addEventListener('DOMContentLoaded', function() {
+    // Inizializza la mappa centrata su Mineo
+    var map = L.map(document.querySelector(".map-container"), { zoomControl: false }).setView([37.26647353811028, 14.69049488989791], 17);
+
+    L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+        maxZoom: 19,
+        attribution: '© OpenStreetMap contributors'
+    }).addTo(map);
+
+    L.control.zoom({ position: 'bottomleft' }).addTo(map);
+
+    // Legge le variabili CSS dal tema corrente
+    const rootStyles = getComputedStyle(document.documentElement);
+    const getColor = (varName) => rootStyles.getPropertyValue(varName).trim();
+
+    // Colori da variabili CSS del tema
+    const colors = {
+        primary: getColor('--color-primary') || '#4A6741',
+        primaryLight: getColor('--color-primary-light') || '#7A9A6F',
+        secondary: getColor('--color-secondary') || '#BF9B30',
+        secondaryDark: getColor('--color-secondary-dark') || '#8B6F15',
+        accent: getColor('--color-accent') || '#A85D3A',
+        success: getColor('--color-success') || '#52A770',
+        info: getColor('--color-info') || '#3D7A6F',
+        warning: getColor('--color-warning') || '#D89020'
+    };
+
+    // Funzione per creare icona marker con Bootstrap Icons
+    function createMarkerIcon(iconClass, bgColor) {
+        return L.divIcon({
+            className: 'custom-marker',
+            html: `<div class="marker-pin" style="background: ${bgColor};">
+                     <i class="bi ${iconClass}"></i>
+                   </div>`,
+            iconSize: [36, 36],
+            iconAnchor: [18, 36],
+            popupAnchor: [0, -36]
+        });
+    }
+
+    // Icone categorie con colori dal tema
+    var categoryIcons = {
+        "Servizi Pubblici": createMarkerIcon("bi-building-fill", colors.info),
+        "Servizi Culturali": createMarkerIcon("bi-bank2", colors.primary),
+        "Prodotti Tipici": createMarkerIcon("bi-basket2-fill", colors.secondaryDark),
+        "Ospitalità": createMarkerIcon("bi-house-heart-fill", colors.accent),
+        "Luoghi Capuaniani": createMarkerIcon("bi-book-fill", colors.secondary),
+        "Ristorazione": createMarkerIcon("bi-cup-hot-fill", colors.warning)
+    };
+
+    var markers = [];
+    var allPointsData = [];
+
+    // Aggiungi marker con link Google Maps
+    mineoPoints.forEach(p => {
+        allPointsData.push(p);
+        if(!p.coords) return;
+
+        // Link Google Maps per il percorso
+        var routeLink = `https://www.google.com/maps/dir/?api=1&destination=${p.coords[0]},${p.coords[1]}`;
+
+        // Marker + popup con link percorso
+        var m = L.marker(p.coords, {icon: categoryIcons[p.type] || categoryIcons["Servizi Pubblici"]})
+                 .bindPopup(`
+                    <strong>${p.name}</strong><br>
+                    ${p.type}<br><br>
+                    <a href="${routeLink}" target="_blank" style="color:#007bff; font-weight:bold;">
+                      ➤ Ottieni percorso
+                    </a>
+                 `);
+
+        m.type = p.type;
+        m.name = p.name;
+        markers.push(m);
+        m.addTo(map);
+    });
+
+    // Filtri con centratura automatica
+    function filterMarkers(type){
+        markers.forEach(m => {
+            if(type === "all" || m.type === type){
+                if(!map.hasLayer(m)) map.addLayer(m);
+            } else {
+                if(map.hasLayer(m)) map.removeLayer(m);
+            }
+        });
+
+        // Centra sui marker visibili
+        var visibleMarkers = markers.filter(m => map.hasLayer(m));
+        if(visibleMarkers.length > 0){
+            var group = new L.featureGroup(visibleMarkers);
+            map.fitBounds(group.getBounds().pad(0.1));
+        }
+    }
+
+    // Gestisci i filtri dal sidebar
+    var filterItems = document.querySelectorAll('.filter-item');
+    filterItems.forEach(function(item) {
+        item.addEventListener('click', function() {
+            // Rimuovi active da tutti
+            filterItems.forEach(function(el) {
+                el.classList.remove('active');
+            });
+            // Aggiungi active al cliccato
+            this.classList.add('active');
+            
+            var filter = this.getAttribute('data-type');
+            filterMarkers(filter);
+        });
+    });
+
+    // Ricerca live
+    const searchBox = document.querySelector(".search-box");
+    const searchResults = document.querySelector(".search-results");
+
+    if(searchBox && searchResults) {
+        searchBox.addEventListener("input", function(){
+            const q = this.value.toLowerCase().trim();
+            searchResults.innerHTML = "";
+            if(q.length < 2){
+                searchResults.style.display = "none";
+                return;
+            }
+
+            const filtered = allPointsData.filter(p => p.name.toLowerCase().includes(q));
+
+            filtered.forEach(p => {
+                const div = document.createElement("div");
+                div.className = "search-result-item";
+                div.textContent = p.name;
+                div.addEventListener("click", function(){
+                    if(p.coords) map.setView(p.coords, 18);
+                    const m = markers.find(m => m.name === p.name);
+                    if(m) m.openPopup();
+
+                    searchBox.value = "";
+                    searchResults.style.display = "none";
+                });
+                searchResults.appendChild(div);
+            });
+
+            searchResults.style.display = filtered.length ? "block" : "none";
+        });
+
+        document.addEventListener("click", function(e){
+            if(!e.target.closest(".search-container")){
+                searchResults.style.display = "none";
+            }
+        });
+    }
+
+    // Click su marker centra e zoom
+    markers.forEach(m => {
+        m.on('click', function(e) {
+            map.setView(e.latlng, 17);
+        });
+    });
+
+    // Fix per rendering della mappa quando diventa visibile
+    setTimeout(function() {
+        map.invalidateSize();
+    }, 100);
+
+    // Observer per quando la sezione mappa diventa visibile
+    var mapSection = document.querySelector('.pages-mappa');
+    if (mapSection) {
+        var observer = new IntersectionObserver(function(entries) {
+            entries.forEach(function(entry) {
+                if (entry.isIntersecting) {
+                    map.invalidateSize();
+                }
+            });
+        }, { threshold: 0.1 });
+        observer.observe(mapSection);
+    }
+});
+;
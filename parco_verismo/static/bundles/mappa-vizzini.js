@@ -0,0 +1,241 @@
+/*! bundle mappa-vizzini b08b9a5c5a5c */
+// js/map/points_vizzini.js
+var vizziniPoints = [
+    /*
+    // -------------------------------
+    // SERVIZI PUBBLICI
+    // -------------------------------
+    { name: "Comune di Vizzini", coords: [37.16129, 14.74876], type: "Servizi Pubblici" },
+    { name: "Carabinieri", coords: [37.16098, 14.74723], type: "Servizi Pubblici" },
+    { name: "Guardia Medica", coords: [37.16215, 14.74934], type: "Servizi Pubblici" },
+    { name: "Farmacia Ferreri", coords: [37.16155, 14.74812], type: "Servizi Pubblici" },
+    { name: "Ufficio Postale", coords: [37.16183, 14.74865], type: "Servizi Pubblici" },
+    { name: "Biblioteca Comunale", coords: [37.16142, 14.74798], type: "Servizi Pubblici" },
+
+    // -------------------------------
+    // SERVIZI CULTURALI
+    // -------------------------------
+    { name: "Casa Natale di Giovanni Verga", coords: [37.16108, 14.74901], type: "Servizi Culturali" },
+    { name: "Centro Studi Verghiani", coords: [37.16095, 14.74885], type: "Servizi Culturali" },
+    { name: "Museo Immaginario Verghiano", coords: [37.16078, 14.74867], type: "Servizi Culturali" },
+    { name: "Palazzo Verga", coords: [37.16122, 14.74912], type: "Servizi Culturali" },
+    { name: "Pro Loco Vizzini", coords: [37.16135, 14.74788], type: "Servizi Culturali" },
+
+    // -------------------------------
+    // PRODOTTI TIPICI
+    // -------------------------------
+    { name: "Caseificio Ferreri - Ricotta Vizzinese", coords: [37.15892, 14.75123], type: "Prodotti Tipici" },
+    { name: "Panificio Ferreri", coords: [37.16168, 14.74832], type: "Prodotti Tipici" },
+    { name: "Macelleria Ferreri", coords: [37.16145, 14.74756], type: "Prodotti Tipici" },
+    { name: "Oleificio Valle degli Iblei", coords: [37.15678, 14.76234], type: "Prodotti Tipici" },
+    { name: "Dolceria Ferreri - Cannoli e Cassate", coords: [37.16112, 14.74845], type: "Prodotti Tipici" },
+
+    // -------------------------------
+    // OSPITALITÀ
+    // -------------------------------
+    { name: "B&B La Casa del Poeta", coords: [37.16089, 14.74923], type: "Ospitalità" },
+    { name: "B&B Al Duomo", coords: [37.16156, 14.74756], type: "Ospitalità" },
+    { name: "Agriturismo Valle Verghiana", coords: [37.14523, 14.75678], type: "Ospitalità" },
+    { name: "Case Vacanza Centro Storico", coords: [37.16102, 14.74867], type: "Ospitalità" },
+    { name: "Albergo diffuso Vizzini", coords: [37.16078, 14.74812], type: "Ospitalità" },
+
+    // -------------------------------
+    // RISTORAZIONE
+    // -------------------------------
+    { name: "Trattoria La Rusticana", coords: [37.16145, 14.74789], type: "Ristorazione" },
+    { name: "Ristorante Il Verghiano", coords: [37.16098, 14.74856], type: "Ristorazione" },
+    { name: "Bar Pasticceria Ferreri", coords: [37.16125, 14.74823], type: "Ristorazione" },
+    { name: "Pizzeria La Scalunata", coords: [37.16178, 14.74734], type: "Ristorazione" },
+    { name: "Trattoria Cavalleria Rusticana", coords: [37.16056, 14.74912], type: "Ristorazione" },
+    { name: "Bar Centrale", coords: [37.16167, 14.74801], type: "Ristorazione" },
+
+    // -------------------------------
+    // LUOGHI VERGHIANI
+    // -------------------------------
+    { name: "Borgo della Cunziria", coords: [37.14892, 14.74423], type: "Luoghi Verghiani" },
+    { name: "Piazza Umberto I - Scalinata del Duomo", coords: [37.16145, 14.74778], type: "Luoghi Verghiani" },
+    { name: "Duomo di San Gregorio Magno", coords: [37.16167, 14.74756], type: "Luoghi Verghiani" },
+    { name: "Basilica di San Giovanni Battista", coords: [37.16023, 14.74912], type: "Luoghi Verghiani" },
+    { name: "Chiesa di Santa Maria di Gesù", coords: [37.15956, 14.75034], type: "Luoghi Verghiani" },
+    { name: "Convento dei Cappuccini", coords: [37.15889, 14.75123], type: "Luoghi Verghiani" },
+    { name: "Chiesa del Rosario", coords: [37.16089, 14.74823], type: "Luoghi Verghiani" },
+    { name: "Luoghi della novella 'La Lupa'", coords: [37.15234, 14.74567], type: "Luoghi Verghiani" },
+    { name: "Set Film Cavalleria Rusticana", coords: [37.14912, 14.74456], type: "Luoghi Verghiani" },
+    { name: "Bosco Granvilla", coords: [37.13456, 14.76789], type: "Luoghi Verghiani" }
+    */
+];
+;
+// js/map/script_vizzini.js
+document.addEventListener("DOMContentLoaded", function() {
+  // Inizializza mappa centrata su Vizzini
+  var map = L.map(document.querySelector(".map-container"), { zoomControl: false }).setView([37.1607, 14.7490], 17);
+
+  L.tileLayer('https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png', {
+    maxZoom: 19,
+    attribution: '© OpenStreetMap contributors'
+  }).addTo(map);
+
+  L.control.zoom({ position: 'bottomleft' }).addTo(map);
+
+  // Legge le variabili CSS dal tema corrente
+  const rootStyles = getComputedStyle(document.documentElement);
+  const getColor = (varName) => rootStyles.getPropertyValue(varName).trim();
+
+  // Funzione per creare icona marker con Bootstrap Icons
+  function createMarkerIcon(iconClass, bgColor) {
+    return L.divIcon({
+      className: 'custom-marker',
+      html: `<div class="marker-pin" style="background: ${bgColor};">
+               <i class="bi ${iconClass}"></i>
+             </div>`,
+      iconSize: [36, 36],
+      iconAnchor: [18, 36],
+      popupAnchor: [0, -36]
+    });
+  }
+
+  // Colori da variabili CSS del tema
+  const colors = {
+    primary: getColor('--color-primary') || '#823228',
+    primaryLight: getColor('--color-primary-light') || '#C76A52',
+    secondary: getColor('--color-secondary') || '#C08C3B',
+    secondaryDark: getColor('--color-secondary-dark') || '#8F6110',
+    accent: getColor('--color-accent') || '#2F6D5C',
+    success: getColor('--color-success') || '#4B9F7C',
+    info: getColor('--color-info') || '#2F6E8C',
+    warning: getColor('--color-warning') || '#D07A00'
+  };
+
+  // Icone categorie con colori dal tema
+  var categoryIcons = {
+    "Servizi Pubblici": createMarkerIcon("bi-building-fill", colors.info),
+    "Servizi Culturali": createMarkerIcon("bi-bank2", colors.primary),
+    "Prodotti Tipici": createMarkerIcon("bi-basket2-fill", colors.secondaryDark),
+    "Ospitalità": createMarkerIcon("bi-house-heart-fill", colors.accent),
+    "Luoghi Verghiani": createMarkerIcon("bi-book-fill", colors.secondary),
+    "Ristorazione": createMarkerIcon("bi-cup-hot-fill", colors.warning)
+  };
+
+  var markers = [];
+  var allPointsData = [];
+
+  // Aggiungi marker
+  vizziniPoints.forEach(p => {
+    allPointsData.push(p);
+    if(!p.coords) return;
+
+    // Link Google Maps per il percorso
+    var routeLink = `https://www.google.com/maps/dir/?api=1&destination=${p.coords[0]},${p.coords[1]}`;
+
+    // Marker + popup con link percorso
+    var m = L.marker(p.coords, {icon: categoryIcons[p.type]})
+             .bindPopup(`
+                <strong>${p.name}</strong><br>
+                ${p.type}<br><br>
+                <a href="${routeLink}" target="_blank" style="color:#007bff; font-weight:bold;">
+                  ➤ Ottieni percorso
+                </a>
+             `);
+
+    m.type = p.type;
+    m.name = p.name;
+    markers.push(m);
+    m.addTo(map);
+  });
+
+  // Filtri con centratura automatica
+  function filterMarkers(type){
+    markers.forEach(m => {
+      if(type === "all" || m.type === type){
+        if(!map.hasLayer(m)) map.addLayer(m);
+      } else {
+        if(map.hasLayer(m)) map.removeLayer(m);
+      }
+    });
+
+    // Centra sui marker visibili
+    var visibleMarkers = markers.filter(m => map.hasLayer(m));
+    if(visibleMarkers.length > 0){
+      var group = new L.featureGroup(visibleMarkers);
+      map.fitBounds(group.getBounds().pad(0.1));
+    }
+  }
+
+  const filterItems = document.querySelectorAll(".filter-item");
+
+  filterItems.forEach(item => {
+    item.addEventListener("click", function(){
+      const type = this.dataset.type;
+      filterMarkers(type);
+
+      filterItems.forEach(i => i.classList.remove("active"));
+      this.classList.add("active");
+    });
+  });
+
+  // Ricerca live
+  const searchBox = document.querySelector(".search-box");
+  const searchResults = document.querySelector(".search-results");
+
+  if(searchBox && searchResults) {
+    searchBox.addEventListener("input", function(){
+      const q = this.value.toLowerCase().trim();
+      searchResults.innerHTML = "";
+      if(q.length < 2){
+        searchResults.style.display = "none";
+        return;
+      }
+
+      const filtered = allPointsData.filter(p => p.name.toLowerCase().includes(q));
+
+      filtered.forEach(p => {
+        const div = document.createElement("div");
+        div.className = "search-result-item";
+        div.textContent = p.name;
+        div.addEventListener("click", function(){
+          if(p.coords) map.setView(p.coords, 18);
+          const m = markers.find(m => m.name === p.name);
+          if(m) m.openPopup();
+
+          searchBox.value = "";
+          searchResults.style.display = "none";
+        });
+        searchResults.appendChild(div);
+      });
+
+      searchResults.style.display = filtered.length ? "block" : "none";
+    });
+
+    document.addEventListener("click", function(e){
+      if(!e.target.closest(".search-container")){
+        searchResults.style.display = "none";
+      }
+    });
+  }
+
+  // Click su marker centra e zoom
+  markers.forEach(m => {
+    m.on('click', function(e) {
+      map.setView(e.latlng, 17);
+    });
+  });
+
+  // Fix per rendering della mappa quando diventa visibile
+  setTimeout(function() {
+    map.invalidateSize();
+  }, 100);
+
+  // Observer per quando la sezione mappa diventa visibile
+  var mapSection = document.querySelector('.pages-mappa');
+  if (mapSection) {
+    var observer = new IntersectionObserver(function(entries) {
+      entries.forEach(function(entry) {
+        if (entry.isIntersecting) {
+          map.invalidateSize();
+        }
+      });
+    }, { threshold: 0.1 });
+    observer.observe(mapSection);
+  }
+});
+;
@@ -0,0 +1,40 @@
+/**
+ * Pulsante "Carica altri" delle liste paginate con cursore
+ * (vedi parco_verismo/components/carica_altri.html).
+ *
+ * Chiede alla stessa pagina il frammento con gli elementi successivi
+ * (?parziale=1) e lo mette al posto del pulsante; il frammento contiene
+ * a sua volta il pulsante per la pagina dopo. In caso di errore il link
+ * viene aperto normalmente.
+ */
+(function () {
+    'use strict';
+
+    document.addEventListener('click', function (e) {
+        const link = e.target.closest('[data-carica-altri]');
+        if (!link || link.classList.contains('disabled')) return;
+        e.preventDefault();
+
+        const contenitore = link.closest('.carica-altri');
+        const url = new URL(link.href, window.location.href);
+        url.searchParams.set('parziale', '1');
+        link.classList.add('disabled');
+        link.setAttribute('aria-disabled', 'true');
+
+        fetch(url, { credentials: 'same-origin' })
+            .then(function (response) {
+                if (!response.ok) throw new Error(response.status);
+                return response.text();
+            })
+            .then(function (html) {
+                const template = document.createElement('template');
+                template.innerHTML = html;
+                const parent = contenitore.parentNode;
+                contenitore.replaceWith(template.content);
+                parent.dispatchEvent(new CustomEvent('carica-altri:caricati', { bubbles: true }));
+            })
+            .catch(function () {
+                window.location.href = link.href;
+            });
+    });
+})();
@@ -190,7 +190,7 @@
         Object.keys(percorsi).forEach(key => {
             const percorso = percorsi[key];
             
-            const routeLine = L.polyline(percorso.coords, {
+            const routeLine = L.polyline(getPercorsoCoords(percorso), {
                 color: '#4A6741',
                 weight: 4,
                 opacity: 0.8,
@@ -0,0 +1,48 @@
+// ================================================
+// DECODIFICA ENCODED POLYLINE (formato Google)
+// I percorsi pre-calcolati arrivano compressi dal server
+// (vedi parco_verismo/utils/polyline.py)
+// ================================================
+
+(function() {
+    'use strict';
+
+    function decodePolyline(encoded, precision) {
+        const factor = Math.pow(10, precision || 5);
+        const points = [];
+        let index = 0;
+        let lat = 0;
+        let lng = 0;
+
+        while (index < encoded.length) {
+            const delta = [0, 0];
+            for (let i = 0; i < 2; i++) {
+                let shift = 0;
+                let result = 0;
+                let byte;
+                do {
+                    byte = encoded.charCodeAt(index++) - 63;
+                    result |= (byte & 0x1f) << shift;
+                    shift += 5;
+                } while (byte >= 0x20);
+                delta[i] = (result & 1) ? ~(result >> 1) : (result >> 1);
+            }
+            lat += delta[0];
+            lng += delta[1];
+            points.push([lat / factor, lng / factor]);
+        }
+        return points;
+    }
+
+    // Restituisce le coordinate di un percorso (formato compresso o vecchio formato).
+    // Un percorso senza punti ha polyline "" (falsy): va decodificato comunque
+    function getPercorsoCoords(percorso) {
+        if (typeof percorso.polyline === 'string') {
+            return decodePolyline(percorso.polyline);
+        }
+        return percorso.coords || [];
+    }
+
+    window.decodePolyline = decodePolyline;
+    window.getPercorsoCoords = getPercorsoCoords;
+})();
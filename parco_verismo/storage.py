@@ -0,0 +1,26 @@
+"""
+Storage dei file statici per la produzione.
+"""
+
+# Third-party imports
+from whitenoise.storage import CompressedManifestStaticFilesStorage
+
+
+class StaticiManifestStorage(CompressedManifestStaticFilesStorage):
+    """
+    Statici con hash nel nome e versioni .gz/.br generate da collectstatic.
+
+    Un {% static %} verso un file che non è nel manifest non fa fallire la
+    pagina con un errore 500: l'URL resta senza hash (verifica_statici lo
+    segnala). collectstatic invece resta rigoroso sui riferimenti nei CSS.
+    """
+
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            return name
+
+    def nel_manifest(self, name):
+        """True se il file ha una versione con hash nel manifest."""
+        return self.hash_key(self.clean_name(name)) in self.hashed_files
@@ -0,0 +1,120 @@
+"""
+Lavori eseguiti in background dal worker (vedi services/job_queue.py).
+
+Avvio del worker:
+    python manage.py run_worker --concurrency 2
+"""
+
+# Standard library imports
+import logging
+import posixpath
+
+# Django imports
+from django.apps import apps
+
+# Local imports
+from .services import email_service, export_service, routing_service, sitemap_service
+from .services.job_queue import task
+from .utils.image_optimizer import optimize_image
+from .utils.page_cache import bump_generation
+from .utils.renditions import genera_rendition, get_manifest
+
+logger = logging.getLogger(__name__)
+
+
+def _get_richiesta(richiesta_id):
+    from .models import Richiesta
+
+    return Richiesta.objects.filter(pk=richiesta_id).first()
+
+
+# Email: un lavoro interrotto con il worker viene ritentato dopo pochi minuti
+@task("email.richiesta_confermata", timeout=120)
+def email_richiesta_confermata(richiesta_id):
+    richiesta = _get_richiesta(richiesta_id)
+    if richiesta and not email_service.invia_email_richiesta_confermata(richiesta):
+        raise RuntimeError(f"Invio conferma fallito per richiesta {richiesta_id}")
+
+
+@task("email.notifica_admin", timeout=120)
+def email_notifica_admin(richiesta_id):
+    richiesta = _get_richiesta(richiesta_id)
+    if richiesta and not email_service.invia_notifica_admin_nuova_richiesta(richiesta):
+        raise RuntimeError(f"Invio notifica fallito per richiesta {richiesta_id}")
+
+
+@task("email.notifica_contatto", timeout=120)
+def email_notifica_contatto(richiesta_id, url_dashboard):
+    richiesta = _get_richiesta(richiesta_id)
+    if richiesta and not email_service.invia_notifica_contatto(richiesta, url_dashboard):
+        raise RuntimeError(f"Invio notifica contatto fallito per richiesta {richiesta_id}")
+
+
+@task("richieste.esporta_csv")
+def esporta_richieste_csv(selezione, righe, nome, email, url):
+    """Scrive il CSV di una selezione grande dall'admin e avvisa l'operatore."""
+    from .admin_richieste import queryset_selezione
+
+    # Se a fallire è stata l'email, il file scritto al tentativo precedente resta valido
+    if export_service.file_esportazione(nome) is None:
+        export_service.scrivi_esportazione(queryset_selezione(**selezione), nome)
+    if email and not email_service.invia_esportazione_pronta(email, url, righe):
+        raise RuntimeError(f"Invio avviso esportazione {nome} fallito")
+
+
+@task("immagini.ottimizza")
+def ottimizza_immagine(modello, pk, campo, nome):
+    """
+    Converte in WebP l'immagine appena caricata e sostituisce il file originale.
+
+    Il salvataggio finale fa partire i segnali (cache pagine, mappe,
+    rendition) come un normale salvataggio dall'admin.
+    """
+    istanza = apps.get_model("parco_verismo", modello).objects.filter(pk=pk).first()
+    if istanza is None:
+        return
+    field_file = getattr(istanza, campo)
+    if field_file.name != nome:
+        # Immagine sostituita nel frattempo: se ne occupa il lavoro successivo
+        return
+
+    try:
+        ottimizzata = optimize_image(field_file)
+    except ValueError as e:
+        # Oltre IMAGE_MAX_PIXELS: riprovare non servirebbe, resta l'originale
+        logger.warning("Immagine %s non ottimizzata: %s", nome, e)
+        return
+    with ottimizzata:
+        field_file.save(posixpath.basename(ottimizzata.name), ottimizzata, save=False)
+    istanza._ottimizzazione_in_corso = True
+    campi = [campo]
+    if any(f.name == "updated_at" for f in istanza._meta.concrete_fields):
+        # auto_now viene salvato solo se compare in update_fields
+        campi.append("updated_at")
+    istanza.save(update_fields=campi)
+
+    if field_file.name != nome:
+        field_file.storage.delete(nome)
+
+
+@task("immagini.rendition")
+def genera_rendition_immagine(nome):
+    if get_manifest(nome) is not None:
+        return
+    genera_rendition(nome)
+    # Le pagine in cache sono state generate senza srcset per questa immagine
+    bump_generation()
+
+
+@task("itinerari.calcola_percorsi")
+def calcola_percorsi_itinerario(itinerario_id):
+    from .models import Itinerario
+
+    itinerario = Itinerario.objects.filter(pk=itinerario_id).first()
+    if itinerario is not None:
+        routing_service.aggiorna_percorsi_itinerario(itinerario)
+
+
+@task("sitemap.aggiorna")
+def aggiorna_sitemap(sezione):
+    sitemap_service.aggiorna_sezione(sezione)
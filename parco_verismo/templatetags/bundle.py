@@ -0,0 +1,62 @@
+"""
+Template tag per i bundle CSS/JS (vedi utils/bundle.py).
+
+Con ASSET_BUNDLES (produzione) ogni bundle è un solo file: il CSS critico
+è inserito inline nel <head> e il resto viene caricato senza bloccare la
+prima visualizzazione. In sviluppo i file sorgente sono inclusi uno per
+uno, come prima, senza bisogno di rigenerare i bundle.
+
+Uso:
+    {% load bundle %}
+    {% bundle_css "base" %}
+    {% bundle_js "itinerari-verghiani" %}
+"""
+
+# Django imports
+from django import template
+from django.conf import settings
+from django.templatetags.static import static
+from django.utils.html import format_html, format_html_join
+from django.utils.safestring import mark_safe
+
+# Local imports
+from ..utils.bundle import file_bundle, get_bundles, get_css_critico, percorso_bundle
+
+register = template.Library()
+
+
+def _file(tipo, nome):
+    try:
+        return file_bundle(tipo, nome)
+    except KeyError:
+        raise template.TemplateSyntaxError(f"Bundle {tipo} inesistente: {nome}")
+
+
+@register.simple_tag
+def bundle_css(nome):
+    """Fogli di stile del bundle (con il CSS critico inline, se definito)."""
+    file = _file("css", nome)
+    if not settings.ASSET_BUNDLES:
+        return format_html_join("\n", '<link rel="stylesheet" href="{}">', ((static(f),) for f in file))
+
+    url = static(percorso_bundle("css", nome))
+    if "critico" not in get_bundles()["css"][nome]:
+        return format_html('<link rel="stylesheet" href="{}">', url)
+    # Il resto del CSS arriva senza bloccare il rendering (noscript: senza JS)
+    return format_html(
+        "<style>{}</style>\n"
+        '<link rel="preload" href="{}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        '<noscript><link rel="stylesheet" href="{}"></noscript>',
+        mark_safe(get_css_critico(nome)),
+        url,
+        url,
+    )
+
+
+@register.simple_tag
+def bundle_js(nome):
+    """Script del bundle, nell'ordine definito in bundles.json."""
+    file = _file("js", nome)
+    if not settings.ASSET_BUNDLES:
+        return format_html_join("\n", '<script src="{}"></script>', ((static(f),) for f in file))
+    return format_html('<script src="{}"></script>', static(percorso_bundle("js", nome)))
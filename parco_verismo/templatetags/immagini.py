@@ -0,0 +1,58 @@
+"""
+Template tag per le immagini responsive (vedi utils/renditions.py e, per le
+immagini statiche, utils/immagini_statiche.py).
+
+Uso:
+    {% load immagini %}
+    <img src="{{ opera.copertina.url }}" {% srcset opera.copertina "(min-width: 992px) 33vw, 100vw" %} alt="...">
+    <img src="{% rendition_url foto.immagine 320 %}" alt="...">
+    <img src="{% static 'assets/img/loghi/x.png' %}" {% srcset_statico 'assets/img/loghi/x.png' "160px" %} alt="...">
+    <picture>
+        {% sorgenti_statiche 'assets/img/vizzini/borgo.jpg' "(min-width: 992px) 50vw, 100vw" %}
+        <img src="{% static 'assets/img/vizzini/borgo.jpg' %}" alt="...">
+    </picture>
+"""
+
+# Django imports
+from django import template
+from django.utils.html import format_html, format_html_join
+
+# Local imports
+from ..utils.immagini_statiche import get_sorgenti_statiche, get_srcset_statico
+from ..utils.renditions import get_srcset, get_url_rendition
+
+register = template.Library()
+
+
+@register.simple_tag
+def srcset(field_file, sizes="100vw", formato=None):
+    """Attributi srcset e sizes per un <img>, vuoti se le rendition non sono pronte."""
+    valore = get_srcset(field_file, formato)
+    if not valore:
+        return ""
+    return format_html('srcset="{}" sizes="{}"', valore, sizes)
+
+
+@register.simple_tag
+def rendition_url(field_file, larghezza, formato=None):
+    """URL della variante larga almeno `larghezza` pixel (o dell'originale)."""
+    return get_url_rendition(field_file, int(larghezza), formato)
+
+
+@register.simple_tag
+def srcset_statico(percorso, sizes="100vw", formato="webp"):
+    """Attributi srcset e sizes per un'immagine statica, vuoti senza ottimizza_statici."""
+    valore = get_srcset_statico(percorso, formato)
+    if not valore:
+        return ""
+    return format_html('srcset="{}" sizes="{}"', valore, sizes)
+
+
+@register.simple_tag
+def sorgenti_statiche(percorso, sizes="100vw"):
+    """<source> AVIF/WebP di un'immagine statica, da mettere in un <picture> prima dell'<img>."""
+    return format_html_join(
+        "\n",
+        '<source type="{}" srcset="{}" sizes="{}">',
+        ((tipo, valore, sizes) for tipo, valore in get_sorgenti_statiche(percorso)),
+    )
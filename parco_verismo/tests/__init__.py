@@ -0,0 +1,3 @@
+"""
+Test del Parco Letterario Giovanni Verga e Luigi Capuana.
+"""
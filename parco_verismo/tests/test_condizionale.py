@@ -0,0 +1,56 @@
+"""
+GET condizionali delle pagine dei contenuti (utils/condizionale.py): le liste
+hanno solo l'ETag, le pagine di un oggetto anche Last-Modified.
+"""
+
+# Django imports
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import translation
+
+# Local imports
+from parco_verismo.models import Documento
+
+
+def crea_documento(titolo):
+    documento = Documento(pdf_file="verifica/documento.pdf")
+    documento.set_current_language("it")
+    documento.titolo = titolo
+    documento.save()
+    return documento
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class CondizionaleTest(TestCase):
+    def setUp(self):
+        self.primo = crea_documento("Primo")
+        self.ultimo = crea_documento("Ultimo")
+        with translation.override("it"):
+            self.lista = reverse("documenti")
+            self.dettaglio = reverse("documento_detail", args=[self.primo.slug])
+        # L'ETag dipende dal cookie CSRF, impostato dalla prima risposta
+        self._get(self.lista)
+
+    def _get(self, url, **intestazioni):
+        return self.client.get(url, secure=True, HTTP_ACCEPT_LANGUAGE="it", **intestazioni)
+
+    def test_lista_solo_etag(self):
+        response = self._get(self.lista)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header("Last-Modified"))
+        self.assertEqual(self._get(self.lista, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 304)
+
+    def test_lista_dopo_eliminazione_ultimo_modificato(self):
+        etag = self._get(self.lista)["ETag"]
+        self.ultimo.delete()
+
+        response = self._get(self.lista, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_dettaglio_last_modified(self):
+        response = self._get(self.dettaglio)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.has_header("Last-Modified"))
+        risposta_304 = self._get(self.dettaglio, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(risposta_304.status_code, 304)
@@ -0,0 +1,78 @@
+"""
+File serviti alla radice del sito (utils/file_radice.py, views/seo.py):
+intestazioni di cache, risposte condizionali, versione gzip e security.txt.
+"""
+
+# Standard library imports
+import datetime
+import gzip
+from email.utils import parseaddr
+from unittest import mock
+
+# Django imports
+from django.conf import settings
+from django.test import SimpleTestCase
+from django.utils import timezone
+
+# Local imports
+from parco_verismo.utils.file_radice import FILE_RADICE, get_file_radice
+
+
+class FileRadiceTest(SimpleTestCase):
+    def setUp(self):
+        # I file restano in memoria per tutto il processo
+        get_file_radice.cache_clear()
+        self.addCleanup(get_file_radice.cache_clear)
+
+    def _get(self, nome, **intestazioni):
+        return self.client.get(f"/{nome}", secure=True, **intestazioni)
+
+    def test_intestazioni(self):
+        for nome, (_, content_type, max_age) in FILE_RADICE.items():
+            with self.subTest(nome=nome):
+                response = self._get(nome)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response["Content-Type"], content_type)
+                self.assertTrue(response.has_header("ETag"))
+                self.assertTrue(response.has_header("Last-Modified"))
+                self.assertIn(f"max-age={max_age}", response["Cache-Control"])
+
+    def test_etag_corrente_304(self):
+        for nome in FILE_RADICE:
+            with self.subTest(nome=nome):
+                etag = self._get(nome)["ETag"]
+                response = self._get(nome, HTTP_IF_NONE_MATCH=etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response["ETag"], etag)
+
+    def test_gzip(self):
+        nomi = [nome for nome in FILE_RADICE if get_file_radice(nome).compresso is not None]
+        self.assertIn("robots.txt", nomi)
+        for nome in nomi:
+            with self.subTest(nome=nome):
+                semplice = self._get(nome)
+                compresso = self._get(nome, HTTP_ACCEPT_ENCODING="gzip, deflate")
+                self.assertEqual(compresso.status_code, 200)
+                self.assertEqual(compresso["Content-Encoding"], "gzip")
+                self.assertIn("Accept-Encoding", compresso["Vary"])
+                self.assertIn("Accept-Encoding", semplice["Vary"])
+                self.assertNotEqual(compresso["ETag"], semplice["ETag"])
+                self.assertEqual(gzip.decompress(compresso.content), semplice.content)
+
+    def test_file_static_mancante(self):
+        with mock.patch("parco_verismo.utils.file_radice.finders.find", return_value=None):
+            response = self._get("robots.txt")
+        self.assertEqual(response.status_code, 404)
+
+    def test_security_txt(self):
+        response = self._get(".well-known/security.txt")
+        righe = dict(riga.split(": ", 1) for riga in response.content.decode().splitlines())
+
+        self.assertEqual(righe["Contact"], f"mailto:{parseaddr(settings.SECURITY_CONTACT)[1]}")
+        scadenza = datetime.datetime.strptime(righe["Expires"], "%Y-%m-%dT%H:%M:%SZ").replace(
+            tzinfo=datetime.timezone.utc
+        )
+        oggi = timezone.now().astimezone(datetime.timezone.utc).date()
+        self.assertEqual(scadenza.time(), datetime.time(0, 0))
+        self.assertEqual(scadenza.date(), oggi + datetime.timedelta(days=365))
@@ -0,0 +1,106 @@
+"""
+Le pagine con liste eseguono un numero di query costante, indipendente dal
+numero di oggetti mostrati (niente N+1 sulle traduzioni di parler).
+
+Per ogni pagina conta le query con RIGHE oggetti per modello, poi con il
+doppio: i due conteggi devono coincidere.
+"""
+
+# Standard library imports
+import itertools
+from datetime import timedelta
+
+# Django imports
+from django.apps import apps
+from django.db import connection, models
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone, translation
+
+# Third-party imports
+from parler import appsettings as parler_appsettings
+
+# Pagina -> modelli mostrati nella lista
+PAGINE = {
+    "home": ("Evento", "Notizia"),
+    "eventi": ("Evento", "Notizia"),
+    "notizie": ("Evento", "Notizia"),
+    "biblioteca": ("Opera",),
+    "documenti": ("Documento",),
+    "verga_capuana_fotografi": ("FotoArchivio",),
+    "menu_del_verismo": ("Ristorante",),
+}
+
+# Oggetti aggiunti per modello a ogni conteggio
+RIGHE = 5
+
+# Immagine fittizia (stesso nome per tutti gli oggetti creati)
+SEGNAPOSTO = "verifica/segnaposto.webp"
+
+LINGUA = "it"
+
+
+def crea_oggetti(nome_modello, righe):
+    """Crea `righe` oggetti del modello, tradotti in italiano e in inglese."""
+    modello = apps.get_model("parco_verismo", nome_modello)
+    valori = {
+        "Evento": lambda i: {"data_inizio": timezone.now() + timedelta(days=i + 1)},
+        "Documento": lambda i: {"pdf_file": "verifica/documento.pdf"},
+        "FotoArchivio": lambda i: {"immagine": SEGNAPOSTO, "autore": ("VERGA", "CAPUANA")[i % 2]},
+        "Opera": lambda i: {
+            "autore": apps.get_model("parco_verismo", "Autore").objects.get_or_create(
+                nome="Autore verifica query"
+            )[0],
+            "link_fonte": "https://example.org/",
+        },
+        "Ristorante": lambda i: {"numeri": "000", "menu": SEGNAPOSTO, "luogo": "mineo"},
+    }.get(nome_modello, lambda i: {})
+
+    campi_tradotti = [
+        f.name
+        for f in modello._parler_meta.root_model._meta.concrete_fields
+        if isinstance(f, (models.CharField, models.TextField)) and f.name != "language_code"
+    ]
+    for i in range(righe):
+        oggetto = modello(**valori(i))
+        for lingua in ("it", "en"):
+            oggetto.set_current_language(lingua)
+            for campo in campi_tradotti:
+                setattr(oggetto, campo, f"Verifica {i}")
+        oggetto.save()
+
+
+@override_settings(PAGE_CACHE_ENABLED=False)
+class QueryListeTest(TestCase):
+    def setUp(self):
+        # Con la cache di parler le query N+1 diventerebbero letture dalla cache
+        caching = parler_appsettings.PARLER_ENABLE_CACHING
+        parler_appsettings.PARLER_ENABLE_CACHING = False
+        self.addCleanup(setattr, parler_appsettings, "PARLER_ENABLE_CACHING", caching)
+        self.client.defaults["HTTP_ACCEPT_LANGUAGE"] = LINGUA
+        self.ip = itertools.count()
+
+    def _get(self, url):
+        # Un IP diverso per ogni richiesta, per non incorrere nel rate limiting
+        return self.client.get(url, secure=True, REMOTE_ADDR=f"198.18.0.{next(self.ip) % 250 + 1}")
+
+    def _conta_query(self, url):
+        # La prima richiesta riempie le cache che non dipendono dagli oggetti
+        self._get(url)
+        with CaptureQueriesContext(connection) as query:
+            response = self._get(url)
+        self.assertEqual(response.status_code, 200, url)
+        return len(query)
+
+    def test_query_costanti(self):
+        for nome, modelli in PAGINE.items():
+            with self.subTest(pagina=nome), translation.override(LINGUA):
+                url = reverse(nome)
+                conteggi = []
+                for _ in range(2):
+                    for modello in modelli:
+                        crea_oggetti(modello, RIGHE)
+                    conteggi.append(self._conta_query(url))
+                prima, dopo = conteggi
+                self.assertEqual(dopo, prima, f"{url}: {prima} → {dopo} query con {RIGHE} oggetti in più")
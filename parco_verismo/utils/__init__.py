@@ -17,6 +17,19 @@ from .decorators import (
 from .mixins import (
     FormSuccessMessageMixin,
     ActiveOnlyMixin,
+    ValoriOriginaliMixin,
+    SlugUnicoMixin,
+)
+
+from .paginazione import (
+    Pagina,
+    pagina_keyset,
+    pagina_offset,
+)
+
+from .ratelimit import (
+    RateLimiter,
+    get_rate_limiter,
 )
 
 __all__ = [
@@ -31,4 +44,13 @@ __all__ = [
     # Mixins
     "FormSuccessMessageMixin",
     "ActiveOnlyMixin",
+    "ValoriOriginaliMixin",
+    "SlugUnicoMixin",
+    # Paginazione
+    "Pagina",
+    "pagina_keyset",
+    "pagina_offset",
+    # Rate limiting
+    "RateLimiter",
+    "get_rate_limiter",
 ]
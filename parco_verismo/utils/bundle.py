@@ -0,0 +1,69 @@
+"""
+Bundle CSS/JS definiti in parco_verismo/bundles.json e generati da
+`npm run bundle` (scripts/bundle-assets.js) in static/bundles/.
+
+Ogni bundle inizia con l'impronta dei file sorgente: se un sorgente cambia
+senza rigenerare i bundle, verifica_statici lo segnala.
+"""
+
+# Standard library imports
+import functools
+import hashlib
+import json
+import re
+from pathlib import Path
+
+# Django imports
+from django.contrib.staticfiles import finders
+
+CONFIGURAZIONE = Path(__file__).resolve().parent.parent / "bundles.json"
+
+INTESTAZIONE_RE = re.compile(r"/\*! bundle (\S+) ([0-9a-f]{12}) \*/\n?")
+
+
+@functools.lru_cache(maxsize=None)
+def get_bundles():
+    """Definizione dei bundle: {"css": {nome: {...}}, "js": {nome: [...]}}."""
+    with open(CONFIGURAZIONE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def file_bundle(tipo, nome):
+    """File sorgente (relativi agli statici) del bundle, KeyError se non esiste."""
+    definizione = get_bundles()[tipo][nome]
+    return definizione["file"] if tipo == "css" else definizione
+
+
+def percorso_bundle(tipo, nome, critico=False):
+    """Percorso del bundle tra gli statici, es. bundles/base.critico.css."""
+    return f"bundles/{nome}{'.critico' if critico else ''}.{tipo}"
+
+
+def impronta(file):
+    """Impronta dei sorgenti (stesso calcolo di scripts/bundle-assets.js)."""
+    hash = hashlib.sha1()
+    for nome in file:
+        percorso = finders.find(nome)
+        if percorso is None:
+            raise FileNotFoundError(nome)
+        hash.update(f"{nome}\0".encode())
+        with open(percorso, "rb") as f:
+            hash.update(f.read())
+    return hash.hexdigest()[:12]
+
+
+def impronta_bundle(percorso):
+    """Impronta scritta nell'intestazione di un bundle generato (o None)."""
+    trovato = finders.find(percorso)
+    if trovato is None:
+        return None
+    with open(trovato, encoding="utf-8") as f:
+        match = INTESTAZIONE_RE.search(f.read(200))
+    return match.group(2) if match else None
+
+
+@functools.lru_cache(maxsize=None)
+def get_css_critico(nome):
+    """CSS critico del bundle, letto una volta per processo."""
+    with open(finders.find(percorso_bundle("css", nome, critico=True)), encoding="utf-8") as f:
+        return INTESTAZIONE_RE.sub("", f.read(), count=1).strip()
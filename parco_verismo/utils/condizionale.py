@@ -0,0 +1,172 @@
+"""
+GET condizionali (ETag/Last-Modified) per le pagine dei contenuti.
+
+Una funzione "stato" ricava con una sola query leggera la data di ultima
+modifica dei contenuti mostrati da una view; se il browser o il crawler ha
+già la versione corrente la view non viene eseguita e la risposta è un 304.
+
+Le pagine con liste (stato_lista) hanno solo l'ETag: la data più recente di
+una lista torna indietro quando l'oggetto modificato per ultimo viene
+eliminato o disattivato, e un Last-Modified più vecchio di quello già
+inviato farebbe rispondere 304 con la pagina superata.
+
+L'ETag include anche:
+- la versione dei template (cambia a ogni deploy)
+- la lingua
+- se l'utente è autenticato
+- il cookie CSRF: le pagine contengono form con il token, che deve restare
+  valido per il visitatore
+
+Uso:
+    @condizionale(lambda request, slug: stato_oggetto(Evento.objects.filter(slug=slug)))
+    def evento_detail_view(request, slug): ...
+"""
+
+# Standard library imports
+import datetime
+import functools
+import hashlib
+import os
+from collections import namedtuple
+from pathlib import Path
+
+# Django imports
+from django.apps import apps
+from django.conf import settings
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+
+@functools.lru_cache(maxsize=None)
+def versione_template():
+    """
+    Impronta e data dell'ultima modifica dei template e del manifest degli
+    statici, calcolate una volta per processo (un deploy riavvia i processi).
+    """
+    cartelle = [Path(d) for config in settings.TEMPLATES for d in config.get("DIRS", [])]
+    cartelle += [Path(config.path) / "templates" for config in apps.get_app_configs()]
+    file = []
+    for cartella in cartelle:
+        for radice, _dirs, nomi in os.walk(cartella):
+            file += [Path(radice) / nome for nome in nomi]
+    if settings.STATIC_ROOT:
+        file.append(Path(settings.STATIC_ROOT) / "staticfiles.json")
+
+    impronta = hashlib.md5()
+    ultima_modifica = 0
+    for percorso in sorted(file):
+        try:
+            info = percorso.stat()
+        except OSError:
+            continue
+        impronta.update(f"{percorso}:{info.st_mtime_ns}:{info.st_size}".encode())
+        ultima_modifica = max(ultima_modifica, info.st_mtime)
+    data = datetime.datetime.fromtimestamp(ultima_modifica, tz=datetime.timezone.utc)
+    return impronta.hexdigest(), data
+
+
+# Stato di una lista: non ha una data di ultima modifica affidabile
+StatoLista = namedtuple("StatoLista", ["ultima_modifica", "numero"])
+
+
+def stato_oggetto(queryset):
+    """
+    Stato della pagina di un oggetto: (updated_at, pk) con una query
+    sull'indice, oppure None se l'oggetto non esiste (la view darà 404).
+    """
+    return queryset.order_by().values_list("updated_at", "pk").first()
+
+
+def stato_lista(queryset):
+    """
+    Stato di una lista: (ultima modifica, numero di oggetti) con una query
+    aggregata. Il numero cambia anche quando un oggetto viene eliminato.
+    """
+    dati = queryset.order_by().aggregate(ultima_modifica=Max("updated_at"), numero=Count("pk"))
+    return StatoLista(dati["ultima_modifica"], dati["numero"])
+
+
+def etag_visitatore(request, etag_contenuti):
+    """
+    ETag per il visitatore corrente a partire da quello dei contenuti. Usato
+    anche dalla cache pagine, che serve la stessa pagina a visitatori diversi.
+    """
+    parti = (
+        etag_contenuti,
+        getattr(request, "LANGUAGE_CODE", ""),
+        request.user.is_authenticated if hasattr(request, "user") else False,
+        request.COOKIES.get(settings.CSRF_COOKIE_NAME, ""),
+    )
+    return hashlib.md5(repr(parti).encode()).hexdigest()
+
+
+def _etag(request, stato):
+    etag_contenuti = hashlib.md5(repr((versione_template()[0], stato)).encode()).hexdigest()
+    # Letto dalla cache pagine (vedi utils/page_cache.py)
+    request.etag_contenuti = etag_contenuti
+    return etag_visitatore(request, etag_contenuti)
+
+
+def _ultima_modifica(stato):
+    """
+    La data più recente tra quelle nello stato e quella dei template, None
+    (niente Last-Modified) se lo stato contiene una lista.
+    """
+    date = [versione_template()[1]]
+    liste = []
+
+    def raccogli(valore):
+        if isinstance(valore, StatoLista):
+            liste.append(valore)
+        elif isinstance(valore, datetime.datetime):
+            date.append(valore if timezone.is_aware(valore) else timezone.make_aware(valore))
+        elif isinstance(valore, (tuple, list)):
+            for elemento in valore:
+                raccogli(elemento)
+
+    raccogli(stato)
+    return None if liste else max(date)
+
+
+def condizionale(stato_func):
+    """
+    Decoratore per le view GET dei contenuti: imposta ETag e Last-Modified e
+    risponde 304 se la pagina non è cambiata, senza eseguire la view.
+
+    stato_func(request, *args, **kwargs) riceve gli stessi argomenti della
+    view e restituisce lo stato dei contenuti (una tupla qualsiasi con le date
+    di modifica, vedi stato_oggetto e stato_lista) oppure None per lasciar
+    rispondere la view (es. 404).
+    """
+
+    def decorator(view_func):
+        def stato(request, *args, **kwargs):
+            # Calcolato una sola volta per ETag e Last-Modified
+            if not hasattr(request, "_stato_condizionale"):
+                request._stato_condizionale = stato_func(request, *args, **kwargs)
+            return request._stato_condizionale
+
+        def etag(request, *args, **kwargs):
+            valore = stato(request, *args, **kwargs)
+            return None if valore is None else _etag(request, valore)
+
+        def last_modified(request, *args, **kwargs):
+            valore = stato(request, *args, **kwargs)
+            return None if valore is None else _ultima_modifica(valore)
+
+        view_condizionale = condition(etag_func=etag, last_modified_func=last_modified)(view_func)
+
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            response = view_condizionale(request, *args, **kwargs)
+            if response.has_header("ETag") and not response.has_header("Cache-Control"):
+                # Senza Cache-Control il browser, avendo Last-Modified, potrebbe
+                # riusare la pagina senza chiedere: così la riconvalida ogni volta
+                patch_cache_control(response, no_cache=True)
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,130 @@
+"""
+File serviti alla radice del sito (robots.txt, favicon.ico, security.txt, ...).
+
+Sono tra gli URL più richiesti (crawler, browser a ogni visita) e non
+cambiano tra un deploy e l'altro: vengono letti una sola volta per processo
+e tenuti in memoria insieme alla versione compressa e all'ETag, così ogni
+richiesta non apre file e, se il client ha già la versione corrente,
+riceve un 304.
+
+I file si trovano nelle cartelle static (cercati con gli static finders);
+security.txt è generato con il contatto e la scadenza richiesti dal
+formato (RFC 9116).
+
+Uso:
+    file = get_file_radice("robots.txt")
+    file.contenuto, file.compresso, file.etag
+"""
+
+# Standard library imports
+import datetime
+import functools
+import gzip
+import hashlib
+import json
+import os
+from email.utils import parseaddr
+
+# Django imports
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.templatetags.static import static
+from django.utils import timezone
+
+UN_GIORNO = 60 * 60 * 24
+
+# URL -> (file negli static o None se generato, content type, durata della cache)
+FILE_RADICE = {
+    "robots.txt": ("robots.txt", "text/plain; charset=utf-8", UN_GIORNO),
+    "favicon.ico": ("favicon.ico", "image/x-icon", 30 * UN_GIORNO),
+    "site.webmanifest": ("site.webmanifest", "application/manifest+json", 7 * UN_GIORNO),
+    # Verifica della proprietà del sito in Google Search Console
+    "googlebff3b6f1bd148bc7.html": (
+        "googlebff3b6f1bd148bc7.html",
+        "text/html; charset=utf-8",
+        UN_GIORNO,
+    ),
+    ".well-known/security.txt": (None, "text/plain; charset=utf-8", UN_GIORNO),
+}
+
+# Sotto questa dimensione la compressione non conviene
+COMPRESSIONE_MIN_BYTE = 256
+# La versione gzip si tiene solo se risparmia almeno il 10%
+COMPRESSIONE_MAX_RAPPORTO = 0.9
+
+
+class FileRadice:
+    """Contenuto di un file in memoria, con la versione gzip se conviene."""
+
+    def __init__(self, contenuto, content_type, max_age, ultima_modifica):
+        self.contenuto = contenuto
+        self.content_type = content_type
+        self.max_age = max_age
+        self.ultima_modifica = ultima_modifica
+        self.etag = hashlib.md5(contenuto).hexdigest()
+        self.compresso = None
+        if len(contenuto) >= COMPRESSIONE_MIN_BYTE:
+            compresso = gzip.compress(contenuto, compresslevel=9, mtime=0)
+            if len(compresso) <= len(contenuto) * COMPRESSIONE_MAX_RAPPORTO:
+                self.compresso = compresso
+
+
+def _security_txt(oggi):
+    """security.txt con scadenza a un anno (ricalcolata a ogni avvio)."""
+    scadenza = oggi + datetime.timedelta(days=365)
+    righe = [
+        # parseaddr: il default è DEFAULT_FROM_EMAIL, anche nella forma "Nome <email>"
+        f"Contact: mailto:{parseaddr(settings.SECURITY_CONTACT)[1]}",
+        f"Expires: {scadenza.strftime('%Y-%m-%dT%H:%M:%SZ')}",
+        "Preferred-Languages: it, en",
+        f"Canonical: {settings.SITE_URL.rstrip('/')}/.well-known/security.txt",
+    ]
+    return ("\n".join(righe) + "\n").encode()
+
+
+def _webmanifest(contenuto):
+    """Icone del manifest con l'URL degli statici (con hash in produzione)."""
+    dati = json.loads(contenuto)
+    for icona in dati.get("icons", []):
+        if icona["src"].startswith(settings.STATIC_URL):
+            icona["src"] = static(icona["src"][len(settings.STATIC_URL):])
+    return json.dumps(dati, ensure_ascii=False, indent=2).encode()
+
+
+# File il cui contenuto va adattato dopo la lettura
+TRASFORMAZIONI = {
+    "site.webmanifest": _webmanifest,
+}
+
+
+def _carica(nome):
+    file_static, content_type, max_age = FILE_RADICE[nome]
+    if file_static is None:
+        # A inizio giornata: stesso contenuto (e ETag) per tutti i processi
+        oggi = timezone.now().astimezone(datetime.timezone.utc).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        return FileRadice(_security_txt(oggi), content_type, max_age, oggi)
+
+    percorso = finders.find(file_static)
+    if percorso is None:
+        return None
+    with open(percorso, "rb") as f:
+        contenuto = f.read()
+    if nome in TRASFORMAZIONI:
+        contenuto = TRASFORMAZIONI[nome](contenuto)
+    ultima_modifica = datetime.datetime.fromtimestamp(
+        os.path.getmtime(percorso), tz=datetime.timezone.utc
+    )
+    return FileRadice(contenuto, content_type, max_age, ultima_modifica)
+
+
+@functools.lru_cache(maxsize=None)
+def get_file_radice(nome):
+    """Il file in memoria (letto alla prima richiesta), None se non esiste."""
+    return _carica(nome)
+
+
+def percorsi_file_radice():
+    """Path dei file, per escluderli da rate limiting e cache pagine."""
+    return tuple(f"/{nome}" for nome in FILE_RADICE)
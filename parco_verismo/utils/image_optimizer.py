@@ -1,55 +1,139 @@
+import math
 import os
-from io import BytesIO
-from PIL import Image
-from django.core.files.base import ContentFile
-from django.core.files.uploadedfile import InMemoryUploadedFile
+import tempfile
 
-def optimize_image(image_field, max_width=1920, quality=85):
+from PIL import Image, UnidentifiedImageError
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+
+# Tag EXIF Orientation -> trasformazione che raddrizza l'immagine
+# (la stessa tabella di PIL.ImageOps.exif_transpose)
+ORIENTAMENTO_EXIF = 0x0112
+TRASPOSIZIONI = {
+    2: Image.Transpose.FLIP_LEFT_RIGHT,
+    3: Image.Transpose.ROTATE_180,
+    4: Image.Transpose.FLIP_TOP_BOTTOM,
+    5: Image.Transpose.TRANSPOSE,
+    6: Image.Transpose.ROTATE_270,
+    7: Image.Transpose.TRANSVERSE,
+    8: Image.Transpose.ROTATE_90,
+}
+ROTAZIONI_90 = (5, 6, 7, 8)
+
+# Modi che reduce/resize elaborano direttamente (senza convertire prima)
+MODI_RIDIMENSIONABILI = ("RGB", "RGBA", "L", "LA", "CMYK")
+
+# Margine tra la decodifica ridotta (draft/reduce, veloci ma meno precisi) e la
+# dimensione finale: l'ultimo passaggio LANCZOS mantiene la qualità
+MARGINE_RIDUZIONE = 2
+
+# Il WebP prodotto resta in memoria fino a questa dimensione, poi su disco
+BUFFER_MAX_BYTE = 2 * 1024 * 1024
+
+
+def _apri_ridotta(file, max_width):
+    """
+    Apre l'immagine e prepara la decodifica alla scala più piccola utile.
+
+    Per i JPEG Image.draft fa decodificare direttamente a 1/2, 1/4 o 1/8:
+    una foto da 50 megapixel non viene mai espansa a piena risoluzione.
+    Solleva ValueError se i pixel da decodificare superano IMAGE_MAX_PIXELS.
+
+    Returns:
+        (immagine non ancora decodificata, orientamento EXIF, dimensione finale)
+    """
+    img = Image.open(file)
+    orientamento = img.getexif().get(ORIENTAMENTO_EXIF, 1)
+    ruotata = orientamento in ROTAZIONI_90
+    # Larghezza e altezza come verranno mostrate (dopo la rotazione EXIF)
+    larghezza, altezza = (img.height, img.width) if ruotata else img.size
+
+    scala = min(1, max_width / larghezza) if max_width else 1
+    finale = (max(1, round(larghezza * scala)), max(1, round(altezza * scala)))
+    if scala < 1:
+        richiesta = (math.ceil(finale[0] * MARGINE_RIDUZIONE), math.ceil(finale[1] * MARGINE_RIDUZIONE))
+        img.draft(None, richiesta[::-1] if ruotata else richiesta)
+
+    max_pixel = settings.IMAGE_MAX_PIXELS
+    pixel = img.width * img.height
+    if max_pixel and pixel > max_pixel:
+        raise ValueError(
+            f"Immagine troppo grande: {pixel / 1e6:.0f} megapixel (massimo {max_pixel / 1e6:.0f})"
+        )
+    return img, orientamento, finale
+
+
+def valida_immagine_caricata(file):
+    """Validatore per i campi di upload: legge solo l'intestazione dell'immagine."""
+    try:
+        _apri_ridotta(file, settings.IMAGE_MAX_WIDTH)
+    except Image.DecompressionBombError:
+        # Sollevata da Image.open oltre il doppio di Image.MAX_IMAGE_PIXELS; non
+        # deriva da OSError né da ValueError
+        raise ValidationError(
+            "%(nome)s: immagine troppo grande (troppi pixel). Ridurre la foto prima di caricarla.",
+            params={"nome": file.name},
+        )
+    except (UnidentifiedImageError, OSError):
+        raise ValidationError("Il file %(nome)s non è un'immagine valida.", params={"nome": file.name})
+    except ValueError as e:
+        raise ValidationError(
+            "%(nome)s: %(errore)s. Ridurre la foto prima di caricarla.",
+            params={"nome": file.name, "errore": e},
+        )
+    # L'immagine non viene chiusa: Image.close() chiuderebbe anche il file caricato
+    # (ancora da salvare)
+    file.seek(0)
+
+
+def optimize_image(image_field, max_width=None, quality=85):
     """
-    Ottimizza un'immagine: la converte in WebP e applica una compressione 
+    Ottimizza un'immagine: la converte in WebP e applica una compressione
     mantenendo un'alta qualità.
     Ridimensiona l'immagine (max_width) MANTENENDO LE PROPORZIONI (aspect ratio).
+
+    La memoria usata dipende dalla dimensione finale, non dall'originale:
+    decodifica ridotta (draft per i JPEG, reduce per gli altri formati),
+    conversione di modo e rotazione EXIF solo sull'immagine già ridotta,
+    risultato scritto in un file temporaneo oltre BUFFER_MAX_BYTE.
     """
     if not image_field:
         return
+    max_width = max_width or settings.IMAGE_MAX_WIDTH
 
-    # Apri l'immagine con PIL
-    img = Image.open(image_field)
-    
-    # Se l'immagine è già in WebP e non supera la larghezza massima, 
-    # potremmo saltare l'ottimizzazione, ma per semplicità la ri-elaboriamo
-    # per garantire la compressione impostata.
-
-    # Converti in RGB se necessario (WebP supporta RGBA, ma se vogliamo 
-    # forzare RGB per risparmiare ulteriore spazio possiamo farlo. 
-    # Qui manteniamo RGBA se presente per i loghi/trasparenze).
-    if img.mode in ("RGBA", "P"):
-        img = img.convert("RGBA")
-    else:
-        img = img.convert("RGB")
-
-    # Ridimensionamento proporzionale (ASPECT RATIO PRESERVATO)
-    if max_width and img.width > max_width:
-        ratio = max_width / float(img.width)
-        new_height = int(float(img.height) * float(ratio))
-        img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-
-    # Salva in un buffer in memoria come WebP
-    output = BytesIO()
-    img.save(output, format="WEBP", quality=quality, method=4) # method 4 is faster, 6 is too slow for bulk
+    img, orientamento, finale = _apri_ridotta(image_field, max_width)
+    with img:
+        # Palette, 16 bit, ecc. vanno convertite prima: resize e reduce non le
+        # interpolano. Gli altri modi restano invariati fino alla fine.
+        if img.mode not in MODI_RIDIMENSIONABILI:
+            trasparente = img.mode in ("PA", "RGBa") or "transparency" in img.info
+            img = img.convert("RGBA" if trasparente else "RGB")
+
+        dimensione = finale[::-1] if orientamento in ROTAZIONI_90 else finale
+        if img.size != dimensione:
+            # Riduzione intera (media di blocchi di pixel) fino a MARGINE_RIDUZIONE volte la dimensione finale
+            fattore = min(
+                img.width // (dimensione[0] * MARGINE_RIDUZIONE),
+                img.height // (dimensione[1] * MARGINE_RIDUZIONE),
+            )
+            if fattore >= 2:
+                img = img.reduce(fattore)
+            img = img.resize(dimensione, Image.Resampling.LANCZOS)
+
+        if orientamento in TRASPOSIZIONI:
+            img = img.transpose(TRASPOSIZIONI[orientamento])
+
+        # Converti in RGB se necessario (WebP supporta RGBA: manteniamo la
+        # trasparenza per i loghi)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if img.mode == "LA" else "RGB")
+
+        # Salva come WebP: in memoria se piccolo, altrimenti su disco
+        output = tempfile.SpooledTemporaryFile(max_size=BUFFER_MAX_BYTE)
+        img.save(output, format="WEBP", quality=quality, method=4)  # method 4 is faster, 6 is too slow for bulk
     output.seek(0)
 
     # Prepara il nuovo nome file (cambia estensione in .webp)
     filename = os.path.splitext(image_field.name)[0] + ".webp"
-
-    # Sostituisci il file nel campo del modello
-    new_image = InMemoryUploadedFile(
-        output,
-        'ImageField',
-        filename,
-        'image/webp',
-        output.getbuffer().nbytes,
-        None
-    )
-    
-    return new_image
+    return File(output, name=filename)
@@ -0,0 +1,131 @@
+"""
+Versioni ottimizzate (WebP/AVIF) delle immagini statiche.
+
+Le immagini in static/assets/img sono inserite a mano e servite così come
+sono, a differenza di quelle caricate dall'admin (optimize_image e
+rendition). `python manage.py ottimizza_statici --genera` ne scrive più
+larghezze (STATIC_IMMAGINI_WIDTHS) nei formati STATIC_IMMAGINI_FORMATS in
+STATIC_IMMAGINI_DIR, servita come /static/ottimizzate/:
+
+    ottimizzate/<percorso originale senza estensione>/<larghezza>w.<formato>
+
+Il file ottimizzate/manifest.json elenca, per ogni immagine, l'impronta del
+file originale (per rigenerare solo quelle cambiate) e le varianti. I
+template lo usano con i tag {% srcset_statico %} e {% sorgenti_statiche %}
+(templatetags/immagini.py): senza manifest resta l'immagine originale.
+"""
+
+# Standard library imports
+import functools
+import json
+import shutil
+from pathlib import Path
+
+# Third-party imports
+from PIL import Image, ImageOps
+
+# Django imports
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.templatetags.static import static
+
+PREFISSO = "ottimizzate"
+MANIFEST = f"{PREFISSO}/manifest.json"
+
+MIME = {"avif": "image/avif", "webp": "image/webp"}
+
+# Tag EXIF Orientation e valori che scambiano larghezza e altezza
+ORIENTAMENTO_EXIF = 0x0112
+ROTAZIONI_90 = (5, 6, 7, 8)
+
+
+def cartella_varianti(percorso):
+    """Cartella delle varianti di un'immagine, relativa a STATIC_IMMAGINI_DIR."""
+    return str(Path(percorso).with_suffix(""))
+
+
+def percorso_variante(percorso, larghezza, formato):
+    """Percorso tra gli statici di una variante, es. ottimizzate/assets/img/x/640w.webp."""
+    return f"{PREFISSO}/{cartella_varianti(percorso)}/{larghezza}w.{formato}"
+
+
+def codifica(sorgente, destinazione, larghezze, formati, qualita):
+    """
+    Scrive le varianti di un'immagine in `destinazione` (svuotata prima).
+
+    Eseguita nei processi del pool di ottimizza_statici: usa solo PIL e
+    argomenti semplici. Le larghezze maggiori dell'originale sono saltate;
+    la più grande disponibile è l'originale stesso ricodificato.
+
+    Returns:
+        {"larghezza": ..., "altezza": ..., "varianti": {formato: [larghezze]}, "byte": ...}
+    """
+    destinazione = Path(destinazione)
+    with Image.open(sorgente) as img:
+        larghezza_originale, altezza_originale = img.size
+        if img.getexif().get(ORIENTAMENTO_EXIF) in ROTAZIONI_90:
+            larghezza_originale, altezza_originale = altezza_originale, larghezza_originale
+        # JPEG: decodifica direttamente a una scala ridotta se l'originale è enorme
+        img.draft("RGB", (max(larghezze), max(larghezze)))
+        img = ImageOps.exif_transpose(img)
+        img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P", "PA") else "RGB")
+
+    massima = min(img.width, max(larghezze))
+    finali = [larghezza for larghezza in larghezze if larghezza < massima] + [massima]
+
+    if destinazione.exists():
+        shutil.rmtree(destinazione)
+    destinazione.mkdir(parents=True)
+    varianti = {}
+    byte = 0
+    for formato in formati:
+        varianti[formato] = []
+        for larghezza in finali:
+            altezza = round(img.height * larghezza / img.width)
+            ridotta = img if larghezza == img.width else img.resize((larghezza, altezza), Image.Resampling.LANCZOS)
+            file = destinazione / f"{larghezza}w.{formato}"
+            ridotta.save(file, format=formato.upper(), quality=qualita)
+            byte += file.stat().st_size
+            varianti[formato].append(larghezza)
+    return {
+        "larghezza": larghezza_originale,
+        "altezza": altezza_originale,
+        "varianti": varianti,
+        "byte": byte,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_manifest_statico():
+    """Manifest delle varianti, letto una volta per processo ({} se non generato)."""
+    percorso = finders.find(MANIFEST)
+    if percorso is None and staticfiles_storage.exists(MANIFEST):
+        # In produzione la cartella generata è solo nello STATIC_ROOT
+        percorso = staticfiles_storage.path(MANIFEST)
+    if percorso is None:
+        return {}
+    with open(percorso, encoding="utf-8") as f:
+        return json.load(f).get("immagini", {})
+
+
+def get_srcset_statico(percorso, formato):
+    """srcset delle varianti di un'immagine statica in un formato, o ""."""
+    voce = get_manifest_statico().get(percorso)
+    if not voce:
+        return ""
+    return ", ".join(
+        f"{static(percorso_variante(percorso, larghezza, formato))} {larghezza}w"
+        for larghezza in voce["varianti"].get(formato, [])
+    )
+
+
+def get_sorgenti_statiche(percorso):
+    """[(tipo MIME, srcset)] per i <source> di un <picture>, nell'ordine dei formati."""
+    voce = get_manifest_statico().get(percorso)
+    if not voce:
+        return []
+    return [
+        (MIME.get(formato, f"image/{formato}"), get_srcset_statico(percorso, formato))
+        for formato in voce["varianti"]
+        if voce["varianti"][formato]
+    ]
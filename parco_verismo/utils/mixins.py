@@ -2,7 +2,14 @@
 Mixins riutilizzabili per views e modelli.
 """
 
+# Standard library imports
+import copy
+
+# Django imports
 from django.contrib import messages
+from django.db import models
+from django.db.models.fields.files import FieldFile
+from django.utils.text import slugify
 
 
 class FormSuccessMessageMixin:
@@ -28,6 +35,92 @@ class ActiveOnlyMixin:
         return queryset.filter(is_active=True)
 
 
+class ValoriOriginaliMixin:
+    """
+    Mixin per modelli che ricorda i valori dei campi tracciati così come letti
+    dal database (hook from_db) e dopo ogni salvataggio.
+
+    save() e i segnali possono così sapere se un campo è cambiato senza
+    rileggere l'oggetto. Di default sono tracciati i campi file e immagine;
+    `campi_tracciati` permette di indicarne altri.
+    """
+
+    campi_tracciati = None
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        istanza = super().from_db(db, field_names, values)
+        istanza._memorizza_valori_originali()
+        return istanza
+
+    @classmethod
+    def get_campi_tracciati(cls):
+        if cls.campi_tracciati is not None:
+            return cls.campi_tracciati
+        return tuple(
+            f.attname for f in cls._meta.concrete_fields if isinstance(f, models.FileField)
+        )
+
+    def _valore_corrente(self, campo):
+        valore = getattr(self, campo)
+        if isinstance(valore, FieldFile):
+            return valore.name or ""
+        # Copia: liste e dizionari (JSONField) possono essere modificati sul posto
+        return copy.deepcopy(valore)
+
+    def _memorizza_valori_originali(self, campi=None):
+        differiti = self.get_deferred_fields()
+        originali = self.__dict__.setdefault("_valori_originali", {})
+        for campo in campi if campi is not None else self.get_campi_tracciati():
+            if campo not in differiti:
+                originali[campo] = self._valore_corrente(campo)
+
+    def campo_modificato(self, campo):
+        """
+        True se il campo è diverso dal valore nel database. Gli oggetti nuovi
+        o non letti dal database hanno tutti i campi modificati.
+        """
+        if self._state.adding:
+            return True
+        originali = self.__dict__.get("_valori_originali", {})
+        if campo not in originali:
+            # Un campo differito mai letto non può essere stato modificato
+            return campo not in self.get_deferred_fields()
+        return originali[campo] != self._valore_corrente(campo)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        update_fields = kwargs.get("update_fields")
+        tracciati = self.get_campi_tracciati()
+        if update_fields is not None:
+            tracciati = [c for c in tracciati if c in update_fields]
+        self._memorizza_valori_originali(tracciati)
+
+
+class SlugUnicoMixin:
+    """Mixin per modelli con campo `slug` univoco generato dal titolo o dal nome."""
+
+    def genera_slug_unico(self, testo):
+        """
+        Restituisce lo slug di `testo`, con suffisso -1, -2, ... se già usato.
+
+        Gli slug che iniziano con la stessa base vengono letti con una sola
+        query, invece di una query per ogni suffisso provato.
+        """
+        base = slugify(testo)
+        esistenti = set(
+            type(self)._default_manager.filter(slug__startswith=base)
+            .exclude(pk=self.pk)
+            .values_list("slug", flat=True)
+        )
+        slug = base
+        counter = 1
+        while slug in esistenti:
+            slug = f"{base}-{counter}"
+            counter += 1
+        return slug
+
+
 class TimestampMixin:
     """
     Mixin per aggiungere campi di timestamp ai modelli.
@@ -0,0 +1,90 @@
+"""
+Cache delle pagine pubbliche per i visitatori anonimi.
+
+Le pagine vengono salvate per lingua, host, path e query string. Ogni chiave
+include la "generazione" dei contenuti, che viene aggiornata dai segnali
+post_save/post_delete dei modelli (vedi parco_verismo/signals.py): quando un
+redattore salva qualcosa nell'admin tutte le pagine in cache diventano
+obsolete senza doverle cercare una per una.
+
+Il token CSRF presente nei form (navbar, contatti, homepage) viene sostituito
+ad ogni risposta servita dalla cache con un token valido per il visitatore.
+"""
+
+# Standard library imports
+import hashlib
+import re
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.middleware.csrf import get_token
+from django.utils.http import quote_etag
+
+# Local imports
+from .condizionale import etag_visitatore
+
+GENERATION_KEY = "pagecache:generation"
+
+# Il valore del token mascherato è alfanumerico (64 caratteri)
+CSRF_INPUT_RE = re.compile(rb'(name="csrfmiddlewaretoken" value=")[A-Za-z0-9]+(")')
+
+
+def get_page_cache():
+    return caches[getattr(settings, "PAGE_CACHE_ALIAS", "default")]
+
+
+def get_generation():
+    """Restituisce la generazione corrente dei contenuti (creandola se manca)."""
+    cache = get_page_cache()
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        generation = time.time_ns()
+        cache.add(GENERATION_KEY, generation, None)
+        generation = cache.get(GENERATION_KEY, generation)
+    return generation
+
+
+def bump_generation():
+    """Invalida tutte le pagine in cache passando a una nuova generazione."""
+    get_page_cache().set(GENERATION_KEY, time.time_ns(), None)
+
+
+def page_cache_key(request):
+    """Chiave di cache per la richiesta corrente."""
+    query = hashlib.md5(request.META.get("QUERY_STRING", "").encode()).hexdigest()
+    return (
+        f"pagecache:{get_generation()}:{getattr(request, 'LANGUAGE_CODE', '')}:"
+        f"{request.scheme}:{request.get_host()}:{request.path}:{query}"
+    )
+
+
+def serialize_response(request, response):
+    """Riduce la risposta a un dizionario serializzabile per la cache."""
+    return {
+        "content": response.content,
+        "status": response.status_code,
+        "headers": dict(response.items()),
+        # Il template ha usato {% csrf_token %}: va rigenerato per ogni visitatore
+        "csrf": bool(request.META.get("CSRF_COOKIE_NEEDS_UPDATE")),
+        # L'ETag dipende dal visitatore: si conserva la parte dei contenuti
+        "etag": getattr(request, "etag_contenuti", None),
+    }
+
+
+def build_response(request, entry):
+    """Ricostruisce una HttpResponse a partire da un elemento della cache."""
+    content = entry["content"]
+    if entry["csrf"]:
+        token = get_token(request).encode()
+        content = CSRF_INPUT_RE.sub(lambda m: m.group(1) + token + m.group(2), content)
+
+    response = HttpResponse(content, status=entry["status"])
+    for header, value in entry["headers"].items():
+        if header.lower() != "content-length":
+            response[header] = value
+    if entry.get("etag"):
+        response["ETag"] = quote_etag(etag_visitatore(request, entry["etag"]))
+    return response
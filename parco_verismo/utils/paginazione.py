@@ -0,0 +1,157 @@
+"""
+Paginazione con cursore (keyset) per le liste pubbliche.
+
+Invece di OFFSET, ogni pagina riparte dai valori delle chiavi di ordinamento
+dell'ultimo elemento mostrato: la query usa l'indice e costa lo stesso alla
+prima pagina come alla centesima, anche con anni di archivio. Il cursore è
+un JSON in base64 urlsafe; un cursore non valido riporta alla prima pagina.
+
+Uso:
+    pagina = pagina_keyset(queryset, ("-data_pubblicazione", "-pk"), cursore)
+    for oggetto in pagina: ...
+    pagina.cursore_successivo  # None sull'ultima pagina
+"""
+
+# Standard library imports
+import base64
+import binascii
+import datetime
+import json
+
+# Django imports
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class Pagina:
+    """Una pagina di risultati con il cursore per caricare la successiva."""
+
+    def __init__(self, oggetti, cursore_successivo=None):
+        self.oggetti = oggetti
+        self.cursore_successivo = cursore_successivo
+
+    @property
+    def ha_successiva(self):
+        return self.cursore_successivo is not None
+
+    def __iter__(self):
+        return iter(self.oggetti)
+
+    def __len__(self):
+        return len(self.oggetti)
+
+    def __bool__(self):
+        return bool(self.oggetti)
+
+
+def _codifica(dati):
+    testo = json.dumps(dati, separators=(",", ":"))
+    return base64.urlsafe_b64encode(testo.encode()).decode().rstrip("=")
+
+
+def _decodifica(cursore):
+    if not cursore:
+        return None
+    try:
+        testo = base64.urlsafe_b64decode(cursore + "=" * (-len(cursore) % 4))
+        return json.loads(testo)
+    except (binascii.Error, ValueError):
+        return None
+
+
+def _chiavi(modello, ordinamento):
+    """Coppie (campo, discendente) per le chiavi di ordinamento ("-data", "pk")."""
+    chiavi = []
+    for chiave in ordinamento:
+        nome = chiave.lstrip("-")
+        campo = modello._meta.pk if nome == "pk" else modello._meta.get_field(nome)
+        chiavi.append((campo, chiave.startswith("-")))
+    return chiavi
+
+
+def _valori_cursore(chiavi, dati):
+    """Valori Python delle chiavi salvate nel cursore, o None se non validi."""
+    if not isinstance(dati, list) or len(dati) != len(chiavi) or None in dati:
+        return None
+    try:
+        return [campo.to_python(valore) for (campo, _), valore in zip(chiavi, dati)]
+    except (ValidationError, TypeError, ValueError):
+        return None
+
+
+def _filtro_dopo(chiavi, valori):
+    """
+    Condizione "viene dopo (v1, v2, ...)" nell'ordinamento dato:
+    k1 > v1 OR (k1 = v1 AND k2 > v2) OR ..., con < per le chiavi discendenti.
+    """
+    filtro = Q()
+    uguali = {}
+    for (campo, discendente), valore in zip(chiavi, valori):
+        confronto = "lt" if discendente else "gt"
+        filtro |= Q(**uguali, **{f"{campo.attname}__{confronto}": valore})
+        uguali[campo.attname] = valore
+    return filtro
+
+
+def _valore_json(valore):
+    if isinstance(valore, (datetime.date, datetime.time)):
+        # isoformat conserva i microsecondi, necessari per l'uguaglianza
+        return valore.isoformat()
+    return valore
+
+
+def pagina_keyset(queryset, ordinamento, cursore=None, dimensione=None):
+    """
+    Restituisce la pagina che segue il cursore, ordinata per le chiavi date.
+
+    L'ultima chiave deve essere univoca (di solito "pk" o "-pk") perché le
+    pagine non si sovrappongano e non saltino elementi; le chiavi non
+    possono essere nullable.
+
+    Args:
+        queryset: QuerySet da paginare (filtri e prefetch già applicati)
+        ordinamento: Chiavi di ordinamento, es. ("-data_pubblicazione", "-pk")
+        cursore: Cursore ricevuto dalla pagina precedente (opzionale)
+        dimensione: Elementi per pagina (default: LISTE_DIMENSIONE_PAGINA)
+
+    Returns:
+        Pagina con gli oggetti e il cursore della pagina successiva
+    """
+    dimensione = dimensione or settings.LISTE_DIMENSIONE_PAGINA
+    chiavi = _chiavi(queryset.model, ordinamento)
+    queryset = queryset.order_by(*ordinamento)
+
+    valori = _valori_cursore(chiavi, _decodifica(cursore))
+    if valori is not None:
+        queryset = queryset.filter(_filtro_dopo(chiavi, valori))
+
+    # Un elemento in più dice se esiste una pagina successiva, senza COUNT
+    oggetti = list(queryset[: dimensione + 1])
+    if len(oggetti) <= dimensione:
+        return Pagina(oggetti)
+
+    oggetti = oggetti[:dimensione]
+    ultimo = oggetti[-1]
+    cursore_successivo = _codifica(
+        [_valore_json(getattr(ultimo, campo.attname)) for campo, _ in chiavi]
+    )
+    return Pagina(oggetti, cursore_successivo)
+
+
+def pagina_offset(queryset, cursore=None, dimensione=None):
+    """
+    Come pagina_keyset, per le liste ordinate per rilevanza (risultati di una
+    ricerca) dove non ci sono chiavi da cui ripartire: il cursore contiene
+    la posizione del primo elemento della pagina.
+    """
+    dimensione = dimensione or settings.LISTE_DIMENSIONE_PAGINA
+    dati = _decodifica(cursore)
+    inizio = dati.get("o") if isinstance(dati, dict) else 0
+    if not isinstance(inizio, int) or inizio < 0:
+        inizio = 0
+
+    oggetti = list(queryset[inizio:inizio + dimensione + 1])
+    if len(oggetti) <= dimensione:
+        return Pagina(oggetti)
+    return Pagina(oggetti[:dimensione], _codifica({"o": inizio + dimensione}))
@@ -0,0 +1,153 @@
+"""
+Compressione dei percorsi stradali degli itinerari.
+
+I percorsi calcolati da OSRM vengono semplificati con l'algoritmo di
+Douglas-Peucker (tolleranza in metri) e codificati nel formato "encoded
+polyline" di Google: una stringa ASCII con le differenze tra punti
+consecutivi, circa 10 volte più piccola della lista JSON di coordinate.
+
+Formato di un percorso salvato in Itinerario.percorsi_calcolati:
+    {
+        "polyline": "<stringa codificata>",
+        "punti": 412,                  # punti originali
+        "distance": ..., "duration": ..., "tratteggiato": ...
+    }
+I percorsi nel vecchio formato ({"coords": [[lat, lng], ...]}) restano validi.
+"""
+
+# Standard library imports
+import math
+
+# Django imports
+from django.conf import settings
+
+# Metri per grado di latitudine (approssimazione sferica)
+METRI_PER_GRADO = 111_320
+
+
+def _distanza_segmento(p, a, b, cos_lat):
+    """Distanza in metri del punto p dal segmento a-b (proiezione equirettangolare)."""
+    px, py = p[1] * cos_lat, p[0]
+    ax, ay = a[1] * cos_lat, a[0]
+    bx, by = b[1] * cos_lat, b[0]
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay) * METRI_PER_GRADO
+    t = max(0, min(1, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy)) * METRI_PER_GRADO
+
+
+def semplifica(punti, tolleranza):
+    """
+    Semplifica una linea con Douglas-Peucker.
+
+    Args:
+        punti: Lista di coordinate [lat, lng]
+        tolleranza: Scostamento massimo consentito, in metri
+
+    Returns:
+        La lista dei punti conservati (primo e ultimo sempre inclusi)
+    """
+    if len(punti) < 3 or not tolleranza:
+        return list(punti)
+
+    cos_lat = math.cos(math.radians(punti[0][0]))
+    conserva = [False] * len(punti)
+    conserva[0] = conserva[-1] = True
+
+    # Versione iterativa: i percorsi lunghi supererebbero il limite di ricorsione
+    pila = [(0, len(punti) - 1)]
+    while pila:
+        inizio, fine = pila.pop()
+        distanza_max, indice = 0, None
+        for i in range(inizio + 1, fine):
+            d = _distanza_segmento(punti[i], punti[inizio], punti[fine], cos_lat)
+            if d > distanza_max:
+                distanza_max, indice = d, i
+        if indice is not None and distanza_max > tolleranza:
+            conserva[indice] = True
+            pila.append((inizio, indice))
+            pila.append((indice, fine))
+
+    return [p for p, tieni in zip(punti, conserva) if tieni]
+
+
+def _codifica_valore(valore):
+    valore = ~(valore << 1) if valore < 0 else valore << 1
+    caratteri = []
+    while valore >= 0x20:
+        caratteri.append(chr((0x20 | (valore & 0x1F)) + 63))
+        valore >>= 5
+    caratteri.append(chr(valore + 63))
+    return "".join(caratteri)
+
+
+def codifica(punti, precisione=5):
+    """Codifica una lista di [lat, lng] nel formato encoded polyline."""
+    fattore = 10**precisione
+    risultato = []
+    lat_prec = lng_prec = 0
+    for lat, lng in punti:
+        lat_i, lng_i = round(lat * fattore), round(lng * fattore)
+        risultato.append(_codifica_valore(lat_i - lat_prec))
+        risultato.append(_codifica_valore(lng_i - lng_prec))
+        lat_prec, lng_prec = lat_i, lng_i
+    return "".join(risultato)
+
+
+def decodifica(stringa, precisione=5):
+    """Decodifica una stringa encoded polyline in una lista di [lat, lng]."""
+    fattore = 10**precisione
+    punti = []
+    indice = lat = lng = 0
+    lunghezza = len(stringa)
+    while indice < lunghezza:
+        delta = []
+        for _ in range(2):
+            shift = valore = 0
+            while True:
+                byte = ord(stringa[indice]) - 63
+                indice += 1
+                valore |= (byte & 0x1F) << shift
+                shift += 5
+                if byte < 0x20:
+                    break
+            delta.append(~(valore >> 1) if valore & 1 else valore >> 1)
+        lat += delta[0]
+        lng += delta[1]
+        punti.append([lat / fattore, lng / fattore])
+    return punti
+
+
+def comprimi_percorso(percorso, tolleranza=None):
+    """
+    Converte un percorso con "coords" nel formato compresso.
+
+    Args:
+        percorso: Dizionario del percorso (vecchio o nuovo formato)
+        tolleranza: Tolleranza Douglas-Peucker in metri (default da settings)
+
+    Returns:
+        Un nuovo dizionario con "polyline" al posto di "coords"
+    """
+    if "coords" not in percorso:
+        return dict(percorso)
+
+    if tolleranza is None:
+        tolleranza = getattr(settings, "ITINERARI_POLYLINE_TOLLERANZA", 2.0)
+
+    compresso = {k: v for k, v in percorso.items() if k != "coords"}
+    coords = percorso["coords"]
+    compresso["polyline"] = codifica(semplifica(coords, tolleranza))
+    compresso.setdefault("punti", len(coords))
+    return compresso
+
+
+def decomprimi_percorso(percorso):
+    """Restituisce il percorso con la lista "coords" decodificata."""
+    if "polyline" not in percorso:
+        return dict(percorso)
+
+    decompresso = {k: v for k, v in percorso.items() if k != "polyline"}
+    decompresso["coords"] = decodifica(percorso["polyline"])
+    return decompresso
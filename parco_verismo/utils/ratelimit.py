@@ -0,0 +1,182 @@
+"""
+Motore di rate limiting con contatori atomici condivisi tra i worker.
+
+Il limiter usa l'algoritmo "sliding window counter": per ogni IP mantiene
+solo due contatori interi (finestra corrente e finestra precedente) e stima
+le richieste nell'ultima finestra pesando quella precedente in base al tempo
+trascorso. Il costo per richiesta è costante, indipendente dal traffico.
+
+Gli store disponibili sono:
+- "sqlite": file SQLite condiviso da tutti i worker gunicorn dello stesso nodo
+  (default, nessun servizio esterno richiesto);
+- "cache": un alias di CACHES (consigliato con Redis/Memcached, dove
+  `incr` è atomico anche tra processi).
+"""
+
+# Standard library imports
+import os
+import random
+import sqlite3
+import threading
+import time
+
+# Django imports
+from django.conf import settings
+from django.core.cache import caches
+
+
+class CacheCounterStore:
+    """Store basato su una cache Django (add + incr atomici)."""
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def incr(self, key, ttl):
+        """Incrementa il contatore e restituisce il nuovo valore."""
+        if self.cache.add(key, 1, ttl):
+            return 1
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # La chiave è scaduta tra add() e incr()
+            self.cache.set(key, 1, ttl)
+            return 1
+
+    def get(self, key):
+        return self.cache.get(key, 0)
+
+
+class SQLiteCounterStore:
+    """
+    Store basato su un file SQLite condiviso tra i processi del nodo.
+
+    Ogni incremento è un singolo UPSERT in una transazione IMMEDIATE, quindi
+    atomico anche con più worker gunicorn che scrivono sullo stesso file.
+    """
+
+    # Probabilità di eseguire la pulizia delle chiavi scadute ad ogni incremento
+    CLEANUP_PROBABILITY = 0.001
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._local = threading.local()
+
+    def _connection(self):
+        # Una connessione per thread e per processo (gunicorn fa fork dei worker)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ratelimit_counter ("
+                " key TEXT PRIMARY KEY,"
+                " count INTEGER NOT NULL,"
+                " expires REAL NOT NULL)"
+            )
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def incr(self, key, ttl):
+        """Incrementa il contatore e restituisce il nuovo valore."""
+        now = time.time()
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO ratelimit_counter (key, count, expires) VALUES (?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET "
+                " count = CASE WHEN expires < ? THEN 1 ELSE count + 1 END,"
+                " expires = CASE WHEN expires < ? THEN excluded.expires ELSE expires END",
+                (key, now + ttl, now, now),
+            )
+            (count,) = conn.execute(
+                "SELECT count FROM ratelimit_counter WHERE key = ?", (key,)
+            ).fetchone()
+            if random.random() < self.CLEANUP_PROBABILITY:
+                conn.execute("DELETE FROM ratelimit_counter WHERE expires < ?", (now,))
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT count FROM ratelimit_counter WHERE key = ? AND expires >= ?",
+            (key, time.time()),
+        ).fetchone()
+        return row[0] if row else 0
+
+
+class RateLimiter:
+    """
+    Rate limiter a finestra (fissa o scorrevole) su uno store di contatori.
+
+    Args:
+        store: Store dei contatori (CacheCounterStore o SQLiteCounterStore)
+        algorithm: "sliding_window" (default) oppure "fixed_window"
+    """
+
+    ALGORITHMS = ("sliding_window", "fixed_window")
+
+    def __init__(self, store, algorithm="sliding_window"):
+        if algorithm not in self.ALGORITHMS:
+            raise ValueError(f"Algoritmo di rate limiting sconosciuto: {algorithm}")
+        self.store = store
+        self.algorithm = algorithm
+
+    def hit(self, key, max_requests, window, now=None):
+        """
+        Registra una richiesta per `key` e verifica il limite.
+
+        Returns:
+            True se la richiesta è consentita, False se il limite è superato
+        """
+        now = time.time() if now is None else now
+        bucket = int(now // window)
+        current_key = f"ratelimit:{key}:{bucket}"
+
+        if self.algorithm == "fixed_window":
+            return self.store.incr(current_key, window * 2) <= max_requests
+
+        # Peso della finestra precedente = frazione ancora "dentro" la finestra mobile
+        previous = self.store.get(f"ratelimit:{key}:{bucket - 1}")
+        weight = 1 - (now - bucket * window) / window
+
+        # Le richieste rifiutate non vengono contate, altrimenti un client
+        # al limite resterebbe bloccato anche nella finestra successiva
+        if previous * weight + self.store.get(current_key) + 1 > max_requests:
+            return False
+
+        # Il valore restituito da incr è atomico: ricontrolla per le corse tra worker
+        return previous * weight + self.store.incr(current_key, window * 2) <= max_requests
+
+
+_limiter = None
+
+
+def build_store():
+    """Costruisce lo store configurato in settings.RATELIMIT_BACKEND."""
+    backend = getattr(settings, "RATELIMIT_BACKEND", "sqlite")
+    if backend == "cache":
+        return CacheCounterStore(getattr(settings, "RATELIMIT_CACHE_ALIAS", "default"))
+    if backend == "sqlite":
+        return SQLiteCounterStore(settings.RATELIMIT_SQLITE_PATH)
+    raise ValueError(f"Backend di rate limiting sconosciuto: {backend}")
+
+
+def get_rate_limiter():
+    """Restituisce il limiter di processo, creandolo al primo utilizzo."""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter(
+            build_store(),
+            algorithm=getattr(settings, "RATELIMIT_ALGORITHM", "sliding_window"),
+        )
+    return _limiter
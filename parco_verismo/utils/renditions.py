@@ -0,0 +1,199 @@
+"""
+Versioni ridimensionate ("rendition") delle immagini caricate.
+
+Per ogni immagine vengono generate più larghezze (IMAGE_RENDITION_WIDTHS) in
+uno o più formati (IMAGE_RENDITION_FORMATS), salvate nello storage dei media
+con un percorso deterministico:
+
+    renditions/<cartella originale>/<nome>-<hash>/<larghezza>w.<formato>
+
+L'hash dipende dal nome del file originale e da IMAGE_RENDITION_VERSION:
+caricando una nuova immagine (nome diverso) o cambiando la versione le
+rendition vengono rigenerate. Nella stessa cartella un file manifest.json
+elenca le varianti disponibili e la larghezza dell'originale.
+
+La generazione non avviene mai durante la richiesta: il template tag
+{% srcset %} usa le rendition se esistono, altrimenti accoda la generazione
+al worker (vedi parco_verismo/tasks.py) e restituisce l'immagine originale.
+"""
+
+# Standard library imports
+import hashlib
+import json
+import logging
+import posixpath
+from io import BytesIO
+
+# Third-party imports
+from PIL import Image, ImageOps
+
+# Django imports
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+logger = logging.getLogger(__name__)
+
+CARTELLA_RENDITIONS = "renditions"
+MANIFEST_TIMEOUT = 3600
+
+# Campi immagine per cui generare le rendition: modello -> campi
+CAMPI_RENDITION = {
+    "Opera": ("copertina",),
+    "Evento": ("immagine",),
+    "EventoImage": ("immagine",),
+    "Notizia": ("immagine",),
+    "NotiziaImage": ("immagine",),
+    "Documento": ("anteprima",),
+    "FotoArchivio": ("immagine",),
+    "Itinerario": ("immagine",),
+    "ItinerarioImmagine": ("immagine",),
+}
+
+# Durata del segnaposto che evita di accodare più volte la stessa immagine
+RICHIESTA_TIMEOUT = 600
+
+
+def get_larghezze():
+    return tuple(getattr(settings, "IMAGE_RENDITION_WIDTHS", (320, 640, 960, 1280)))
+
+
+def get_formati():
+    return tuple(getattr(settings, "IMAGE_RENDITION_FORMATS", ("webp",)))
+
+
+def cartella_rendition(nome):
+    """Cartella (deterministica) delle rendition di un file originale."""
+    versione = getattr(settings, "IMAGE_RENDITION_VERSION", 1)
+    digest = hashlib.sha1(f"{nome}:{versione}".encode()).hexdigest()[:10]
+    cartella, file = posixpath.split(nome)
+    radice = posixpath.splitext(file)[0]
+    return posixpath.join(CARTELLA_RENDITIONS, cartella, f"{radice}-{digest}")
+
+
+def percorso_rendition(nome, larghezza, formato):
+    return posixpath.join(cartella_rendition(nome), f"{larghezza}w.{formato}")
+
+
+def _chiave_cache(nome):
+    return "rendition:" + hashlib.md5(cartella_rendition(nome).encode()).hexdigest()
+
+
+def get_manifest(nome):
+    """
+    Restituisce il manifest delle rendition di un file, o None se mancano.
+
+    Il manifest ha la forma {"larghezza": 2400, "varianti": {"webp": [320, 640]}}.
+    """
+    chiave = _chiave_cache(nome)
+    manifest = cache.get(chiave)
+    if manifest is None:
+        try:
+            with default_storage.open(posixpath.join(cartella_rendition(nome), "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        # Anche l'assenza viene memorizzata (per poco) per non ricontrollare a ogni richiesta
+        cache.set(chiave, manifest, MANIFEST_TIMEOUT if manifest else 60)
+    return manifest or None
+
+
+def genera_rendition(nome, forza=False):
+    """
+    Genera tutte le rendition di un file originale e scrive il manifest.
+
+    Le larghezze superiori a quella dell'originale vengono saltate.
+
+    Returns:
+        Il manifest delle varianti generate
+    """
+    cartella = cartella_rendition(nome)
+    manifest = get_manifest(nome)
+    if manifest and not forza:
+        return manifest
+
+    with default_storage.open(nome) as f:
+        img = Image.open(f)
+        img.load()
+    # Applica la rotazione EXIF prima di ridimensionare
+    img = ImageOps.exif_transpose(img)
+    img = img.convert("RGBA" if img.mode in ("RGBA", "LA", "P") else "RGB")
+
+    qualita = getattr(settings, "IMAGE_RENDITION_QUALITY", 80)
+    varianti = {}
+    for formato in get_formati():
+        varianti[formato] = []
+        for larghezza in get_larghezze():
+            if larghezza >= img.width:
+                continue
+            altezza = round(img.height * larghezza / img.width)
+            ridotta = img.resize((larghezza, altezza), Image.Resampling.LANCZOS)
+            if formato == "jpeg" and ridotta.mode == "RGBA":
+                ridotta = ridotta.convert("RGB")
+            output = BytesIO()
+            ridotta.save(output, format=formato.upper(), quality=qualita)
+            percorso = percorso_rendition(nome, larghezza, formato)
+            if default_storage.exists(percorso):
+                default_storage.delete(percorso)
+            default_storage.save(percorso, ContentFile(output.getvalue()))
+            varianti[formato].append(larghezza)
+
+    manifest = {"larghezza": img.width, "varianti": varianti}
+    percorso_manifest = posixpath.join(cartella, "manifest.json")
+    if default_storage.exists(percorso_manifest):
+        default_storage.delete(percorso_manifest)
+    default_storage.save(percorso_manifest, ContentFile(json.dumps(manifest).encode()))
+    cache.set(_chiave_cache(nome), manifest, MANIFEST_TIMEOUT)
+    return manifest
+
+
+def richiedi_rendition(nome):
+    """Accoda la generazione delle rendition (al più una volta ogni RICHIESTA_TIMEOUT)."""
+    from ..services.job_queue import accoda
+
+    if not cache.add(f"rendition-richiesta:{_chiave_cache(nome)}", True, RICHIESTA_TIMEOUT):
+        return
+    try:
+        accoda("immagini.rendition", nome=nome)
+    except Exception:
+        logger.exception("Impossibile accodare le rendition di %s", nome)
+
+
+def get_srcset(field_file, formato=None):
+    """
+    Restituisce l'attributo srcset per un ImageField, o "" se le rendition
+    non sono ancora pronte (in tal caso ne richiede la generazione).
+    """
+    if not field_file or not field_file.name:
+        return ""
+    formato = formato or get_formati()[0]
+    manifest = get_manifest(field_file.name)
+    if manifest is None:
+        richiedi_rendition(field_file.name)
+        return ""
+
+    voci = [
+        f"{default_storage.url(percorso_rendition(field_file.name, larghezza, formato))} {larghezza}w"
+        for larghezza in manifest["varianti"].get(formato, [])
+    ]
+    if not voci:
+        return ""
+    # L'originale è la variante più grande
+    voci.append(f"{field_file.url} {manifest['larghezza']}w")
+    return ", ".join(voci)
+
+
+def get_url_rendition(field_file, larghezza, formato=None):
+    """URL della rendition più piccola larga almeno `larghezza` (o dell'originale)."""
+    if not field_file or not field_file.name:
+        return ""
+    formato = formato or get_formati()[0]
+    manifest = get_manifest(field_file.name)
+    if manifest is None:
+        richiedi_rendition(field_file.name)
+        return field_file.url
+    for disponibile in sorted(manifest["varianti"].get(formato, [])):
+        if disponibile >= larghezza:
+            return default_storage.url(percorso_rendition(field_file.name, disponibile, formato))
+    return field_file.url
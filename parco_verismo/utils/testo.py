@@ -0,0 +1,95 @@
+"""
+Normalizzazione del testo per l'indice di ricerca.
+
+Il testo viene portato in minuscolo, privato degli accenti ("città" e
+"citta" coincidono), diviso in parole e ridotto alla radice con uno stemmer
+leggero: "novella", "novelle" e "novelli" diventano tutti "novell".
+La stessa funzione viene applicata ai contenuti indicizzati e alle query.
+"""
+
+# Standard library imports
+import re
+import unicodedata
+
+PAROLA_RE = re.compile(r"[a-z0-9]+")
+
+STOP_WORDS = {
+    "it": {
+        "a", "ad", "al", "allo", "alla", "alle", "agli", "ai", "che", "con", "da",
+        "dal", "dallo", "dalla", "dalle", "dagli", "dai", "dei", "del", "dello",
+        "della", "delle", "degli", "di", "e", "ed", "gli", "i", "il", "in", "la",
+        "le", "lo", "nel", "nello", "nella", "nelle", "negli", "nei", "non", "o",
+        "per", "su", "sul", "sullo", "sulla", "sulle", "sugli", "sui", "tra", "fra",
+        "un", "una", "uno",
+    },
+    "en": {
+        "a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "or",
+        "the", "to", "with",
+    },
+}
+
+
+def rimuovi_accenti(testo):
+    """Restituisce il testo in minuscolo senza segni diacritici."""
+    testo = unicodedata.normalize("NFKD", testo.lower())
+    return "".join(c for c in testo if not unicodedata.combining(c))
+
+
+def stem_italiano(parola):
+    """Stemmer leggero per l'italiano: rimuove le desinenze di genere e numero."""
+    if len(parola) <= 3 or parola.isdigit():
+        return parola
+    for suffisso in ("issimo", "issima", "issimi", "issime"):
+        if parola.endswith(suffisso) and len(parola) - len(suffisso) >= 3:
+            parola = parola[: -len(suffisso)] + "o"
+            break
+    if parola.endswith("mente") and len(parola) > 8:
+        parola = parola[:-5]
+    if parola[-1] in "aeio":
+        parola = parola[:-1]
+        # amiche/amici -> amic, laghi/lago -> lag
+        if parola.endswith(("ch", "gh")):
+            parola = parola[:-1]
+        # studi/studio -> stud
+        elif parola.endswith("i") and len(parola) > 3:
+            parola = parola[:-1]
+    return parola
+
+
+def stem_inglese(parola):
+    """Stemmer leggero per l'inglese: rimuove il plurale."""
+    if len(parola) <= 3 or parola.isdigit():
+        return parola
+    if parola.endswith("ies") and len(parola) > 4:
+        return parola[:-3] + "y"
+    if parola.endswith("s") and not parola.endswith(("ss", "us", "is")):
+        return parola[:-1]
+    return parola
+
+
+STEMMER = {
+    "it": stem_italiano,
+    "en": stem_inglese,
+}
+
+
+def tokenizza(testo, lingua="it"):
+    """
+    Restituisce la lista delle radici delle parole significative del testo.
+
+    Args:
+        testo: Testo libero (contenuto o query)
+        lingua: Codice lingua, sceglie stop words e stemmer
+
+    Returns:
+        Lista di token normalizzati, nell'ordine del testo
+    """
+    if not testo:
+        return []
+    stop_words = STOP_WORDS.get(lingua, set())
+    stem = STEMMER.get(lingua, stem_italiano)
+    return [
+        stem(parola)
+        for parola in PAROLA_RE.findall(rimuovi_accenti(testo))
+        if parola not in stop_words
+    ]
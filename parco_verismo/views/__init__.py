@@ -61,6 +61,9 @@ from .istituzionale import (
     cookie_policy_view,
 )
 
+# SEO
+from .seo import file_radice_view, sitemap_view
+
 # Error Handlers
 from .errors import (
     custom_404,
@@ -106,6 +109,9 @@ __all__ = [
     'privacy_policy_view',
     'note_legali_view',
     'cookie_policy_view',
+    # SEO
+    'sitemap_view',
+    'file_radice_view',
     # Error handlers
     'custom_404',
     'custom_500',
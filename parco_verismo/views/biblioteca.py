@@ -3,29 +3,34 @@ Views per la Biblioteca e le Opere letterarie.
 """
 
 # Django imports
-from django.db.models import Q, Prefetch
+from django.db.models import Prefetch
 from django.shortcuts import render, get_object_or_404
 from collections import defaultdict
 
 # Local imports
 from ..models import Opera, Autore, LuogoLetterario, OperaInLuogo
+from ..services.search_service import ricerca_opere
+from ..utils.paginazione import pagina_keyset, pagina_offset
 
 
 def biblioteca_view(request):
-    """Mostra tutte le opere e gestisce la ricerca per titolo e autore."""
+    """Mostra le opere a pagine e gestisce la ricerca per titolo, autore e trama."""
     query = request.GET.get("q", "")
-    opere_list = Opera.objects.all()
-
+    cursore = request.GET.get("cursore")
+    opere = Opera.objects.select_related("autore").con_traduzioni()
     if query:
-        # Cerca nel titolo dell'opera O nel nome dell'autore
-        opere_list = opere_list.filter(
-            Q(translations__titolo__icontains=query) | Q(autore__nome__icontains=query)
-        ).distinct()
+        # Con una query le opere sono ordinate per rilevanza (indice di ricerca)
+        pagina = pagina_offset(ricerca_opere(query, opere), cursore)
+    else:
+        pagina = pagina_keyset(opere, ("slug", "pk"), cursore)
 
     context = {
-        "opere": opere_list,
+        "opere": pagina,
         "query": query,
     }
+    if request.GET.get("parziale"):
+        # Pagina successiva caricata dal pulsante "Carica altri"
+        return render(request, "parco_verismo/components/pagina_opere.html", context)
     return render(request, "parco_verismo/biblioteca.html", context)
 
 
@@ -2,40 +2,50 @@
 Views per Documenti e Archivio Fotografico.
 """
 # Django imports
-from django.db.models import Q
+from django.http import Http404
 from django.shortcuts import render, get_object_or_404
 
 # Local imports
 from ..models import Documento, FotoArchivio
+from ..services.search_service import ricerca_documenti
+from ..utils.condizionale import condizionale, stato_lista, stato_oggetto
+from ..utils.paginazione import pagina_keyset, pagina_offset
 
+# Autori con una sezione propria nell'archivio fotografico
+AUTORI_ARCHIVIO = ('VERGA', 'CAPUANA')
+ORDINAMENTO_FOTO = ('ordine', '-data_aggiunta', '-pk')
 
+
+@condizionale(lambda request: stato_lista(Documento.objects.all()))
 def documenti_view(request):
-    """Mostra tutti i documenti e studi attivi con filtri per tipo e ricerca."""
-    documenti = Documento.objects.filter(is_active=True).order_by('-data_pubblicazione')
+    """Mostra i documenti e studi attivi a pagine, con filtri per tipo e ricerca."""
+    documenti = Documento.objects.filter(is_active=True).con_traduzioni()
     
-    # Filtro per tipo
+    # Filtro per tipo e ricerca (ordinata per rilevanza)
     tipo_filter = request.GET.get('tipo', '')
-    if tipo_filter:
-        documenti = documenti.filter(tipo=tipo_filter)
-    
-    # Ricerca
     query = request.GET.get('q', '')
+    documenti = ricerca_documenti(query, tipo=tipo_filter, queryset=documenti)
+
+    cursore = request.GET.get('cursore')
     if query:
-        documenti = documenti.filter(
-            Q(translations__titolo__icontains=query) |
-            Q(translations__descrizione__icontains=query) |
-            Q(autori__icontains=query) |
-            Q(translations__parole_chiave__icontains=query)
-        ).distinct()
+        pagina = pagina_offset(documenti, cursore)
+    else:
+        pagina = pagina_keyset(documenti, ('-data_pubblicazione', '-pk'), cursore)
     
     context = {
-        'documenti': documenti,
+        'documenti': pagina,
         'query': query,
         'tipo_filter': tipo_filter,
     }
+    if request.GET.get('parziale'):
+        # Pagina successiva caricata dal pulsante "Carica altri"
+        return render(request, 'parco_verismo/components/pagina_documenti.html', context)
     return render(request, 'parco_verismo/documenti.html', context)
 
 
+@condizionale(
+    lambda request, slug: stato_oggetto(Documento.objects.filter(slug=slug, is_active=True))
+)
 def documento_detail_view(request, slug):
     """Pagina di dettaglio di un singolo documento/studio."""
     documento = get_object_or_404(Documento, slug=slug, is_active=True)
@@ -46,16 +56,36 @@ def documento_detail_view(request, slug):
 
 
 def verga_capuana_fotografi_view(request):
-    """Pagina dell'archivio fotografico con carosello e categorie."""
-    foto_verga = FotoArchivio.objects.filter(is_active=True, autore='VERGA').order_by('ordine', '-data_aggiunta')
-    foto_capuana = FotoArchivio.objects.filter(is_active=True, autore='CAPUANA').order_by('ordine', '-data_aggiunta')
-    foto_altro = FotoArchivio.objects.filter(is_active=True).exclude(autore__in=['VERGA', 'CAPUANA']).order_by('ordine', '-data_aggiunta')
-    
-    # Raggruppa per categoria se necessario (opzionale, per ora lasciamo semplice)
-    
+    """
+    Pagina dell'archivio fotografico con carosello e miniature per autore.
+
+    Le foto di ogni autore sono a pagine: il pulsante "Carica altre" chiede
+    la pagina successiva di un solo autore (?autore=VERGA&cursore=...).
+    """
+    foto = FotoArchivio.objects.filter(is_active=True).con_traduzioni()
+    autore = request.GET.get('autore')
+    cursore = request.GET.get('cursore')
+
+    if request.GET.get('parziale'):
+        if autore not in AUTORI_ARCHIVIO:
+            raise Http404("Autore non valido")
+        context = {
+            'foto': pagina_keyset(foto.filter(autore=autore), ORDINAMENTO_FOTO, cursore),
+            'autore': autore,
+        }
+        return render(request, 'parco_verismo/components/pagina_foto.html', context)
+
+    pagine = {
+        codice: pagina_keyset(
+            foto.filter(autore=codice),
+            ORDINAMENTO_FOTO,
+            cursore if codice == autore else None,
+        )
+        for codice in AUTORI_ARCHIVIO
+    }
     context = {
-        'foto_verga': foto_verga,
-        'foto_capuana': foto_capuana,
-        'foto_altro': foto_altro,
+        'foto_verga': pagine['VERGA'],
+        'foto_capuana': pagine['CAPUANA'],
+        'foto_altro': foto.exclude(autore__in=AUTORI_ARCHIVIO).exists(),
     }
     return render(request, 'parco_verismo/verga_capuana_fotografi.html', context)
@@ -2,34 +2,31 @@
 Views per Eventi e Notizie.
 """
 
+# Standard library imports
+from datetime import timedelta
+
 # Django imports
 from django.shortcuts import render, get_object_or_404
 from django.utils import timezone
 
 # Local imports
 from ..models import Evento, Notizia
+from ..services.search_service import get_eventi_in_evidenza
+from ..utils.condizionale import condizionale, stato_lista, stato_oggetto
+from ..utils.paginazione import pagina_keyset
+
+# Notizie mostrate nel calendario della pagina notizie
+CALENDARIO_GIORNI = 365
+CALENDARIO_MAX_NOTIZIE = 100
 
 
 def eventi_view(request):
     """Mostra gli ultimi 5 eventi: prima quelli futuri, poi quelli passati."""
-    now = timezone.now()
-    
-    # Eventi futuri (ordinati dal più vicino al più lontano)
-    eventi_futuri = list(Evento.objects.filter(
-        is_active=True, data_inizio__gte=now
-    ).order_by("data_inizio"))
-    
-    # Eventi passati (ordinati dal più recente al più vecchio)
-    eventi_passati = list(Evento.objects.filter(
-        is_active=True, data_inizio__lt=now
-    ).order_by("-data_inizio"))
-    
-    # Combina: prima futuri, poi passati, max 5 totali
-    eventi = (eventi_futuri + eventi_passati)[:5]
-    
-    notizie = Notizia.objects.filter(is_active=True).order_by("-data_pubblicazione")[
-        :20
-    ]
+    eventi = get_eventi_in_evidenza(5)
+
+    notizie = (
+        Notizia.objects.filter(is_active=True).order_by("-data_pubblicazione").con_traduzioni()[:20]
+    )
     context = {
         "eventi": eventi,
         "notizie": notizie,
@@ -37,6 +34,9 @@ def eventi_view(request):
     return render(request, "parco_verismo/eventi.html", context)
 
 
+@condizionale(
+    lambda request, slug: stato_oggetto(Evento.objects.filter(slug=slug, is_active=True))
+)
 def evento_detail_view(request, slug):
     """Pagina di dettaglio di un singolo evento."""
     evento = get_object_or_404(Evento, slug=slug, is_active=True)
@@ -46,19 +46,47 @@ def evento_detail_view(request, slug):
     return render(request, "parco_verismo/evento_detail.html", context)
 
 
+def _stato_notizie(request):
+    """Notizie e prossimi eventi del calendario (che cambiano anche col passare del tempo)."""
+    ora = timezone.now()
+    return (
+        stato_lista(Notizia.objects.all()),
+        stato_lista(Evento.objects.filter(is_active=True, data_inizio__gte=ora)),
+        ora.date(),
+    )
+
+
+@condizionale(_stato_notizie)
 def notizie_view(request):
-    """Mostra tutte le notizie attive ordinate per data di pubblicazione."""
-    notizie = Notizia.objects.filter(is_active=True).order_by("-data_pubblicazione")
+    """Mostra le notizie attive a pagine, ordinate per data di pubblicazione."""
+    notizie = Notizia.objects.filter(is_active=True).con_traduzioni()
+    pagina = pagina_keyset(
+        notizie, ("-data_pubblicazione", "-pk"), request.GET.get("cursore")
+    )
+    if request.GET.get("parziale"):
+        # Pagina successiva caricata dal pulsante "Carica altri"
+        return render(
+            request, "parco_verismo/components/pagina_notizie.html", {"notizie": pagina}
+        )
+
+    # Il calendario mostra solo le notizie recenti, non tutto l'archivio
+    notizie_calendario = notizie.filter(
+        data_pubblicazione__gte=timezone.now() - timedelta(days=CALENDARIO_GIORNI)
+    ).order_by("-data_pubblicazione")[:CALENDARIO_MAX_NOTIZIE]
     eventi = Evento.objects.filter(
         is_active=True, data_inizio__gte=timezone.now()
-    ).order_by("data_inizio")[:20]
+    ).order_by("data_inizio").con_traduzioni()[:20]
     context = {
-        "notizie": notizie,
+        "notizie": pagina,
+        "notizie_calendario": notizie_calendario,
         "eventi": eventi,
     }
     return render(request, "parco_verismo/notizie.html", context)
 
 
+@condizionale(
+    lambda request, slug: stato_oggetto(Notizia.objects.filter(slug=slug, is_active=True))
+)
 def notizia_detail_view(request, slug):
     """Pagina di dettaglio di una singola notizia."""
     notizia = get_object_or_404(Notizia, slug=slug, is_active=True)
@@ -10,7 +10,8 @@ from django.utils import timezone
 
 # Local imports
 from ..forms.richiesta import RichiestaForm
-from ..models import Evento, Notizia
+from ..models import Notizia
+from ..services.search_service import get_eventi_in_evidenza
 
 
 def home_view(request):
@@ -50,13 +51,12 @@ def home_view(request):
         form = RichiestaForm()
 
     # Eventi: 5 eventi totali, prima quelli futuri (più vicini) poi quelli passati (più recenti)
-    now = timezone.now()
-    eventi_futuri = list(Evento.objects.filter(is_active=True, data_inizio__gte=now).order_by("data_inizio"))
-    eventi_passati = list(Evento.objects.filter(is_active=True, data_inizio__lt=now).order_by("-data_inizio"))
-    eventi_latest = (eventi_futuri + eventi_passati)[:5]
+    eventi_latest = get_eventi_in_evidenza(5)
 
     # Notizie: prendere le ultime 5 notizie attive ordinate per data di pubblicazione
-    notizie_latest = Notizia.objects.filter(is_active=True).order_by("-data_pubblicazione")[:5]
+    notizie_latest = (
+        Notizia.objects.filter(is_active=True).order_by("-data_pubblicazione").con_traduzioni()[:5]
+    )
 
     context = {
         "eventi": eventi_latest,
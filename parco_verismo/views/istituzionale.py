@@ -8,6 +8,7 @@ from django.urls import reverse
 
 # Local imports
 from ..forms.richiesta import RichiestaForm
+from ..services.job_queue import accoda
 
 
 # =============================================================================
@@ -51,38 +52,17 @@ def contatti_view(request):
             try:
                 richiesta = form.save()
                 
-                # Invia email di notifica
+                # Notifica email inviata dal worker, senza bloccare la risposta
                 try:
-                    from django.core.mail import send_mail
-                    from django.conf import settings
-                    
-                    subject = f"Nuova richiesta dal sito: {richiesta.oggetto}"
-                    message = f"""
-Hai ricevuto una nuova richiesta di contatto dal sito web.
-
-Dettagli:
-Nome: {richiesta.nome} {richiesta.cognome}
-Email: {richiesta.email}
-Ente: {richiesta.ente or 'Non specificato'}
-Oggetto: {richiesta.oggetto}
-
-Messaggio:
-{richiesta.messaggio}
-
-Puoi gestire questa richiesta dal pannello di amministrazione:
-{request.scheme}://{request.get_host()}/richieste/dashboard/
-                    """
-                    
-                    send_mail(
-                        subject,
-                        message,
-                        settings.DEFAULT_FROM_EMAIL,  # Mittente (configurato in settings)
-                        ["info@parcovergacapuana.it"],  # Destinatario
-                        fail_silently=False,
+                    accoda(
+                        "email.notifica_contatto",
+                        richiesta_id=richiesta.pk,
+                        url_dashboard=f"{request.scheme}://{request.get_host()}/richieste/dashboard/",
+                    )
+                except Exception:
+                    logging.exception(
+                        "Impossibile accodare la notifica per richiesta id=%s", richiesta.pk
                     )
-                except Exception as e:
-                    logging.error(f"Errore invio email: {e}")
-                    # Non blocchiamo il flusso se l'email fallisce, ma logghiamo l'errore
 
                 logging.info(
                     "Richiesta contatto creata id=%s email=%s",
@@ -0,0 +1,79 @@
+"""
+Views per i file letti dai motori di ricerca.
+"""
+
+# Standard library imports
+import datetime
+
+# Django imports
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from django.views.decorators.http import condition, require_safe
+
+# Local imports
+from ..services import sitemap_service
+from ..sitemaps import SITEMAPS
+from ..utils.file_radice import get_file_radice
+
+
+def _percorso_sitemap(sezione):
+    if sezione is not None and sezione not in SITEMAPS:
+        raise Http404("Sezione della sitemap inesistente")
+    percorso = sitemap_service.percorso_file(sezione)
+    if not percorso.exists():
+        # Prima visita senza aver eseguito genera_sitemap
+        sitemap_service.genera_sitemap()
+    return percorso
+
+
+def _ultima_modifica_sitemap(request, sezione=None):
+    percorso = _percorso_sitemap(sezione)
+    return datetime.datetime.fromtimestamp(percorso.stat().st_mtime, tz=datetime.timezone.utc)
+
+
+@condition(last_modified_func=_ultima_modifica_sitemap)
+def sitemap_view(request, sezione=None):
+    """
+    Serve l'indice o una sezione della sitemap precalcolata, compressa se il
+    client accetta gzip. In produzione i file sono serviti direttamente da nginx.
+    """
+    percorso = _percorso_sitemap(sezione)
+    compresso = percorso.with_name(percorso.name + ".gz")
+    if "gzip" in request.headers.get("Accept-Encoding", "") and compresso.exists():
+        response = FileResponse(compresso.open("rb"), content_type="application/xml")
+        response["Content-Encoding"] = "gzip"
+    else:
+        response = FileResponse(percorso.open("rb"), content_type="application/xml")
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
+
+
+@require_safe
+def file_radice_view(request, nome):
+    """
+    Serve un file della radice del sito (robots.txt, favicon.ico, ...) dalla
+    memoria, compresso se il client accetta gzip, con ETag e cache lunga.
+    """
+    file = get_file_radice(nome)
+    if file is None:
+        raise Http404("File inesistente")
+
+    if file.compresso is not None and "gzip" in request.headers.get("Accept-Encoding", ""):
+        contenuto, etag = file.compresso, f"{file.etag}-gz"
+    else:
+        contenuto, etag = file.contenuto, file.etag
+
+    response = get_conditional_response(
+        request, etag=quote_etag(etag), last_modified=file.ultima_modifica.timestamp()
+    )
+    if response is None:
+        response = HttpResponse(contenuto, content_type=file.content_type)
+        if contenuto is file.compresso:
+            response["Content-Encoding"] = "gzip"
+    response["ETag"] = quote_etag(etag)
+    response["Last-Modified"] = http_date(file.ultima_modifica.timestamp())
+    patch_cache_control(response, public=True, max_age=file.max_age)
+    if file.compresso is not None:
+        patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,259 @@
+/**
+ * Bundle CSS/JS e CSS critico.
+ *
+ * Legge parco_verismo/bundles.json e scrive in parco_verismo/static/bundles/:
+ * - <nome>.css: i CSS concatenati (commenti e spazi rimossi, url() riscritti
+ *   rispetto alla cartella bundles/)
+ * - <nome>.js: i JS concatenati nell'ordine dato
+ * - <nome>.critico.css: le regole del bundle che servono per la parte
+ *   iniziale della pagina (navbar, hero), da inserire inline nel <head>
+ *
+ * Ogni bundle inizia con l'impronta dei sorgenti: `manage.py verifica_statici`
+ * segnala i bundle non rigenerati dopo una modifica. Senza dipendenze npm.
+ *
+ * Uso: npm run bundle
+ */
+
+const crypto = require('crypto');
+const fs = require('fs');
+const path = require('path');
+const zlib = require('zlib');
+
+const ROOT = path.join(__dirname, '..');
+const STATIC_DIR = path.join(ROOT, 'parco_verismo', 'static');
+const BUNDLE_DIR = path.join(STATIC_DIR, 'bundles');
+const CONFIG = path.join(ROOT, 'parco_verismo', 'bundles.json');
+
+// CSS critico inline oltre questa dimensione (compresso) non sta più nel
+// primo round-trip TCP insieme all'inizio dell'HTML
+const CRITICO_MAX_BYTE = 14 * 1024;
+
+const SOURCE_MAP_RE = /^\s*(\/\/|\/\*)# sourceMappingURL=.*$/gm;
+
+/** Impronta dei sorgenti (stesso calcolo in utils/bundle.py). */
+function impronta(file) {
+  const hash = crypto.createHash('sha1');
+  file.forEach(nome => {
+    hash.update(`${nome}\0`);
+    hash.update(fs.readFileSync(path.join(STATIC_DIR, nome)));
+  });
+  return hash.digest('hex').slice(0, 12);
+}
+
+/** Intestazione del bundle letta da Django per riconoscere i bundle vecchi. */
+function intestazione(nome, file) {
+  return `/*! bundle ${nome} ${impronta(file)} */\n`;
+}
+
+function leggi(nome) {
+  return fs.readFileSync(path.join(STATIC_DIR, nome), 'utf8').replace(SOURCE_MAP_RE, '');
+}
+
+function scrivi(nome, contenuto) {
+  fs.mkdirSync(BUNDLE_DIR, { recursive: true });
+  fs.writeFileSync(path.join(BUNDLE_DIR, nome), contenuto);
+  const kb = (Buffer.byteLength(contenuto) / 1024).toFixed(1);
+  console.log(`Bundle ${path.relative(ROOT, path.join(BUNDLE_DIR, nome))} (${kb} KB)`);
+}
+
+// ---------------------------------------------------------------------------
+// CSS
+// ---------------------------------------------------------------------------
+
+/** Rimuove i commenti (tranne le licenze /*! ... *\/) rispettando le stringhe. */
+function rimuoviCommenti(css) {
+  let risultato = '';
+  let i = 0;
+  while (i < css.length) {
+    const c = css[i];
+    if (c === '"' || c === "'") {
+      const fine = fineStringa(css, i);
+      risultato += css.slice(i, fine);
+      i = fine;
+    } else if (c === '/' && css[i + 1] === '*') {
+      const fine = css.indexOf('*/', i + 2);
+      const chiusura = fine === -1 ? css.length : fine + 2;
+      if (css[i + 2] === '!') {
+        risultato += css.slice(i, chiusura);
+      }
+      i = chiusura;
+    } else {
+      risultato += c;
+      i += 1;
+    }
+  }
+  return risultato;
+}
+
+function fineStringa(testo, inizio) {
+  const quote = testo[inizio];
+  let i = inizio + 1;
+  while (i < testo.length && testo[i] !== quote) {
+    i += testo[i] === '\\' ? 2 : 1;
+  }
+  return i + 1;
+}
+
+/** Spazi superflui: il resto lo fa la compressione gzip/brotli. */
+function compatta(css) {
+  return css
+    .replace(/\s+/g, ' ')
+    .replace(/\s*([{};])\s*/g, '$1')
+    .trim();
+}
+
+/** url() relativi al file sorgente -> relativi alla cartella bundles/. */
+function riscriviUrl(css, nome) {
+  const cartella = path.dirname(path.join(STATIC_DIR, nome));
+  return css.replace(/url\(\s*(['"]?)([^'")]+)\1\s*\)/g, (match, quote, url) => {
+    if (/^(data:|https?:|\/|#|%23)/.test(url)) {
+      return match;
+    }
+    const [percorso, resto] = url.split(/(?=[?#])/);
+    const nuovo = path.relative(BUNDLE_DIR, path.resolve(cartella, percorso)).split(path.sep).join('/');
+    return `url("${nuovo}${resto || ''}")`;
+  });
+}
+
+function cssSorgente(nome) {
+  let css = rimuoviCommenti(leggi(nome)).replace(/@charset\s+[^;]+;/gi, '');
+  if (/@import\s/i.test(css)) {
+    throw new Error(`${nome}: @import non supportato nei bundle, aggiungi il file alla lista`);
+  }
+  return riscriviUrl(css, nome);
+}
+
+/** Divide un CSS nelle regole e at-rule di primo livello. */
+function blocchi(css) {
+  const risultato = [];
+  let inizio = 0;
+  let apertura = -1;
+  let profondita = 0;
+  for (let i = 0; i < css.length; i += 1) {
+    const c = css[i];
+    if (c === '"' || c === "'") {
+      i = fineStringa(css, i) - 1;
+    } else if (c === '{') {
+      if (profondita === 0) apertura = i;
+      profondita += 1;
+    } else if (c === '}') {
+      profondita -= 1;
+      if (profondita === 0) {
+        risultato.push({ prelude: css.slice(inizio, apertura).trim(), corpo: css.slice(apertura + 1, i) });
+        inizio = i + 1;
+      }
+    } else if (c === ';' && profondita === 0) {
+      risultato.push({ prelude: css.slice(inizio, i).trim(), corpo: null });
+      inizio = i + 1;
+    }
+  }
+  return risultato;
+}
+
+function dividiSelettori(prelude) {
+  const selettori = [];
+  let profondita = 0;
+  let inizio = 0;
+  for (let i = 0; i < prelude.length; i += 1) {
+    const c = prelude[i];
+    if (c === '(') profondita += 1;
+    else if (c === ')') profondita -= 1;
+    else if (c === ',' && profondita === 0) {
+      selettori.push(prelude.slice(inizio, i).trim());
+      inizio = i + 1;
+    }
+  }
+  selettori.push(prelude.slice(inizio).trim());
+  return selettori.filter(Boolean);
+}
+
+/**
+ * Un selettore è critico se tutte le sue classi e i suoi id compaiono nella
+ * parte iniziale della pagina; i selettori senza classi (html, body, h1, a)
+ * sono sempre critici. Quelli con attributi ([data-bs-theme=dark]) no.
+ */
+function selettoreCritico(selettore, critici) {
+  const semplice = selettore.replace(/:(not|is|where|has)\([^)]*\)/g, '');
+  if (semplice.includes('[')) {
+    return false;
+  }
+  const classi = semplice.match(/\.-?[_a-zA-Z][\w-]*/g) || [];
+  const id = semplice.match(/#-?[_a-zA-Z][\w-]*/g) || [];
+  return classi.every(c => critici.classi.has(c.slice(1))) && id.every(i => critici.id.has(i.slice(1)));
+}
+
+function estraiCritico(css, critici) {
+  return blocchi(css)
+    .map(({ prelude, corpo }) => {
+      if (corpo === null) {
+        return '';
+      }
+      if (prelude.startsWith('@')) {
+        // @media/@supports: solo le regole critiche all'interno
+        if (!/^@(media|supports)/i.test(prelude)) {
+          return '';
+        }
+        const interno = estraiCritico(corpo, critici);
+        return interno ? `${prelude}{${interno}}` : '';
+      }
+      // I url() sono relativi al file del bundle, non alla pagina
+      if (/url\(/.test(corpo)) {
+        return '';
+      }
+      const selettori = dividiSelettori(prelude).filter(s => selettoreCritico(s, critici));
+      return selettori.length ? `${selettori.join(',')}{${corpo}}` : '';
+    })
+    .join('');
+}
+
+/** Classi e id usati nei template della parte iniziale della pagina. */
+function classiCritiche(config) {
+  const classi = new Set(config.classi || []);
+  const id = new Set(config.id || []);
+  (config.template || []).forEach(nome => {
+    const html = fs.readFileSync(path.join(ROOT, nome), 'utf8').replace(/\{[%{#][\s\S]*?[%}#]\}/g, ' ');
+    for (const [, valore] of html.matchAll(/\sclass="([^"]*)"/g)) {
+      valore.split(/\s+/).filter(Boolean).forEach(c => classi.add(c));
+    }
+    for (const [, valore] of html.matchAll(/\sid="([^"]*)"/g)) {
+      id.add(valore.trim());
+    }
+  });
+  return { classi, id };
+}
+
+function bundleCss(nome, definizione) {
+  const css = compatta(definizione.file.map(cssSorgente).join('\n'));
+  const testa = `@charset "UTF-8";\n${intestazione(nome, definizione.file)}`;
+  scrivi(`${nome}.css`, `${testa}${css}\n`);
+
+  if (definizione.critico) {
+    const critico = estraiCritico(css, classiCritiche(definizione.critico));
+    scrivi(`${nome}.critico.css`, `${intestazione(nome, definizione.file)}${critico}\n`);
+    if (zlib.gzipSync(critico).length > CRITICO_MAX_BYTE) {
+      console.warn(`Attenzione: CSS critico di "${nome}" oltre ${CRITICO_MAX_BYTE / 1024} KB compresso`);
+    }
+  }
+}
+
+// ---------------------------------------------------------------------------
+// JS
+// ---------------------------------------------------------------------------
+
+function bundleJs(nome, file) {
+  // ";" tra i file: uno script senza punto e virgola finale non si unisce al successivo
+  const js = file.map(f => `// ${f}\n${leggi(f).trim()}\n;`).join('\n');
+  scrivi(`${nome}.js`, `${intestazione(nome, file)}${js}\n`);
+}
+
+function bundle() {
+  const config = JSON.parse(fs.readFileSync(CONFIG, 'utf8'));
+  Object.entries(config.css || {}).forEach(([nome, definizione]) => bundleCss(nome, definizione));
+  Object.entries(config.js || {}).forEach(([nome, file]) => bundleJs(nome, file));
+}
+
+module.exports = { bundle };
+
+if (require.main === module) {
+  bundle();
+}
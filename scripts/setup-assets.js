@@ -4,11 +4,13 @@
  * Cross-platform asset copier.
  * Copies Bootstrap CSS/JS, font files and Bootstrap Icons
  * from node_modules into the Django static directories so
- * we don’t rely on any external CDN.
+ * we don’t rely on any external CDN, then builds the CSS/JS
+ * bundles (see scripts/bundle-assets.js).
  */
 
 const fs = require('fs');
 const path = require('path');
+const { bundle } = require('./bundle-assets');
 
 const ROOT = path.join(__dirname, '..');
 const STATIC_DIR = path.join(ROOT, 'parco_verismo', 'static');
@@ -25,15 +27,19 @@ const tasks = {
     );
   },
   fonts: () => {
-    // Fonts are committed directly into parco_verismo/static/fonts/
+    // Full fonts are committed into parco_verismo/font_sorgenti/; the subsets
+    // served from static/fonts/ are written by `python manage.py riduci_font`.
     // No automatic copying from node_modules for Montserrat/Inter.
   },
   icons: () => {
+    // Source only: run `python manage.py riduci_font` to update static/fonts/
     copyDir(
       path.join(ROOT, 'node_modules', 'bootstrap-icons', 'font'),
-      path.join(STATIC_DIR, 'fonts', 'bootstrap-icons')
+      path.join(ROOT, 'parco_verismo', 'font_sorgenti', 'bootstrap-icons')
     );
   },
+  // Last: bundles include the files copied above
+  bundle: () => bundle(),
 };
 
 function ensureDir(dirPath) {